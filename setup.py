@@ -4,9 +4,17 @@ setup(
     name="sharingan",
     version="0.1.0",
     packages=find_packages(),
+    # Burp scan configurations read by src.payload.load_config
+    package_data={"src.config": ["*.json"]},
     install_requires=[
         "requests>=2.26.0",
-        "fake-useragent>=0.1.11",
+        "tqdm",
+        "python-dotenv",
     ],
-    python_requires=">=3.6",
+    entry_points={
+        "console_scripts": [
+            "sharingan=src.cli:main",
+        ],
+    },
+    python_requires=">=3.8",
 )
\ No newline at end of file
@@ -1,13 +1,20 @@
 """
 Sharingan main package
 """
-from .core.vpn import NordVPNRotator
-from .core.scanner import Scanner, Crawler
-from .core.chaos import ChaosScanner
-from .core.notification import TelegramNotifier
+from ._lazy import attach
 
 __version__ = '0.1.0'
 
+_EXPORTS = {
+    'NordVPNRotator': '.core.vpn',
+    'Scanner': '.core.scanner',
+    'Crawler': '.core.scanner',
+    'ChaosScanner': '.core.chaos',
+    'TelegramNotifier': '.core.notification'
+}
+
+__getattr__, __dir__ = attach(__name__, _EXPORTS)
+
 __all__ = [
     'NordVPNRotator',
     'Scanner',
@@ -0,0 +1,33 @@
+"""
+Lazy attribute loading for package namespaces
+"""
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def attach(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """
+    Build PEP 562 module hooks importing public names on first access
+    Keeps `from package import Name` working while the submodule behind
+    Name, and its third-party dependencies, load only when used.
+    Args:
+        package: __name__ of the package
+        exports: Public name mapped to the submodule defining it, relative
+            to the package, e.g. {"Scanner": ".scanner"}
+    Returns:
+        The package's __getattr__ and __dir__
+    """
+    def __getattr__(name: str):
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        # Cache on the package so later lookups skip this hook
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
\ No newline at end of file
@@ -0,0 +1,177 @@
+"""
+Command line interface of the sharingan package
+"""
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .daemon import SOCKET_NAME, DaemonClient, DaemonError, DaemonServer
+from .runtime import Runtime
+
+__all__ = ['main', 'build_parser', 'Runtime', 'DaemonServer', 'DaemonClient', 'DaemonError']
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sharingan",
+        description="Discover bug bounty targets, scan them with Burp and report findings"
+    )
+    parser.add_argument("--base-dir", help="Directory holding the database directory")
+    parser.add_argument("--burp-api-url", help="Burp REST API root, comma separated for several (default: $BURP_API_URL)")
+    parser.add_argument("--webhook", help="Also POST scan events as JSON to this URL")
+    parser.add_argument("--events-file", help="Also append scan events to this JSONL file")
+    parser.add_argument("--socket", help=f"Daemon socket (default: <base-dir>/database/{SOCKET_NAME})")
+    parser.add_argument("--local", action="store_true", help="Run in this process even if a daemon is running, needed to change Burp or event sinks")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress to stderr")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.required = True
+
+    discover = commands.add_parser("discover", help="List in-scope targets, refreshing chaos data first")
+    discover.add_argument("--program", help="Only targets of this program")
+    discover.add_argument("--no-refresh", action="store_true", help="List stored targets without syncing")
+
+    probe = commands.add_parser("probe", help="Print the live URLs among targets")
+    probe.add_argument("targets", nargs="*", help="Domains or URLs, read from stdin if omitted")
+    probe.add_argument("--max-age", type=float, default=6 * 3600, help="Reuse probe results younger than this many seconds")
+    probe.add_argument("--concurrency", type=int, default=200, help="Hosts probed at once (default: 200)")
+    probe.add_argument("--timeout", type=float, default=5, help="Seconds per host and scheme (default: 5)")
+
+    scan = commands.add_parser("scan", help="Probe, rank and scan targets through Burp")
+    scan.add_argument("targets", nargs="*", help="Domains or URLs, read from stdin if omitted")
+    scan.add_argument("--config", dest="configs", action="append", help="Burp scan configuration (default: Checking)")
+    scan.add_argument("--max-targets", type=int, help="Keep only the best scored targets")
+    scan.add_argument("--batch-size", type=int, default=10, help="Maximum URLs per Burp scan (default: 10)")
+    scan.add_argument("--max-concurrent", type=int, default=4, help="Burp scans running at once (default: 4)")
+    scan.add_argument("--cycle", help="Resume this scan cycle instead of starting a new one")
+    scan.add_argument("--no-probe", action="store_true", help="Send every target to Burp without probing")
+    scan.add_argument("--use-vpn", action="store_true", help="Rotate VPN identities while scanning")
+
+    monitor = commands.add_parser("monitor", help="Follow running Burp scans until they finish")
+    monitor.add_argument("attach", nargs="+", metavar="SCAN_ID=URL", help="Burp scan and its target, INDEX-TASK with several Burp instances")
+    monitor.add_argument("--cycle", help="Scan cycle the scans belong to (default: a new one)")
+    monitor.add_argument("--max-concurrent", type=int, default=4, help="Burp scans running at once (default: 4)")
+
+    report = commands.add_parser("report", help="Show the scan jobs of a cycle")
+    report.add_argument("--cycle", help="Only this cycle")
+    report.add_argument("--status", help="Only jobs in this status, e.g. failed")
+    report.add_argument("--render", action="store_true", help="Also write Markdown and JSON reports of the succeeded scans from Burp")
+    report.add_argument("--output-dir", default="reports", help="Directory of rendered reports (default: reports)")
+
+    notify = commands.add_parser("notify", help="Send an alert through the configured sinks")
+    notify.add_argument("message", help="Alert text")
+    notify.add_argument("--level", default="info", choices=("info", "warning", "error"))
+
+    commands.add_parser("serve", help="Keep components warm and run jobs sent over the daemon socket")
+    return parser
+
+
+def _read_targets(targets: List[str]) -> List[str]:
+    """Targets from the command line, or one per line on stdin"""
+    if targets and targets != ["-"]:
+        return targets
+    if targets or not sys.stdin.isatty():
+        return [line.strip() for line in sys.stdin if line.strip()]
+    return []
+
+
+def _job(args: argparse.Namespace) -> Tuple[str, Dict[str, Any]]:
+    """Runtime command and keyword arguments of parsed arguments"""
+    if args.command == "discover":
+        return "discover", {"program": args.program, "refresh": not args.no_refresh}
+    if args.command == "probe":
+        return "probe", {
+            "targets": _read_targets(args.targets), "max_age": args.max_age,
+            "concurrency": args.concurrency, "timeout": args.timeout
+        }
+    if args.command == "scan":
+        return "scan", {
+            "targets": _read_targets(args.targets), "configs": args.configs or ["Checking"],
+            "max_targets": args.max_targets, "batch_size": args.batch_size,
+            "max_concurrent": args.max_concurrent, "cycle": args.cycle,
+            "probe": not args.no_probe, "use_vpn": args.use_vpn
+        }
+    if args.command == "monitor":
+        attach = dict(item.split("=", 1) for item in args.attach)
+        return "monitor", {"attach": attach, "cycle": args.cycle, "max_concurrent": args.max_concurrent}
+    if args.command == "report":
+        return "report", {
+            "cycle": args.cycle, "status": args.status,
+            # Absolute, a daemon runs in its own working directory
+            "render": args.render, "output_dir": str(Path(args.output_dir).resolve())
+        }
+    return "notify", {"message": args.message, "level": args.level}
+
+
+def _print(result):
+    if isinstance(result, list):
+        for item in result:
+            print(item if isinstance(item, str) else json.dumps(item))
+    else:
+        print(json.dumps(result, indent=2, default=str))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the sharingan console script"""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        stream=sys.stderr
+    )
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        pass
+    else:
+        load_dotenv()
+
+    runtime = Runtime(
+        args.base_dir,
+        burp_api_url=args.burp_api_url,
+        webhook_url=args.webhook,
+        events_file=args.events_file
+    )
+    socket_path = Path(args.socket) if args.socket else runtime.database_dir / SOCKET_NAME
+
+    if args.command == "serve":
+        try:
+            server = DaemonServer(runtime, socket_path)
+        except DaemonError as e:
+            print(f"sharingan: {e}", file=sys.stderr)
+            return 1
+        print(f"sharingan daemon listening on {socket_path}", file=sys.stderr)
+        try:
+            server.serve()
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    command, kwargs = _job(args)
+    try:
+        client = DaemonClient(socket_path)
+        if not args.local and client.alive():
+            # The daemon runs with the sinks and Burp it was started with
+            ignored = [flag for flag, value in (
+                ("--burp-api-url", args.burp_api_url),
+                ("--webhook", args.webhook),
+                ("--events-file", args.events_file)
+            ) if value]
+            if ignored:
+                raise DaemonError(
+                    f"{', '.join(ignored)} cannot be changed for a running daemon, "
+                    f"pass --local or restart sharingan serve with them"
+                )
+            result = client.call(command, kwargs)
+        else:
+            try:
+                result = runtime.run(command, kwargs)
+            finally:
+                runtime.close()
+    except (DaemonError, ValueError) as e:
+        print(f"sharingan: {e}", file=sys.stderr)
+        return 1
+    _print(result)
+    return 0
@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SOCKET_NAME = "sharingan.sock"
+
+
+class DaemonError(RuntimeError):
+    """A job submitted to the daemon failed"""
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line)
+            command = request["command"]
+            if command == "shutdown":
+                reply = {"ok": True, "result": None}
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            elif command == "ping":
+                reply = {"ok": True, "result": {"pid": os.getpid(), "jobs": self.server.jobs_handled}}
+            else:
+                self.server.jobs_handled += 1
+                result = self.server.runtime.run(command, request.get("args") or {})
+                reply = {"ok": True, "result": result}
+        except Exception as e:
+            logger.exception(f"Daemon job failed: {line[:200]!r}")
+            reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(reply, default=str).encode() + b"\n")
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, runtime, path):
+        """
+        Serve Runtime commands over a local unix socket
+        Every connection carries one JSON job, {"command", "args"}, and gets
+        one JSON reply, {"ok", "result"} or {"ok": false, "error"}. Jobs run
+        on their own threads against the same warm Runtime, which queues
+        discover and scan jobs behind one of their kind already running.
+        The socket is only accessible to the user running the daemon.
+        Args:
+            runtime: Runtime shared by all jobs
+            path: Socket file, replaced if a stale socket is left over
+        """
+        self.runtime = runtime
+        self.path = Path(path)
+        self.jobs_handled = 0
+        if self.path.exists():
+            if not stat.S_ISSOCK(self.path.stat().st_mode):
+                raise DaemonError(f"{self.path} exists and is not a socket")
+            if DaemonClient(self.path).alive():
+                raise DaemonError(f"A daemon is already listening on {self.path}")
+            self.path.unlink()
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(str(self.path), _JobHandler)
+        finally:
+            os.umask(old_umask)
+
+    def serve(self):
+        """Handle jobs until a shutdown job arrives, then release everything"""
+        logger.info(f"Listening on {self.path}")
+        try:
+            self.serve_forever()
+        finally:
+            self.server_close()
+            self.path.unlink(missing_ok=True)
+            self.runtime.close()
+
+
+class DaemonClient:
+    def __init__(self, path, timeout: Optional[float] = None):
+        """
+        Submit jobs to a running DaemonServer
+        Args:
+            path: Socket file of the daemon
+            timeout: Seconds to wait for a reply, None waits for long scans
+        """
+        self.path = Path(path)
+        self.timeout = timeout
+
+    def call(self, command: str, args: Optional[Dict[str, Any]] = None):
+        """Run a command in the daemon and return its result"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(str(self.path))
+            sock.sendall(json.dumps({"command": command, "args": args or {}}).encode() + b"\n")
+            with sock.makefile("rb") as reply_file:
+                line = reply_file.readline()
+        if not line:
+            raise DaemonError("Daemon closed the connection without a reply")
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise DaemonError(reply.get("error"))
+        return reply.get("result")
+
+    def alive(self) -> bool:
+        """Whether a daemon answers on the socket"""
+        if not self.path.exists():
+            return False
+        try:
+            DaemonClient(self.path, timeout=2).call("ping")
+        except (OSError, ValueError, DaemonError):
+            return False
+        return True
@@ -0,0 +1,356 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Same default as Crawler and ChaosScanner: the database directory of the package
+DEFAULT_BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+class Runtime:
+    COMMANDS = ("discover", "probe", "scan", "monitor", "report", "notify")
+    # Commands sharing a group run one at a time: discover jobs rewrite the
+    # same chaos files, and scan jobs each fill max_concurrent Burp slots
+    EXCLUSIVE = {"discover": "discover", "scan": "burp", "monitor": "burp"}
+
+    def __init__(
+        self,
+        base_dir=None,
+        burp_api_url: Optional[str] = None,
+        bot_token: Optional[str] = None,
+        chat_id: Optional[str] = None,
+        webhook_url: Optional[str] = None,
+        events_file: Optional[str] = None,
+        rotate_every: Optional[int] = 10,
+        rotate_interval: Optional[float] = None
+    ):
+        """
+        Components behind the sharingan commands, built on first use
+        A one-shot command only pays for what it touches, e.g. report never
+        loads the Burp client. A daemon keeps a single Runtime, so stores,
+        the domain index, HTTP pools and Burp connections stay warm across
+        jobs. Settings default to BURP_API_URL, BOT_TOKEN and CHAT_ID.
+        Args:
+            base_dir: Directory holding the database directory
+            burp_api_url: Burp REST API root, or several comma separated
+            bot_token: Telegram bot token
+            chat_id: Telegram chat ID
+            webhook_url: Also POST events as JSON to this URL
+            events_file: Also append events to this JSONL file
+            rotate_every: Burp scans submitted per VPN identity
+            rotate_interval: Also rotate the VPN identity after this many seconds
+        """
+        self.base_dir = Path(base_dir) if base_dir else DEFAULT_BASE_DIR
+        self.database_dir = self.base_dir / "database"
+        self.database_dir.mkdir(exist_ok=True)
+        self.burp_api_url = burp_api_url or os.getenv("BURP_API_URL")
+        self.bot_token = bot_token or os.getenv("BOT_TOKEN")
+        self.chat_id = chat_id or os.getenv("CHAT_ID")
+        self.webhook_url = webhook_url
+        self.events_file = events_file
+        self.rotate_every = rotate_every
+        self.rotate_interval = rotate_interval
+
+        self._components: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._job_locks = {group: threading.Lock() for group in set(self.EXCLUSIVE.values())}
+
+    def _component(self, name: str, factory: Callable[[], Any]):
+        """Build a component once, later calls share it"""
+        with self._lock:
+            if name not in self._components:
+                self._components[name] = factory()
+            return self._components[name]
+
+    @property
+    def store(self):
+        from ..core.storage import DomainStore
+        return self._component("store", lambda: DomainStore.open_in(self.database_dir))
+
+    @property
+    def fingerprints(self):
+        from ..core.storage import IssueFingerprintStore
+        return self._component("fingerprints", lambda: IssueFingerprintStore.open_in(self.database_dir))
+
+    @property
+    def jobs(self):
+        from ..core.storage import ScanJobQueue
+        return self._component("jobs", lambda: ScanJobQueue.open_in(self.database_dir))
+
+    @property
+    def rotation(self):
+        def build():
+            from ..core.vpn import NordVPNRotator, RotationService
+            rotation = RotationService(NordVPNRotator(), every_n_scans=self.rotate_every, interval=self.rotate_interval)
+            # Pools opened before a rotation are not reused through the new exit
+            self.sessions.bind(rotation)
+            return rotation
+        return self._component("rotation", build)
+
+    @property
+    def sessions(self):
+        from ..core.identity import SessionManager
+        return self._component("sessions", SessionManager)
+
+    @property
+    def crawler(self):
+        from ..core.scanner import Crawler
+        session = self.sessions.session("discovery", pool_maxsize=8)
+        return self._component("crawler", lambda: Crawler(self.base_dir, store=self.store, session=session))
+
+    @property
+    def chaos(self):
+        from ..core.chaos import ChaosScanner
+        session = self.sessions.session("discovery", pool_maxsize=8)
+        return self._component("chaos", lambda: ChaosScanner(self.base_dir, store=self.store, session=session))
+
+    @property
+    def bus(self):
+        def build():
+            from ..core.notification import NotificationBus, TelegramNotifier, TelegramSink, WebhookSink, JsonlSink
+            bus = NotificationBus()
+            if self.bot_token and self.chat_id:
+                bus.subscribe(TelegramSink(TelegramNotifier(self.bot_token, self.chat_id)))
+            if self.webhook_url:
+                bus.subscribe(WebhookSink(self.webhook_url))
+            if self.events_file:
+                bus.subscribe(JsonlSink(self.events_file))
+            return bus
+        return self._component("bus", build)
+
+    @property
+    def scanner(self):
+        def build():
+            from ..core.scanner import Scanner
+            if not self.burp_api_url:
+                raise ValueError("No Burp API URL, set BURP_API_URL or pass --burp-api-url")
+            return Scanner(
+                self.burp_api_url, self.bot_token, self.chat_id,
+                fingerprint_store=self.fingerprints,
+                bus=self.bus if self.bus.sinks else None
+            )
+        return self._component("scanner", build)
+
+    def run(self, command: str, args: Optional[Dict[str, Any]] = None):
+        """Run a command by name, the entry point of daemon jobs"""
+        if command not in self.COMMANDS:
+            raise ValueError(f"Unknown command {command}")
+        group = self.EXCLUSIVE.get(command)
+        if group is None:
+            return getattr(self, command)(**(args or {}))
+        lock = self._job_locks[group]
+        if not lock.acquire(blocking=False):
+            logger.info(f"Waiting for the running {group} job before {command}")
+            lock.acquire()
+        try:
+            return getattr(self, command)(**(args or {}))
+        finally:
+            lock.release()
+
+    def discover(self, program: Optional[str] = None, refresh: bool = True) -> List[str]:
+        """
+        Discovered in-scope targets
+        Args:
+            program: Only return targets of this program
+            refresh: Sync chaos and the bug bounty list first; without it
+                targets come straight from the domain store
+        """
+        if refresh:
+            self.chaos.crawl_chaos_targets(incremental=True)
+            self.crawler.download_and_verify('local_chaos-bugbounty-list.json')
+            self.crawler.get_tag_domain('local_chaos-bugbounty-list.json')
+            self.crawler.map_domains(
+                "tagged_domains.json",
+                "chaos_domains.txt",
+                "chaos_domain_tagged.json"
+            )
+        if program:
+            return self.store.domains_for_program(program)
+        return list(self.store.iter_domains(in_scope=True))
+
+    def probe(
+        self,
+        targets: Iterable[str],
+        max_age: Optional[float] = 6 * 3600,
+        concurrency: int = 200,
+        timeout: float = 5
+    ) -> List[str]:
+        """
+        Live URLs among targets, reusing stored probes younger than max_age
+        Args:
+            targets: Domains or URLs
+            max_age: Seconds a stored probe result stays valid, 0 to reprobe
+            concurrency: Hosts probed at once
+            timeout: Seconds allowed per host and scheme
+        """
+        from ..core.scanner.liveness import LivenessProber
+        hosts = {target: LivenessProber.host_of(target) for target in targets}
+        known = self.store.probes(set(hosts.values()) - {None}, max_age) if max_age else {}
+        stale = [target for target, host in hosts.items() if host and host not in known]
+
+        if stale:
+            logger.info(f"Probing {len(stale)} targets for liveness")
+            results = LivenessProber(concurrency=concurrency, timeout=timeout).probe(stale)
+            self.store.record_probes(results)
+            known.update((result.host, result._asdict()) for result in results)
+
+        live = LivenessProber.live_targets(hosts, known)
+        logger.info(f"{len(live)} of {len(hosts)} targets are alive")
+        return live
+
+    def plan(self, targets: List[str], max_targets: Optional[int] = None, max_concurrent: int = 4, batch_size: int = 10) -> List[List[str]]:
+        """Rank targets and group them into multi-URL Burp scans"""
+        from ..core.scanner.liveness import LivenessProber
+        from ..core.scanner.planner import TargetPlanner
+        liveness = self.store.liveness(filter(None, map(LivenessProber.host_of, targets)))
+        planner = TargetPlanner(self.store, self.fingerprints, liveness=liveness, max_batch_size=batch_size)
+        return planner.plan(targets, limit=max_targets, slots=max_concurrent)
+
+    def scan(
+        self,
+        targets: Iterable[str] = (),
+        configs: Iterable[str] = ("Checking",),
+        max_targets: Optional[int] = None,
+        batch_size: int = 10,
+        max_concurrent: int = 4,
+        cycle: Optional[str] = None,
+        probe: bool = True,
+        use_vpn: bool = False,
+        attach: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Probe, plan and scan targets through Burp
+        Args:
+            targets: Domains or URLs
+            configs: Burp named scan configurations
+            max_targets: Keep only the best scored targets
+            batch_size: Most URLs per Burp scan
+            max_concurrent: Burp scans running at once
+            cycle: Job queue cycle to resume, a new one by default
+            probe: Drop targets that do not answer HTTP first
+            use_vpn: Rotate VPN identities in the background
+            attach: Running Burp scans to monitor, scan ID to URL
+        Returns:
+            Dict: Scheduler results and the cycle they belong to
+        """
+        targets = list(targets)
+        if targets and cycle:
+            # Batch only URLs the resumed cycle has not queued yet
+            targets = self.jobs.unqueued(targets, cycle)
+        if targets and probe:
+            targets = self.probe(targets)
+        batches = self.plan(targets, max_targets, max_concurrent, batch_size) if targets else []
+        return self.schedule(batches, configs, max_concurrent, cycle, use_vpn, attach=attach)
+
+    def schedule(
+        self,
+        batches: Iterable[Any],
+        configs: Iterable[str] = ("Checking",),
+        max_concurrent: int = 4,
+        cycle: Optional[str] = None,
+        use_vpn: bool = False,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        attach: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Scan planned URL batches through Burp, one scan per batch
+        Args:
+            batches: URLs or URL batches sharing a Burp scan
+            configs: Burp named scan configurations
+            max_concurrent: Burp scans running at once
+            cycle: Job queue cycle to resume, a new one by default
+            use_vpn: Rotate VPN identities in the background
+            username: Optional login username
+            password: Optional login password
+            attach: Running Burp scans to monitor, scan ID to URL
+        Returns:
+            Dict: Scheduler results and the cycle they belong to
+        """
+        from ..core.scanner import ScanScheduler
+        scheduler = ScanScheduler(
+            self.scanner,
+            max_concurrent=max_concurrent,
+            before_submit=self.rotation.before_submit if use_vpn else None,
+            can_submit=self.rotation.ready if use_vpn else None,
+            after_finish=self.rotation.scan_finished if use_vpn else None,
+            job_queue=self.jobs,
+            cycle=cycle or self.jobs.new_cycle()
+        )
+        logger.info(f"Scan cycle '{scheduler.cycle}', pass --cycle to resume it")
+        if use_vpn:
+            # Kept running between daemon jobs, stopped by close()
+            self.rotation.start()
+        results = scheduler.run(list(batches), list(configs), username, password, attach=attach)
+        results["cycle"] = scheduler.cycle
+        return results
+
+    def monitor(self, attach: Dict[str, str], cycle: Optional[str] = None, max_concurrent: int = 4) -> Dict[str, Any]:
+        """Follow running Burp scans, mapping scan ID to target URL, until they finish"""
+        return self.scan(attach=attach, cycle=cycle, max_concurrent=max_concurrent)
+
+    def report(
+        self,
+        cycle: Optional[str] = None,
+        status: Optional[str] = None,
+        render: bool = False,
+        output_dir: str = "reports"
+    ) -> Dict[str, Any]:
+        """
+        Job counts and jobs of a scan cycle
+        Args:
+            cycle: Only this cycle, all cycles if None
+            status: Only jobs in this status
+            render: Also write the Markdown and JSON reports of the
+                succeeded scans among the jobs, fetched from Burp
+            output_dir: Directory the rendered reports are written to
+        Returns:
+            Dict: Counts and jobs, plus the report paths of each rendered
+                scan ID when render is set
+        """
+        jobs = self.jobs.jobs(status=status, cycle=cycle)
+        result = {
+            "cycle": cycle,
+            "counts": self.jobs.counts(cycle),
+            "jobs": [
+                {key: job[key] for key in ("id", "cycle", "urls", "status", "scan_id", "issue_count", "reason", "finished_at")}
+                for job in jobs
+            ],
+        }
+        if render:
+            from ..core.storage import ScanJobQueue
+            scan_ids = [job["scan_id"] for job in jobs if job["status"] == ScanJobQueue.SUCCEEDED and job["scan_id"]]
+            reports = self.scanner.generate_reports_many(scan_ids, output_dir) if scan_ids else {}
+            result["reports"] = {
+                scan_id: dict(zip(("markdown", "json"), paths)) if paths else None
+                for scan_id, paths in reports.items()
+            }
+        return result
+
+    def notify(self, message: str, level: str = "info") -> Dict[str, Any]:
+        """Publish an alert to every configured sink and wait for delivery"""
+        if not self.bus.sinks:
+            raise ValueError("No notification sink configured")
+        self.bus.publish("alert", None, {"message": message, "level": level})
+        self.bus.flush()
+        return self.bus.stats()
+
+    def close(self):
+        """Stop background work and close every component built"""
+        with self._lock:
+            components = self._components
+            self._components = {}
+        if "rotation" in components:
+            components["rotation"].stop()
+        if "scanner" in components:
+            # Finishes pending reports, which publish to the bus, first
+            components["scanner"].close()
+        if "bus" in components:
+            # Deliver notifications still queued in the sinks
+            components["bus"].close()
+        for name in ("sessions", "jobs", "fingerprints", "store"):
+            if name in components:
+                components[name].close()
@@ -1,15 +1,21 @@
 """
 Core functionality package
 """
-from .vpn import NordVPNRotator
-from .scanner import Scanner, Crawler
-from .chaos import ChaosScanner
-from .notification import TelegramNotifier
+from .._lazy import attach
+
+_EXPORTS = {
+    'NordVPNRotator': '.vpn',
+    'Scanner': '.scanner',
+    'Crawler': '.scanner',
+    'ChaosScanner': '.chaos',
+    'TelegramNotifier': '.notification'
+}
+
+__getattr__, __dir__ = attach(__name__, _EXPORTS)
 
 __all__ = [
     'NordVPNRotator',
-    'ProtonVPNManager',
-    'Scanner', 
+    'Scanner',
     'Crawler',
     'ChaosScanner',
     'TelegramNotifier'
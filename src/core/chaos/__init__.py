@@ -1,6 +1,22 @@
 """
 Chaos scanning functionality
 """
-from .chaos import ChaosScanner
+from ..._lazy import attach
 
-__all__ = ['ChaosScanner']
\ No newline at end of file
+_EXPORTS = {
+    'ChaosScanner': '.chaos',
+    'ExternalSortedSet': '.dedup',
+    'ProgramDownloader': '.downloader',
+    'ProgramResult': '.downloader',
+    'ChaosSyncState': '.sync_state'
+}
+
+__getattr__, __dir__ = attach(__name__, _EXPORTS)
+
+__all__ = [
+    'ChaosScanner',
+    'ExternalSortedSet',
+    'ProgramDownloader',
+    'ProgramResult',
+    'ChaosSyncState'
+]
\ No newline at end of file
@@ -1,20 +1,37 @@
-import requests
-import zipfile
-import io
 import os
 import logging
 from pathlib import Path
-from tqdm import tqdm
+from .dedup import ExternalSortedSet
+from .downloader import ProgramDownloader
+from .sync_state import ChaosSyncState
+from ..storage import DomainStore
 
 class ChaosScanner:
-    def __init__(self, base_dir=None):
-        """Initialize ChaosScanner with base directory for file operations"""
+    SYNC_STATE_FILE = "chaos_sync_state.json"
+
+    def __init__(self, base_dir=None, workers=8, per_host=4, memory_budget_mb=64, store=None, session=None):
+        """
+        Initialize ChaosScanner with base directory for file operations
+        Args:
+            base_dir: Base directory holding the database directory
+            workers: Number of program archives downloaded concurrently
+            per_host: Maximum concurrent downloads against a single host
+            memory_budget_mb: Memory used for domain dedup before spilling
+                sorted runs to disk
+            store: DomainStore to record domains in, defaults to the one in
+                the database directory
+            session: Optional requests.Session for the downloads, e.g. from
+                a SessionManager
+        """
         self.base_dir = Path(base_dir) if base_dir else Path(__file__).parent.parent.parent
         self.database_dir = self.base_dir / "database"
         self.database_dir.mkdir(exist_ok=True)  # Create database dir if not exists
         
         self.CHAOS_INDEX = "https://chaos-data.projectdiscovery.io/index.json"
         self.CHAOS_BASE_URL = "https://chaos-data.projectdiscovery.io"
+        self.downloader = ProgramDownloader(workers=workers, per_host=per_host, session=session)
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.store = store or DomainStore.open_in(self.database_dir)
         
         # Setup logging
         logging.basicConfig(
@@ -23,41 +40,84 @@ class ChaosScanner:
         )
         self.logger = logging.getLogger(__name__)
 
-    def crawl_chaos_targets(self, output_file="chaos_domains.txt"):
+    def crawl_chaos_targets(self, output_file="chaos_domains.txt", incremental=False):
         """
         Crawl and download chaos targets
         Args:
             output_file: Name of file to save domains to
+            incremental: Only fetch programs changed since the last sync and
+                merge their domains into the existing output file
         Returns:
             bool: True if successful, False otherwise
         """
         try:
             self.logger.info("Starting chaos targets crawl")
-            res = requests.get(self.CHAOS_INDEX)
-            programs = res.json()
+            programs = self.downloader.fetch_index(self.CHAOS_INDEX)
         except Exception as e:
             self.logger.error(f"Failed to fetch chaos index: {e}")
             return False
 
-        all_domains = set()
-        
-        for program in tqdm(programs, desc="Downloading programs"):
-            name = program.get("name")
-            url = program.get("URL")
-            slug = url.split("/")[-1].replace(".zip", "")
-
-            try:
-                domains = self._process_program_zip(url)
-                all_domains.update(domains)
-                self.logger.debug(f"Successfully processed {name}: {len(domains)} domains")
-            except Exception as e:
-                self.logger.error(f"Failed to download {slug}: {e}")
-                continue
-
-        if all_domains:
-            self._save_domains(all_domains, output_file)
-            return True
-        return False
+        output_path = self.database_dir / output_file
+        state = ChaosSyncState(self.database_dir / self.SYNC_STATE_FILE)
+        headers_for = None
+
+        if incremental and output_path.exists():
+            programs = [program for program in programs if state.is_changed(program)]
+            headers_for = state.conditional_headers
+            self.logger.info(f"Incremental sync: {len(programs)} programs changed since last run")
+            if not programs:
+                return True
+        elif incremental:
+            self.logger.info(f"{output_file} not found, running a full sync")
+            incremental = False
+
+        synced = []
+        failed = []
+
+        with ExternalSortedSet(self.memory_budget, tmp_dir=self.database_dir) as all_domains:
+            for result in self.downloader.download(programs, headers_for=headers_for):
+                if result.error:
+                    failed.append(result.slug)
+                    continue
+                try:
+                    self.store.add_domains(
+                        self._collect(result.domains, all_domains),
+                        source="chaos",
+                        # Programs are only attributed from the tagged bug bounty list
+                        source_program=result.name
+                    )
+                except Exception as e:
+                    self.logger.error(f"Failed to extract {result.slug}: {e}")
+                    failed.append(result.slug)
+                    continue
+                synced.append(result)
+
+            if failed:
+                self.logger.warning(f"{len(failed)} programs failed to download: {', '.join(failed)}")
+
+            if incremental and all_domains:
+                with open(output_path, "r") as f:
+                    all_domains.update(line.strip() for line in f if line.strip())
+                self._save_domains(all_domains, output_file)
+            elif incremental:
+                self.logger.info(f"No new domains, keeping existing {output_file}")
+            elif all_domains:
+                self._save_domains(all_domains, output_file)
+            else:
+                return False
+
+        # Only record programs once their domains are safely on disk
+        for result in synced:
+            state.update(result.program, result.etag, result.last_modified)
+        state.save()
+        return True
+
+    @staticmethod
+    def _collect(domains, dedup):
+        """Feed streamed domains into the dedup set while passing them on"""
+        for domain in domains:
+            dedup.add(domain)
+            yield domain
 
     def _process_program_zip(self, url):
         """
@@ -65,35 +125,21 @@ class ChaosScanner:
         Args:
             url: URL of the zip file to process
         Returns:
-            set: Set of domains found in the zip file
+            Iterator[str]: Normalized domains, read lazily from the spooled archive
         """
-        domains = set()
-        zip_res = requests.get(url)
-        z = zipfile.ZipFile(io.BytesIO(zip_res.content))
-        
-        for file_name in z.namelist():
-            if file_name.endswith(".txt"):
-                with z.open(file_name) as f:
-                    domains.update(
-                        line.decode("utf-8").strip() 
-                        for line in f.readlines()
-                    )
-        return domains
+        return iter(self.downloader.fetch_program(url).domains)
 
     def _save_domains(self, domains, output_file):
         """
         Save domains to file
         Args:
-            domains: Set of domains to save
+            domains: ExternalSortedSet of domains to save
             output_file: Name of output file
         """
-        output_path = self.database_dir / output_file
-        with open(output_path, "w") as f:
-            for domain in sorted(domains):
-                f.write(f"{domain}\n")
+        count = domains.write(self.database_dir / output_file)
         
         self.logger.info(
-            f"Crawl complete. {len(domains)} domains saved to {output_file}"
+            f"Crawl complete. {count} domains saved to {output_file}"
         )
 
 def main():
@@ -109,10 +155,38 @@ def main():
         "--dir",
         help="Base directory for file operations"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Number of concurrent program downloads (default: 8)"
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=4,
+        help="Maximum concurrent downloads per host (default: 4)"
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        default=64,
+        help="Memory in MB used for domain dedup before spilling to disk (default: 64)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch programs changed since the last sync"
+    )
     args = parser.parse_args()
 
-    scanner = ChaosScanner(base_dir=args.dir)
-    scanner.crawl_chaos_targets(args.output)
+    scanner = ChaosScanner(
+        base_dir=args.dir,
+        workers=args.workers,
+        per_host=args.per_host,
+        memory_budget_mb=args.memory_budget
+    )
+    scanner.crawl_chaos_targets(args.output, incremental=args.incremental)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,105 @@
+import heapq
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class ExternalSortedSet:
+    # Rough per-entry cost of a str held in a set, on top of its characters
+    ENTRY_OVERHEAD = 100
+
+    def __init__(self, memory_budget=64 * 1024 * 1024, tmp_dir=None):
+        """
+        Out-of-core set of strings that iterates in sorted, deduplicated order
+        Args:
+            memory_budget: Approximate bytes buffered before a sorted run
+                is flushed to disk
+            tmp_dir: Directory for sorted runs, defaults to the system temp dir
+        """
+        self.memory_budget = memory_budget
+        self.tmp_dir = tmp_dir
+        self._buffer = set()
+        self._buffer_bytes = 0
+        self._runs = []
+
+    def add(self, item: str):
+        """Add a single item, spilling a sorted run when over budget"""
+        if item in self._buffer:
+            return
+        self._buffer.add(item)
+        self._buffer_bytes += len(item) + self.ENTRY_OVERHEAD
+        if self._buffer_bytes >= self.memory_budget:
+            self._flush_run()
+
+    def update(self, items: Iterable[str]):
+        """Add every item of an iterable"""
+        for item in items:
+            self.add(item)
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield unique items in sorted order, k-way merging all runs"""
+        files = [open(run, 'r', encoding='utf-8') for run in self._runs]
+        try:
+            streams = [(line.rstrip("\n") for line in f) for f in files]
+            streams.append(iter(sorted(self._buffer)))
+            previous = None
+            for item in heapq.merge(*streams):
+                if item != previous:
+                    yield item
+                    previous = item
+        finally:
+            for f in files:
+                f.close()
+
+    def __bool__(self) -> bool:
+        return bool(self._buffer or self._runs)
+
+    def write(self, path) -> int:
+        """
+        Atomically write the sorted unique items, one per line
+        Args:
+            path: Destination file
+        Returns:
+            int: Number of items written
+        """
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        count = 0
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for item in self:
+                f.write(f"{item}\n")
+                count += 1
+        os.replace(tmp_path, path)
+        return count
+
+    def close(self):
+        """Delete spilled runs and drop the in-memory buffer"""
+        for run in self._runs:
+            try:
+                os.unlink(run)
+            except OSError:
+                pass
+        self._runs = []
+        self._buffer = set()
+        self._buffer_bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _flush_run(self):
+        """Write the buffer to disk as one sorted run"""
+        fd, run = tempfile.mkstemp(prefix="dedup-run-", suffix=".txt", dir=self.tmp_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for item in sorted(self._buffer):
+                f.write(f"{item}\n")
+        self._runs.append(run)
+        logger.debug(f"Spilled {len(self._buffer)} items to sorted run {run}")
+        self._buffer = set()
+        self._buffer_bytes = 0
@@ -0,0 +1,254 @@
+import io
+import logging
+import random
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveDomains:
+    def __init__(self, archive, size=0):
+        """
+        Lazily iterate normalized domains from a spooled program archive
+        Args:
+            archive: Seekable file object holding the zip archive
+            size: Archive size in bytes, for progress reporting
+        """
+        self._archive = archive
+        self.size = size
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield domains member by member, closing the archive when done"""
+        try:
+            with zipfile.ZipFile(self._archive) as z:
+                for info in z.infolist():
+                    if not info.filename.endswith(".txt"):
+                        continue
+                    with z.open(info) as member:
+                        for line in io.TextIOWrapper(member, encoding="utf-8", errors="replace"):
+                            domain = line.strip().lower()
+                            if domain:
+                                yield domain
+        finally:
+            self.close()
+
+    def close(self):
+        """Release the spooled archive"""
+        self._archive.close()
+
+
+class FetchResult(NamedTuple):
+    """Domains and HTTP validators of one program archive"""
+    domains: Iterable[str]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+
+class ProgramResult(NamedTuple):
+    """Outcome of downloading a single chaos program"""
+    name: str
+    slug: str
+    url: str
+    domains: Iterable[str]
+    error: Optional[str] = None
+    program: Optional[dict] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+
+class ProgramDownloader:
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        workers=8,
+        per_host=4,
+        retries=3,
+        backoff=1.0,
+        timeout=60,
+        session=None,
+        spool_max_memory=1024 * 1024,
+        spool_dir=None
+    ):
+        """
+        Initialize a bounded-parallel downloader for chaos program archives
+        Args:
+            workers: Number of programs downloaded concurrently
+            per_host: Maximum concurrent requests against a single host
+            retries: Extra attempts per program after the first failure
+            backoff: Base delay in seconds, doubled on every retry
+            timeout: Per-request timeout in seconds
+            session: Optional requests.Session to share connections with,
+                its pool should hold at least workers connections per host
+            spool_max_memory: Archive size in bytes kept in memory before
+                spilling to a temporary file
+            spool_dir: Directory for spilled archives, defaults to the
+                system temp dir
+        """
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.timeout = timeout
+        self.spool_max_memory = spool_max_memory
+        self.spool_dir = spool_dir
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        # A shared session keeps the pools its owner configured
+        self.session = session
+
+        self._host_slots = {}
+        self._host_lock = threading.Lock()
+
+    def fetch_index(self, index_url):
+        """Fetch and decode the chaos index.json listing"""
+        response = self.session.get(index_url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_domains(self, url):
+        """
+        Download a program zip and extract its domains
+        Args:
+            url: URL of the zip file to process
+        Returns:
+            set: Set of domains found in the zip file
+        """
+        return set(self.fetch_program(url).domains)
+
+    def fetch_program(self, url, headers=None):
+        """
+        Spool a program zip to disk, honoring conditional request headers
+        Args:
+            url: URL of the zip file to process
+            headers: Optional If-None-Match/If-Modified-Since headers
+        Returns:
+            FetchResult: Lazy domain stream and validators, flagged
+                not_modified on 304
+        """
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if response.status_code == 304:
+                return FetchResult((), etag, last_modified, not_modified=True)
+            response.raise_for_status()
+
+            archive = tempfile.SpooledTemporaryFile(max_size=self.spool_max_memory, dir=self.spool_dir)
+            try:
+                size = 0
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    archive.write(chunk)
+                    size += len(chunk)
+                # Fail inside the retry loop rather than while consuming
+                zipfile.ZipFile(archive).close()
+                archive.seek(0)
+            except BaseException:
+                archive.close()
+                raise
+
+        return FetchResult(ArchiveDomains(archive, size), etag, last_modified)
+
+    def download(
+        self,
+        programs: Iterable[dict],
+        process: Optional[Callable[[str], Iterable[str]]] = None,
+        headers_for: Optional[Callable[[dict], Dict[str, str]]] = None
+    ) -> Iterator[ProgramResult]:
+        """
+        Download programs concurrently and yield results as they complete
+        Args:
+            programs: Program entries from the chaos index.json
+            process: Callable turning a program URL into its domains,
+                defaults to fetch_program
+            headers_for: Callable returning conditional request headers
+                for a program, only used with the default process
+        Returns:
+            Iterator[ProgramResult]: One result per program, in completion order
+        """
+        programs = [p for p in programs if p.get("URL")]
+        # Finished results hold spooled archives until consumed, so only a
+        # bounded number of programs is submitted ahead of the consumer
+        max_in_flight = self.workers * 2
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool, \
+                tqdm(total=len(programs), desc="Downloading programs") as progress:
+            remaining = iter(programs)
+            in_flight = set()
+            while True:
+                for program in remaining:
+                    in_flight.add(pool.submit(self._download_one, program, process, headers_for))
+                    if len(in_flight) >= max_in_flight:
+                        break
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield self._report(future.result(), progress)
+
+    @staticmethod
+    def _report(result, progress):
+        """Advance the progress bar with a finished program"""
+        progress.update(1)
+        if result.error:
+            status = "failed"
+        elif result.not_modified:
+            status = "unchanged"
+        elif isinstance(result.domains, ArchiveDomains):
+            status = f"{result.domains.size // 1024} KB"
+        else:
+            status = len(result.domains)
+        progress.set_postfix_str(f"{result.slug}: {status}")
+        return result
+
+    def _download_one(self, program, process, headers_for):
+        """Download one program with per-host limiting and retries"""
+        name = program.get("name")
+        url = program.get("URL")
+        slug = url.split("/")[-1].replace(".zip", "")
+        headers = headers_for(program) if headers_for else None
+
+        for attempt in range(self.retries + 1):
+            try:
+                with self._slot_for(url):
+                    if process:
+                        fetched = FetchResult(process(url))
+                    else:
+                        fetched = self.fetch_program(url, headers)
+                logger.debug(f"Successfully downloaded {name}")
+                return ProgramResult(
+                    name, slug, url, fetched.domains, program=program,
+                    etag=fetched.etag,
+                    last_modified=fetched.last_modified,
+                    not_modified=fetched.not_modified
+                )
+            except Exception as e:
+                if attempt == self.retries:
+                    logger.error(f"Failed to download {slug}: {e}")
+                    return ProgramResult(name, slug, url, set(), str(e), program=program)
+                delay = self.backoff * (2 ** attempt) * (1 + random.random())
+                logger.warning(f"Retrying {slug} in {delay:.1f}s after error: {e}")
+                time.sleep(delay)
+
+    def _slot_for(self, url):
+        """Return the semaphore bounding concurrency for the URL's host"""
+        host = urlparse(url).netloc
+        with self._host_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
@@ -0,0 +1,74 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ChaosSyncState:
+    def __init__(self, path):
+        """
+        Per-program sync state for incremental chaos refreshes
+        Args:
+            path: JSON file the state is persisted to
+        """
+        self.path = Path(path)
+        self.programs: Dict[str, dict] = {}
+        self.load()
+
+    def load(self):
+        """Load state from disk, starting empty if missing or corrupt"""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.programs = json.load(f).get("programs", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sync state {self.path}: {e}")
+            self.programs = {}
+
+    def save(self):
+        """Atomically write state to disk"""
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"programs": self.programs}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def is_changed(self, program: dict) -> bool:
+        """
+        Check whether index metadata differs from the last sync
+        Args:
+            program: Program entry from the chaos index.json
+        Returns:
+            bool: True if the program has to be fetched again
+        """
+        known = self.programs.get(program.get("URL"))
+        if not known:
+            return True
+        return (
+            known.get("last_updated") != program.get("last_updated")
+            or known.get("count") != program.get("count")
+        )
+
+    def conditional_headers(self, program: dict) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers for a program"""
+        known = self.programs.get(program.get("URL"), {})
+        headers = {}
+        if known.get("etag"):
+            headers["If-None-Match"] = known["etag"]
+        if known.get("last_modified"):
+            headers["If-Modified-Since"] = known["last_modified"]
+        return headers
+
+    def update(self, program: dict, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Record index metadata and HTTP validators after a successful sync"""
+        known = self.programs.get(program.get("URL"), {})
+        self.programs[program.get("URL")] = {
+            "name": program.get("name"),
+            "last_updated": program.get("last_updated"),
+            "count": program.get("count"),
+            "etag": etag or known.get("etag"),
+            "last_modified": last_modified or known.get("last_modified"),
+        }
@@ -0,0 +1,16 @@
+"""
+Identity management modules
+"""
+from ..._lazy import attach
+
+_EXPORTS = {
+    'SessionManager': '.sessions',
+    'UserAgentManager': '.user_agent'
+}
+
+__getattr__, __dir__ = attach(__name__, _EXPORTS)
+
+__all__ = [
+    'SessionManager',
+    'UserAgentManager'
+]
\ No newline at end of file
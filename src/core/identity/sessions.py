@@ -0,0 +1,140 @@
+import logging
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import default_headers
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+
+class SessionManager:
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        retries: int = 2
+    ):
+        """
+        Keep-alive HTTP sessions bound to the active VPN identity
+        Modules ask for a named session once and keep using it. Each
+        session pools connections per host; when the identity changes its
+        pools are dropped, cookies cleared and the identity's User-Agent
+        applied, so no connection or state opened through the previous
+        exit is reused. The session objects themselves stay the same.
+        Binding only reacts to identities a rotation connects; it neither
+        starts the VPN nor waits for it, so requests made before the first
+        identity, e.g. discovery ahead of a scan, use the direct route.
+        Args:
+            headers: Headers sent by every session on top of the defaults
+            pool_connections: Hosts a session keeps pools for
+            pool_maxsize: Default connections kept per host
+            retries: Retries on connection errors and 502/503/504
+        """
+        self.headers = dict(headers or {})
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.retries = retries
+
+        self.identity = None
+        self.generation = 0
+        self._sessions: Dict[str, requests.Session] = {}
+        self._pool_sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def user_agent(self) -> Optional[str]:
+        """User-Agent of the active identity, None before the first one"""
+        return getattr(self.identity, "user_agent", None)
+
+    def session(self, name: str = "default", pool_maxsize: Optional[int] = None) -> requests.Session:
+        """
+        Shared session for a purpose, created on first use
+        Args:
+            name: Purpose of the session, e.g. "discovery"
+            pool_maxsize: Connections kept per host, grows an existing pool
+        Returns:
+            requests.Session: Session carrying the active identity
+        """
+        size = pool_maxsize or self.pool_maxsize
+        with self._lock:
+            session = self._sessions.get(name)
+            if session is None:
+                session = self._sessions[name] = requests.Session()
+                self._pool_sizes[name] = size
+                self._configure(session, size)
+            elif size > self._pool_sizes[name]:
+                self._pool_sizes[name] = size
+                self._mount(session, size)
+            return session
+
+    def set_identity(self, identity) -> bool:
+        """
+        Switch to a new identity, anything with ip and user_agent attributes
+        Returns:
+            bool: True if the identity differed and the pools were reset
+        """
+        key = (getattr(identity, "ip", None), getattr(identity, "user_agent", None))
+        current = (getattr(self.identity, "ip", None), self.user_agent)
+        if identity is None or key == current:
+            return False
+        self.identity = identity
+        self.invalidate()
+        logger.info(f"HTTP sessions bound to identity {key[0]}")
+        return True
+
+    def bind(self, rotation) -> "SessionManager":
+        """Follow the identities connected by a RotationService"""
+        rotation.subscribe(self.set_identity)
+        self.set_identity(rotation.current())
+        return self
+
+    def invalidate(self):
+        """Drop pooled connections and cookies of every session"""
+        with self._lock:
+            self.generation += 1
+            for name, session in self._sessions.items():
+                for adapter in session.adapters.values():
+                    adapter.close()
+                session.cookies.clear()
+                self._configure(session, self._pool_sizes[name])
+
+    def stats(self) -> Dict[str, int]:
+        """Sessions held and identities seen"""
+        with self._lock:
+            return {"sessions": len(self._sessions), "generation": self.generation}
+
+    def close(self):
+        """Close every session"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._pool_sizes.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _configure(self, session: requests.Session, size: int):
+        session.headers = default_headers()
+        session.headers.update(self.headers)
+        if self.user_agent:
+            session.headers["User-Agent"] = self.user_agent
+        self._mount(session, size)
+
+    def _mount(self, session: requests.Session, size: int):
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=size, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
@@ -0,0 +1,172 @@
+import json
+import logging
+import random
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Desktop and mobile platforms paired with the browsers that ship on them
+_WINDOWS = "Windows NT 10.0; Win64; x64"
+_MAC = "Macintosh; Intel Mac OS X 10_15_7"
+_LINUX = "X11; Linux x86_64"
+_ANDROID = "Linux; Android 10; K"
+_IPHONE = "iPhone; CPU iPhone OS {os} like Mac OS X"
+
+_CHROME = "Mozilla/5.0 ({platform}) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{version}.0.0.0 {mobile}Safari/537.36"
+_EDGE = "Mozilla/5.0 ({platform}) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{version}.0.0.0 Safari/537.36 Edg/{version}.0.0.0"
+_FIREFOX = "Mozilla/5.0 ({platform}; rv:{version}.0) Gecko/20100101 Firefox/{version}.0"
+_SAFARI = "Mozilla/5.0 ({platform}) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/{version} {mobile}Safari/605.1.15"
+
+# Approximate global browser share, split evenly over each browser's agents
+BROWSER_SHARE = {
+    "chrome": 0.65,
+    "safari": 0.18,
+    "edge": 0.06,
+    "firefox": 0.04,
+}
+
+
+def _builtin_agents() -> List[Tuple[str, str]]:
+    """Browser and User-Agent pairs of current stable releases"""
+    agents = []
+    for version in (128, 129, 130, 131):
+        for platform in (_WINDOWS, _MAC, _LINUX):
+            agents.append(("chrome", _CHROME.format(platform=platform, version=version, mobile="")))
+        agents.append(("chrome", _CHROME.format(platform=_ANDROID, version=version, mobile="Mobile ")))
+        for platform in (_WINDOWS, _MAC):
+            agents.append(("edge", _EDGE.format(platform=platform, version=version)))
+    for version in ("17.6", "18.0", "18.1"):
+        agents.append(("safari", _SAFARI.format(platform=_MAC, version=version, mobile="")))
+        iphone = _IPHONE.format(os=version.replace(".", "_"))
+        agents.append(("safari", _SAFARI.format(platform=iphone, version=version, mobile="Mobile/15E148 ")))
+    for version in (130, 131, 132):
+        for platform in (_WINDOWS, _MAC, _LINUX):
+            agents.append(("firefox", _FIREFOX.format(platform=platform, version=version)))
+    return agents
+
+
+class AliasTable:
+    def __init__(self, weights: Sequence[float]):
+        """
+        Walker's alias table for constant time weighted sampling
+        Args:
+            weights: Non-negative weights, at least one of them positive
+        """
+        if any(w < 0 for w in weights):
+            raise ValueError("AliasTable weights must not be negative")
+        self.size = len(weights)
+        # Zero weights are left out, so rounding can never make them drawable
+        self.index = [i for i, w in enumerate(weights) if w > 0]
+        n = len(self.index)
+        if not n:
+            raise ValueError("AliasTable needs at least one positive weight")
+        total = float(sum(weights[i] for i in self.index))
+        scaled = [weights[i] * n / total for i in self.index]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Leftovers are positive weights at 1.0 up to rounding error
+
+    def __len__(self):
+        return self.size
+
+    def sample(self, rng: random.Random) -> int:
+        """Index drawn with probability proportional to its weight"""
+        i = rng.randrange(len(self.prob))
+        return self.index[i if rng.random() < self.prob[i] else self.alias[i]]
+
+
+class UserAgentManager:
+    # Pools parsed once per process, keyed by source file (None is the built-in pool)
+    _pools: Dict[Optional[str], Tuple[List[str], List[str], List[float]]] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, path=None, seed: Optional[int] = None):
+        """
+        Weighted User-Agent pool without network access
+        The built-in pool covers current Chrome, Safari, Edge and Firefox
+        releases weighted by browser share. A JSON file of
+        {"browser", "user_agent", "weight"} objects replaces it, e.g. to
+        refresh versions without a release. Either is loaded once per
+        process and sampled in constant time.
+        Args:
+            path: Optional JSON file with the pool
+            seed: Seed for reproducible sequences, e.g. in tests
+        """
+        self.path = str(path) if path else None
+        self.browsers, self.agents, self.weights = self._load(self.path)
+        self.rng = random.Random(seed)
+        self._tables: Dict[Optional[str], Tuple[List[int], AliasTable]] = {
+            None: (list(range(len(self.agents))), AliasTable(self.weights))
+        }
+
+    def __len__(self):
+        return len(self.agents)
+
+    def get_random(self, browser: Optional[str] = None) -> str:
+        """
+        Draw a User-Agent
+        Args:
+            browser: Only draw agents of this browser, e.g. "firefox"
+        Returns:
+            str: User-Agent header value
+        """
+        indices, table = self._table(browser)
+        return self.agents[indices[table.sample(self.rng)]]
+
+    @property
+    def random(self) -> str:
+        """fake_useragent compatible spelling of get_random()"""
+        return self.get_random()
+
+    def _table(self, browser: Optional[str]):
+        browser = browser.lower() if browser else None
+        cached = self._tables.get(browser)
+        if cached is None:
+            indices = [i for i, name in enumerate(self.browsers) if name == browser]
+            if not indices:
+                raise ValueError(f"No User-Agents for browser {browser}")
+            cached = self._tables[browser] = (indices, AliasTable([self.weights[i] for i in indices]))
+        return cached
+
+    @classmethod
+    def _load(cls, path: Optional[str]):
+        with cls._pools_lock:
+            pool = cls._pools.get(path)
+            if pool is None:
+                pool = cls._pools[path] = cls._read(path) if path else cls._builtin()
+            return pool
+
+    @staticmethod
+    def _builtin():
+        agents = _builtin_agents()
+        counts = {}
+        for browser, _ in agents:
+            counts[browser] = counts.get(browser, 0) + 1
+        return (
+            [browser for browser, _ in agents],
+            [agent for _, agent in agents],
+            [BROWSER_SHARE[browser] / counts[browser] for browser, _ in agents]
+        )
+
+    @staticmethod
+    def _read(path: str):
+        with open(Path(path), encoding="utf-8") as f:
+            entries = json.load(f)
+        entries = [entry for entry in entries if entry.get("user_agent")]
+        logger.info(f"Loaded {len(entries)} User-Agents from {path}")
+        return (
+            [str(entry.get("browser", "other")).lower() for entry in entries],
+            [entry["user_agent"] for entry in entries],
+            [float(entry.get("weight", 1.0)) for entry in entries]
+        )
@@ -1,6 +1,30 @@
 """
 Notification functionality
 """
-from .tele_notifyer import TelegramNotifier
+from ..._lazy import attach
 
-__all__ = ['TelegramNotifier']
\ No newline at end of file
+_EXPORTS = {
+    'TelegramNotifier': '.tele_notifyer',
+    'TelegramDeliveryQueue': '.delivery_queue',
+    'NotificationBus': '.bus',
+    'NotificationEvent': '.bus',
+    'Sink': '.bus',
+    'TelegramSink': '.sinks',
+    'WebhookSink': '.sinks',
+    'JsonlSink': '.sinks',
+    'LocalNotificationServer': '.local_server'
+}
+
+__getattr__, __dir__ = attach(__name__, _EXPORTS)
+
+__all__ = [
+    'TelegramNotifier',
+    'TelegramDeliveryQueue',
+    'NotificationBus',
+    'NotificationEvent',
+    'Sink',
+    'TelegramSink',
+    'WebhookSink',
+    'JsonlSink',
+    'LocalNotificationServer'
+]
\ No newline at end of file
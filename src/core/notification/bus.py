@@ -0,0 +1,191 @@
+import abc
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationEvent(NamedTuple):
+    kind: str
+    scan_id: Optional[str]
+    payload: Dict[str, Any]
+    timestamp: float
+
+
+class Sink(abc.ABC):
+    # Event kinds the sink subscribes to, None receives everything
+    kinds: Optional[Iterable[str]] = None
+    # Events buffered before the oldest are dropped
+    max_queue = 1000
+    # Seconds publish() may wait for room before dropping the oldest event
+    block_timeout = 0.0
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    def accepts(self, event: NotificationEvent) -> bool:
+        """Whether the sink subscribes to an event"""
+        return self.kinds is None or event.kind in self.kinds
+
+    @abc.abstractmethod
+    def handle(self, event: NotificationEvent):
+        """Deliver one event, called from the sink's own worker thread"""
+
+    def flush(self):
+        """Wait until handled events have left the sink, for sinks that deliver in the background"""
+
+    def stats(self) -> Dict[str, int]:
+        """Sink specific delivery counters, merged into NotificationBus.stats()"""
+        return {}
+
+    def close(self):
+        """Release resources once the worker has drained its queue"""
+
+
+_STOP = object()
+
+
+class _SinkWorker:
+    def __init__(self, sink: Sink):
+        """Bounded queue and delivery thread of a single sink"""
+        self.sink = sink
+        self.queue: "queue.Queue" = queue.Queue(maxsize=sink.max_queue)
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name=f"sink-{sink.name}", daemon=True)
+        self._thread.start()
+
+    def put(self, event: NotificationEvent):
+        """Buffer an event, dropping the oldest one when the sink falls behind"""
+        try:
+            if self.sink.block_timeout:
+                self.queue.put(event, timeout=self.sink.block_timeout)
+            else:
+                self.queue.put_nowait(event)
+            return
+        except queue.Full:
+            pass
+        try:
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.dropped += 1
+            logger.warning(f"{self.sink.name} is falling behind, dropped its oldest event")
+        except queue.Empty:
+            pass
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: Optional[float]):
+        """Drain the queue, stop the thread and close the sink"""
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning(f"{self.sink.name} did not drain in time, {self.queue.qsize()} events left")
+            return
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(f"{self.sink.name} did not drain in time, {self.queue.qsize()} events left")
+            return
+        try:
+            self.sink.close()
+        except Exception as e:
+            logger.error(f"Error closing {self.sink.name}: {e}")
+
+    def _run(self):
+        while True:
+            event = self.queue.get()
+            try:
+                if event is _STOP:
+                    return
+                self.sink.handle(event)
+                self.delivered += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"{self.sink.name} failed to handle {event.kind} event: {e}")
+            finally:
+                self.queue.task_done()
+
+
+class NotificationBus:
+    def __init__(self, sinks: Iterable[Sink] = ()):
+        """
+        Fan scan events out to notification sinks
+        Every sink gets its own worker thread and bounded queue, so a slow
+        or failing sink only backs up its own queue. publish() never waits
+        longer than a sink's block_timeout, after which the sink's oldest
+        event is dropped.
+        Args:
+            sinks: Sinks subscribed from the start
+        """
+        self._workers: List[_SinkWorker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        for sink in sinks:
+            self.subscribe(sink)
+
+    def subscribe(self, sink: Sink) -> Sink:
+        """Start delivering events to a sink"""
+        with self._lock:
+            self._workers.append(_SinkWorker(sink))
+        return sink
+
+    @property
+    def sinks(self) -> List[Sink]:
+        return [worker.sink for worker in self._workers]
+
+    def publish(self, kind: str, scan_id=None, payload: Optional[Dict[str, Any]] = None):
+        """
+        Publish an event to every subscribed sink
+        Args:
+            kind: Event kind, e.g. "issue", "alert" or "report"
+            scan_id: Burp scan the event belongs to, if any
+            payload: Event data, e.g. the Burp issue object
+        """
+        if self._closed:
+            logger.warning(f"Notification bus closed, dropping {kind} event")
+            return
+        event = NotificationEvent(kind, None if scan_id is None else str(scan_id), payload or {}, time.time())
+        for worker in self._workers:
+            if worker.sink.accepts(event):
+                worker.put(event)
+
+    def flush(self):
+        """Wait until every queued event has been handled and delivered by its sink"""
+        for worker in self._workers:
+            worker.queue.join()
+            worker.sink.flush()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Delivered, failed, dropped and queued events per sink"""
+        return {
+            worker.sink.name: {
+                "delivered": worker.delivered,
+                "failed": worker.failed,
+                "dropped": worker.dropped,
+                "queued": worker.queue.qsize(),
+                **worker.sink.stats(),
+            }
+            for worker in self._workers
+        }
+
+    def close(self, timeout: Optional[float] = 30):
+        """Deliver what is queued and stop every sink, only the first call has an effect"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for worker in self._workers:
+            worker.close(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
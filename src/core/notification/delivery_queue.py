@@ -0,0 +1,300 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Classic token bucket
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens, i.e. the allowed burst
+            clock: Monotonic time source
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available, 0 if one is available now"""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        """Consume a token, callers check wait_time() first"""
+        self._refill()
+        self.tokens -= 1
+
+
+class _ChatState:
+    def __init__(self, bucket: TokenBucket):
+        """Pending messages and rate limit state of one chat"""
+        self.pending: Deque[str] = deque()
+        self.bucket = bucket
+        self.blocked_until = 0.0
+        self.failures = 0
+        # Messages to send one by one after a coalesced send was rejected
+        self.unbatched = 0
+
+
+class TelegramDeliveryQueue:
+    API_BASE = "https://api.telegram.org"
+    MAX_MESSAGE_LENGTH = 4096
+    SEPARATOR = "\n\n"
+
+    def __init__(
+        self,
+        bot_token: str,
+        chat_id: Optional[str] = None,
+        rate: float = 1.0,
+        burst: float = 3,
+        max_pending: int = 10000,
+        retries: int = 3,
+        timeout: float = 15,
+        session: Optional[requests.Session] = None,
+        clock: Callable[[], float] = time.monotonic,
+        api_base: str = API_BASE
+    ):
+        """
+        Deliver Telegram messages from a background thread
+        enqueue() never blocks: messages are buffered per chat and sent
+        over a pooled session, rate limited by a token bucket per chat.
+        Messages queued for the same chat are coalesced into one send up
+        to Telegram's 4096 character limit, and 429 responses pause the
+        chat for the ``retry_after`` Telegram asks for. Other 4xx answers
+        are not retried: a rejected batch is resent one message at a time
+        so a single malformed message only drops itself.
+        Args:
+            bot_token: Telegram bot token
+            chat_id: Default chat for enqueue()
+            rate: Messages per second allowed per chat
+            burst: Messages a chat may send back to back
+            max_pending: Messages buffered per chat before the oldest are dropped
+            retries: Attempts per message on network errors and 5xx
+            timeout: HTTP timeout in seconds
+            session: Optional requests.Session to send with
+            clock: Monotonic time source, replaceable in tests
+            api_base: Telegram Bot API root, e.g. a local stand-in server
+        """
+        self.api_url = f"{api_base.rstrip('/')}/bot{bot_token}/sendMessage"
+        self.chat_id = chat_id
+        self.rate = rate
+        self.burst = burst
+        self.max_pending = max_pending
+        self.retries = retries
+        self.timeout = timeout
+        self.clock = clock
+
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount("https://", adapter)
+
+        self.sent = 0
+        self.dropped = 0
+        self._chats: Dict[str, _ChatState] = {}
+        self._cond = threading.Condition()
+        self._closing = False
+        self._deadline: Optional[float] = None
+        # Messages taken off a chat and not yet sent, requeued or dropped
+        self._sending = 0
+        self._thread = threading.Thread(target=self._run, name="telegram-delivery", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, text: str, chat_id: Optional[str] = None):
+        """Queue a message for delivery without waiting for it"""
+        chat_id = str(chat_id or self.chat_id)
+        with self._cond:
+            if self._closing:
+                logger.warning("Delivery queue closed, dropping message")
+                self.dropped += 1
+                return
+            chat = self._chats.get(chat_id)
+            if chat is None:
+                chat = self._chats[chat_id] = _ChatState(TokenBucket(self.rate, self.burst, self.clock))
+            if len(chat.pending) >= self.max_pending:
+                chat.pending.popleft()
+                self.dropped += 1
+                logger.warning(f"Too many pending messages for chat {chat_id}, dropped the oldest")
+            chat.pending.append(self._truncate(text))
+            self._cond.notify()
+
+    def pending(self) -> int:
+        """Messages waiting to be sent"""
+        with self._cond:
+            return sum(len(chat.pending) for chat in self._chats.values())
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued message was sent or given up on
+        Args:
+            timeout: Seconds to wait, None waits until the queue is empty
+        Returns:
+            bool: False if messages were still waiting after timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._sending or any(chat.pending for chat in self._chats.values()):
+                if not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                # Rechecked at least every second in case the worker exited
+                self._cond.wait(1 if remaining is None else min(remaining, 1))
+            return True
+
+    def close(self, timeout: Optional[float] = 30):
+        """
+        Flush pending messages and stop the worker
+        Args:
+            timeout: Seconds to keep flushing before giving up, None waits
+                until everything was delivered
+        """
+        with self._cond:
+            self._closing = True
+            if timeout is not None:
+                self._deadline = self.clock() + timeout
+            self._cond.notify()
+        self._thread.join(timeout if timeout is None else timeout + 1)
+        if self.pending():
+            logger.warning(f"Delivery queue closed with {self.pending()} undelivered messages")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _truncate(self, text: str) -> str:
+        """Fit a single message within Telegram's limit"""
+        if len(text) <= self.MAX_MESSAGE_LENGTH:
+            return text
+        return text[:self.MAX_MESSAGE_LENGTH - 3] + "..."
+
+    def _next_batch(self):
+        """
+        Pick a chat that may send now and coalesce its pending messages
+        Returns:
+            tuple: (chat_id, messages) to send, or (None, seconds to wait)
+        """
+        now = self.clock()
+        wait = None
+        for chat_id, chat in self._chats.items():
+            if not chat.pending:
+                continue
+            delay = max(chat.blocked_until - now, chat.bucket.wait_time())
+            if delay > 0:
+                wait = delay if wait is None else min(wait, delay)
+                continue
+
+            chat.bucket.take()
+            batch = [chat.pending.popleft()]
+            if chat.unbatched:
+                chat.unbatched -= 1
+                return chat_id, batch
+            length = len(batch[0])
+            while chat.pending and length + len(self.SEPARATOR) + len(chat.pending[0]) <= self.MAX_MESSAGE_LENGTH:
+                length += len(self.SEPARATOR) + len(chat.pending[0])
+                batch.append(chat.pending.popleft())
+            return chat_id, batch
+        return None, wait
+
+    def _run(self):
+        """Worker loop, exits once closed and flushed or past the deadline"""
+        while True:
+            with self._cond:
+                while True:
+                    if self._deadline is not None and self.clock() >= self._deadline:
+                        return
+                    chat_id, batch = self._next_batch()
+                    if chat_id is not None:
+                        self._sending = len(batch)
+                        break
+                    if self._closing and batch is None:
+                        return
+                    if self._deadline is not None:
+                        remaining = self._deadline - self.clock()
+                        batch = remaining if batch is None else min(batch, remaining)
+                    self._cond.wait(batch)
+            try:
+                self._deliver(chat_id, batch)
+            finally:
+                with self._cond:
+                    self._sending = 0
+                    self._cond.notify_all()
+
+    def _deliver(self, chat_id: str, batch: List[str]):
+        """Send one coalesced message, requeueing it when rate limited"""
+        payload = {
+            "chat_id": chat_id,
+            "text": self.SEPARATOR.join(batch),
+            "parse_mode": "Markdown",
+            "disable_web_page_preview": True
+        }
+        retry_after = None
+        try:
+            response = self.session.post(self.api_url, json=payload, timeout=self.timeout)
+            if response.status_code == 200:
+                with self._cond:
+                    self._chats[chat_id].failures = 0
+                self.sent += len(batch)
+                logger.debug(f"Delivered {len(batch)} messages to chat {chat_id}")
+                return
+            if response.status_code == 429:
+                try:
+                    retry_after = response.json().get("parameters", {}).get("retry_after")
+                except ValueError:
+                    pass
+                retry_after = float(retry_after or 1)
+                logger.warning(f"Rate limited by Telegram, retrying chat {chat_id} in {retry_after}s")
+            elif 400 <= response.status_code < 500:
+                self._reject(chat_id, batch, response)
+                return
+            else:
+                logger.error(f"Failed to send message: {response.text}")
+        except Exception as e:
+            logger.error(f"Error sending message: {e}")
+
+        with self._cond:
+            chat = self._chats[chat_id]
+            if retry_after is None:
+                chat.failures += 1
+                if chat.failures >= self.retries:
+                    chat.failures = 0
+                    self.dropped += len(batch)
+                    logger.error(f"Giving up on {len(batch)} messages for chat {chat_id}")
+                    return
+                retry_after = min(2 ** chat.failures, 30)
+            chat.blocked_until = self.clock() + retry_after
+            chat.pending.extendleft(reversed(batch))
+
+    def _reject(self, chat_id: str, batch: List[str], response):
+        """Handle a 4xx answer, which resending the same text cannot fix"""
+        with self._cond:
+            chat = self._chats[chat_id]
+            chat.failures = 0
+            if response.status_code == 400 and len(batch) > 1:
+                # One bad message, e.g. broken Markdown, fails the whole batch
+                logger.warning(f"Telegram rejected {len(batch)} coalesced messages, resending them one by one")
+                chat.unbatched = len(batch)
+                chat.pending.extendleft(reversed(batch))
+                return
+            self.dropped += len(batch)
+        logger.error(f"Telegram rejected a message for chat {chat_id}, dropping it: {response.text}")
@@ -0,0 +1,117 @@
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Any, Dict
+
+MARKDOWN_SPECIAL_CHARS = "_*[]()~`>#+-=|{}.!"
+
+# Precomputed (char, escaped) pairs. On CPython a chain of str.replace()
+# calls beats both str.translate() with multi-character replacements and a
+# compiled re.sub() for these message sizes, see test/bench_formatting.py
+_MARKDOWN_ESCAPES = tuple((char, f"\\{char}") for char in MARKDOWN_SPECIAL_CHARS)
+
+ISSUE_TEMPLATE = (
+    "*💣💣 New Security Issue Found 💣💣*\n\n"
+    "*Issue ID*: `{id}`\n"
+    "*Name*: `{name}`\n"
+    "*Severity*: `{severity}`\n"
+    "*Confidence*: `{confidence}`\n"
+    "*URL*: `{url}`\n"
+)
+DESCRIPTION_TEMPLATE = "\n*Description*:\n{description}\n"
+ALERT_TEMPLATE = "*🚨🚨New Alert🚨🚨*\n\n*Message*: `{text}`\n"
+
+DESCRIPTION_LIMIT = 500
+
+
+def escape_markdown(text: str) -> str:
+    """Escape Telegram Markdown special characters"""
+    for char, escaped in _MARKDOWN_ESCAPES:
+        if char in text:
+            text = text.replace(char, escaped)
+    return text
+
+
+@lru_cache(maxsize=1024)
+def _escape_cached(text: str) -> str:
+    """escape_markdown for values that repeat across issues, e.g. issue names"""
+    return escape_markdown(text)
+
+
+def truncate_text(text: str, max_length: int) -> str:
+    """Truncate text and add ellipsis if too long"""
+    if len(text) <= max_length:
+        return text
+    return text[:max_length - 3] + "..."
+
+
+class _TextExtractor(HTMLParser):
+    # Tags rendered as line breaks, everything else is dropped
+    BREAKS = {"br": "\n", "p": "\n", "div": "\n", "ul": "\n", "ol": "\n", "tr": "\n"}
+    END_BREAKS = {"li": "\n", "p": "\n", "div": "\n"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "li":
+            self.parts.append("• ")
+        elif tag in self.BREAKS:
+            self.parts.append(self.BREAKS[tag])
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in self.END_BREAKS:
+            self.parts.append(self.END_BREAKS[tag])
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """
+    Convert a Burp issue description to plain text
+    List items become bullets, block tags line breaks, other tags are
+    dropped and entities decoded.
+    """
+    if "<" not in html and "&" not in html:
+        return html
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return "".join(parser.parts)
+
+
+@lru_cache(maxsize=1024)
+def format_description(html: str, max_length: int = DESCRIPTION_LIMIT) -> str:
+    """
+    Plain-text, truncated and escaped description section
+    Burp descriptions are fixed per issue type, so results are cached.
+    """
+    text = truncate_text(html_to_text(html), max_length)
+    return DESCRIPTION_TEMPLATE.format(description=escape_markdown(text))
+
+
+def format_issue_message(issue: Dict[str, Any]) -> str:
+    """Format a Burp issue into a Telegram Markdown message"""
+    origin = issue.get("origin", "")
+    path = issue.get("path", "")
+    full_url = f"{origin}{path}" if origin and path else "N/A"
+
+    message = ISSUE_TEMPLATE.format(
+        id=issue.get("id", "N/A"),
+        name=_escape_cached(issue.get("name", "N/A")),
+        severity=issue.get("severity", "N/A"),
+        confidence=issue.get("confidence", "N/A"),
+        url=escape_markdown(full_url)
+    )
+    if "description" in issue:
+        message += format_description(issue["description"])
+    return message
+
+
+def format_alert(text: str) -> str:
+    """Format an alert into a Telegram Markdown message"""
+    return ALERT_TEMPLATE.format(text=text)
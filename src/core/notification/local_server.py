@@ -0,0 +1,103 @@
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class _RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            body = json.loads(raw or b"null")
+        else:
+            # Multipart uploads such as sendDocument are only measured
+            body = {"content_type": self.headers.get("Content-Type"), "size": len(raw)}
+        self.server.owner._record({"path": self.path, "body": body})
+
+        reply = json.dumps({"ok": True, "result": {}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalNotificationServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Local HTTP stand-in for Telegram and webhook endpoints
+        Accepts any POST, records it and answers like the Telegram Bot
+        API, so notification sinks can be exercised offline by pointing
+        WebhookSink at ``url`` or TelegramNotifier's api_base at it.
+        Args:
+            host: Interface to listen on
+            port: Port to listen on, 0 picks a free one
+        """
+        self._server = ThreadingHTTPServer((host, port), _RecordingHandler)
+        self._server.owner = self
+        self._cond = threading.Condition()
+        self._thread = None
+        self.received: List[Dict] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalNotificationServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-notify", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def wait_for(self, count: int, timeout: float = 5) -> bool:
+        """Wait until at least count requests were received"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while len(self.received) < count:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _record(self, request: Dict):
+        with self._cond:
+            self.received.append(request)
+            self._cond.notify_all()
+        logger.info(f"Received {request['path']}: {request['body']}")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local stand-in for notification endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    server = LocalNotificationServer(args.host, args.port)
+    logger.info(f"Listening on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,122 @@
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import requests
+
+from .bus import NotificationEvent, Sink
+from .delivery_queue import TelegramDeliveryQueue
+from .tele_notifyer import TelegramNotifier
+
+logger = logging.getLogger(__name__)
+
+
+def event_to_dict(event: NotificationEvent) -> Dict:
+    """JSON-serialisable form of an event"""
+    return {
+        "kind": event.kind,
+        "scan_id": event.scan_id,
+        "timestamp": event.timestamp,
+        "payload": event.payload,
+    }
+
+
+class TelegramSink(Sink):
+    def __init__(
+        self,
+        notifier: TelegramNotifier,
+        severities: Iterable[str] = ("high", "medium"),
+        delivery: Optional[TelegramDeliveryQueue] = None
+    ):
+        """
+        Send scan events to Telegram
+        Issues and alerts go through a rate-limited TelegramDeliveryQueue,
+        finished reports are uploaded over the notifier's pooled session.
+        Args:
+            notifier: Configured TelegramNotifier
+            severities: Issue severities worth an alert
+            delivery: Optional queue to send messages through
+        """
+        self.notifier = notifier
+        self.severities = {severity.lower() for severity in severities}
+        self.delivery = delivery or TelegramDeliveryQueue(
+            notifier.bot_token, notifier.chat_id,
+            session=notifier.session, api_base=notifier.api_base
+        )
+
+    def handle(self, event: NotificationEvent):
+        if event.kind == "issue":
+            if event.payload.get("severity", "").lower() in self.severities:
+                self.delivery.enqueue(self.notifier.format_issue_message(event.payload))
+        elif event.kind == "alert":
+            self.delivery.enqueue(self.notifier.notify_alert(event.payload.get("message", "")))
+        elif event.kind == "report" and event.payload.get("markdown"):
+            self.notifier.notify_vulnerabilities(event.payload.get("json"), event.payload["markdown"])
+
+    def flush(self):
+        # Handled issues and alerts are only queued for Telegram yet
+        self.delivery.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {"sent": self.delivery.sent, "undelivered": self.delivery.dropped}
+
+    def close(self):
+        self.delivery.close()
+
+
+class WebhookSink(Sink):
+    def __init__(
+        self,
+        url: str,
+        kinds: Optional[Iterable[str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10,
+        session: Optional[requests.Session] = None
+    ):
+        """
+        POST every event as JSON to a webhook
+        Args:
+            url: Endpoint receiving the events
+            kinds: Event kinds to forward, defaults to all
+            headers: Extra request headers, e.g. authentication
+            timeout: HTTP timeout in seconds
+            session: Optional requests.Session to send with
+        """
+        self.url = url
+        self.kinds = set(kinds) if kinds else None
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def handle(self, event: NotificationEvent):
+        response = self.session.post(self.url, json=event_to_dict(event), headers=self.headers, timeout=self.timeout)
+        response.raise_for_status()
+
+    def close(self):
+        self.session.close()
+
+
+class JsonlSink(Sink):
+    def __init__(self, path, kinds: Optional[Iterable[str]] = None):
+        """
+        Append every event as one JSON line to a file
+        Args:
+            path: JSONL file, created with its directory if missing
+            kinds: Event kinds to record, defaults to all
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.kinds = set(kinds) if kinds else None
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def handle(self, event: NotificationEvent):
+        with self._lock:
+            self._file.write(json.dumps(event_to_dict(event), default=str) + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
@@ -1,9 +1,11 @@
 import requests
 import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import os
 
+from .formatting import format_alert, format_issue_message
+
 # Configure logging
 # logging.basicConfig(
 #     level=logging.DEBUG,
@@ -16,11 +18,15 @@ import os
 logger = logging.getLogger(__name__)
 
 class TelegramNotifier:
-    def __init__(self, bot_token: str, chat_id: str):
+    API_BASE = "https://api.telegram.org"
+
+    def __init__(self, bot_token: str, chat_id: str, api_base: str = API_BASE):
         """Initialize Telegram notifier with bot token and chat ID"""
         self.bot_token = bot_token
         self.chat_id = chat_id
-        self.api_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        self.api_base = api_base.rstrip("/")
+        self.api_url = f"{self.api_base}/bot{bot_token}/sendMessage"
+        self.session = requests.Session()
         logger.debug(f"Initialized TelegramNotifier with API URL: {self.api_url}")
 
 
@@ -28,49 +34,7 @@ class TelegramNotifier:
     def format_issue_message(self, issue: Dict[str, Any]) -> str:
         """Format an issue into a Markdown message with length limits"""
         logger.debug(f"Formatting issue: {issue.get('name', 'N/A')}")
-        
-        def escape_markdown(text: str) -> str:
-            """Escape special characters for Markdown"""
-            special_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-            for char in special_chars:
-                text = text.replace(char, f"\\{char}")
-            return text
-
-        def truncate_text(text: str, max_length: int) -> str:
-            """Truncate text and add ellipsis if too long"""
-            if len(text) <= max_length:
-                return text
-            return text[:max_length-3] + "..."
-        
-        # Construct full URL from origin and path
-        origin = issue.get('origin', '')
-        path = issue.get('path', '')
-        full_url = f"{origin}{path}" if origin and path else "N/A"
-        
-        # Basic issue information (reserve 1000 chars for this)
-        message = "*💣💣 New Security Issue Found 💣💣*\n\n"
-        message += f"*Issue ID*: `{issue.get('id', 'N/A')}`\n"
-        message += f"*Name*: `{escape_markdown(issue.get('name', 'N/A'))}`\n"
-        message += f"*Severity*: `{issue.get('severity', 'N/A')}`\n"
-        message += f"*Confidence*: `{issue.get('confidence', 'N/A')}`\n"
-        message += f"*URL*: `{escape_markdown(full_url)}`\n"
-        
-        # Add description if available (allocate 60% of remaining space)
-        if "description" in issue:
-            desc = issue["description"]
-            # Remove HTML tags
-            desc = desc.replace("<b>", "").replace("</b>", "")
-            desc = desc.replace("<br>", "\n")
-            desc = desc.replace("<ul>", "\n").replace("</ul>", "")
-            desc = desc.replace("<li>", "• ").replace("</li>", "\n")
-            desc = truncate_text(desc, 500)
-            message += f"\n*Description*:\n{escape_markdown(desc)}\n"
-            
-
-        logger.debug(f"Final message length: {len(message)}")
-        return message
-
-        
+        return format_issue_message(issue)
 
     def send_message(self, message: str) -> bool:
         """Send a message to Telegram channel"""
@@ -86,7 +50,7 @@ class TelegramNotifier:
             }
             
             logger.debug("Making POST request to Telegram API")
-            response = requests.post(self.api_url, json=payload)
+            response = self.session.post(self.api_url, json=payload, timeout=15)
             logger.debug(f"Response status code: {response.status_code}")
             logger.debug(f"Response content: {response.text}")
             
@@ -106,24 +70,29 @@ class TelegramNotifier:
     def notify_alert(self, text: str) -> str:
         """Format an alert into a Markdown message"""
         logger.debug(f"Formatting alert: {text}")
-        
-        message = f"*🚨🚨New Alert🚨🚨*\n\n"
-        message += f"*Message*: `{text}`\n"
-        return message
+        return format_alert(text)
+
+    def notify_vulnerabilities(self, scan_report_path: str, scan_report_path_md: str):
+        """Upload a finished scan report over this notifier's session"""
+        notify_vulnerabilities(scan_report_path, scan_report_path_md, self.bot_token, self.chat_id, notifier=self)
 
 
-def notify_vulnerabilities(scan_report_path: str, scan_report_path_md: str, bot_token: str, chat_id: str):
+def notify_vulnerabilities(
+    scan_report_path: str,
+    scan_report_path_md: str,
+    bot_token: str,
+    chat_id: str,
+    notifier: Optional[TelegramNotifier] = None
+):
     """Read scan report and send notifications for high and medium severity issues"""
     logger.info(f"Starting vulnerability notification process for {scan_report_path}")
     
-    # Initialize notifier
-    notifier = TelegramNotifier(bot_token, chat_id)
+    # Reuse the caller's pooled session when there is one
+    notifier = notifier or TelegramNotifier(bot_token, chat_id)
     
     try:
-        # Read and parse the scan report
-        logger.debug(f"Reading scan report from {scan_report_path}")
-        with open(scan_report_path, 'r') as f:
-            report_data = json.load(f)
+        # Issues are alerted while the scan runs, so the JSON report no
+        # longer needs to be loaded here
         
         # # Get issues from the report
         # issues = report_data.get("vulnerabilities", {})
@@ -151,10 +120,11 @@ def notify_vulnerabilities(scan_report_path: str, scan_report_path_md: str, bot_
                     'chat_id': chat_id,
                     'caption': '📄 Full Scan Report'
                 }
-                response = requests.post(
-                    f"https://api.telegram.org/bot{bot_token}/sendDocument",
+                response = notifier.session.post(
+                    f"{notifier.api_base}/bot{bot_token}/sendDocument",
                     data=payload,
-                    files=files
+                    files=files,
+                    timeout=60
                 )
                 if response.status_code == 200:
                     logger.info("MD report file sent successfully")
@@ -1,7 +1,36 @@
 """
 Scanner and Crawler modules
 """
-from .scanner import Scanner
-from .crawler import Crawler
+from ..._lazy import attach
 
-__all__ = ['Scanner', 'Crawler']
\ No newline at end of file
+_EXPORTS = {
+    'Scanner': '.scanner',
+    'BurpClient': '.burp_client',
+    'BurpPool': '.burp_pool',
+    'Crawler': '.crawler',
+    'DomainProgramIndex': '.domain_index',
+    'IssueEventCursor': '.issue_cursor',
+    'AdaptivePollPolicy': '.poll_policy',
+    'ReportWriter': '.report',
+    'ScanScheduler': '.scheduler',
+    'TargetPlanner': '.planner',
+    'LivenessProber': '.liveness',
+    'ProbeResult': '.liveness'
+}
+
+__getattr__, __dir__ = attach(__name__, _EXPORTS)
+
+__all__ = [
+    'Scanner',
+    'BurpClient',
+    'BurpPool',
+    'Crawler',
+    'DomainProgramIndex',
+    'IssueEventCursor',
+    'AdaptivePollPolicy',
+    'ReportWriter',
+    'ScanScheduler',
+    'TargetPlanner',
+    'LivenessProber',
+    'ProbeResult'
+]
\ No newline at end of file
@@ -0,0 +1,128 @@
+import json
+import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+ScanResponse = Union[requests.Response, Exception]
+
+
+class BurpClient:
+    def __init__(
+        self,
+        base_url: str,
+        timeout: Tuple[float, float] = (5, 30),
+        retries: int = 3,
+        backoff: float = 0.5,
+        pool_size: int = 32,
+        session: Optional[requests.Session] = None
+    ):
+        """
+        Pooled, retrying client for the Burp Suite REST API
+        Args:
+            base_url: Burp REST API root, e.g. http://127.0.0.1:1337/v0.1
+            timeout: (connect, read) timeout in seconds for every call
+            retries: Retries on connection errors and 429/5xx responses;
+                status retries only apply to idempotent GETs, so a scan
+                is never created twice
+            backoff: Exponential backoff factor between retries
+            pool_size: Keep-alive connections kept open to Burp
+            session: Optional requests.Session to share connections with
+        """
+        self.base_url = base_url.rstrip("/") if base_url else base_url
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.headers = {"Content-Type": "application/json"}
+
+        self.session = session or requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Poll threads, created on the first multi-scan poll and reused by later ones"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="burp-poll")
+            return self._executor
+
+    def create_scan(self, data: Dict[str, Any]) -> requests.Response:
+        """POST a scan definition to /scan"""
+        return self.session.post(
+            f"{self.base_url}/scan",
+            headers=self.headers,
+            data=json.dumps(data),
+            timeout=self.timeout
+        )
+
+    def scan_id_from(self, response: requests.Response) -> Optional[str]:
+        """Scan ID from the Location header of a created scan"""
+        location = response.headers.get("Location")
+        return location.split("/")[-1] if location else None
+
+    def release(self, scan_id: str):
+        """Hook for finished scans, a single instance tracks no load"""
+
+    def get_scan(self, scan_id: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """GET /scan/{scan_id}"""
+        return self.session.get(
+            f"{self.base_url}/scan/{scan_id}",
+            headers=self.headers,
+            params=params,
+            timeout=self.timeout
+        )
+
+    def get_scans(self, scan_ids: Iterable[str], params: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, ScanResponse]:
+        """
+        Fetch many scans concurrently from synchronous code
+        Runs on the client's long-lived executor, so a poll round starts
+        neither an event loop nor new threads and works from inside one.
+        Args:
+            scan_ids: Scan IDs to fetch
+            params: Optional per-scan query parameters keyed by scan ID
+        Returns:
+            Dict mapping each scan ID to its response or the raised exception
+        """
+        return fetch_scans(self.executor, self.get_scan, scan_ids, params)
+
+    def close(self):
+        """Stop the poll threads and close pooled connections"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.session.close()
+
+
+def fetch_scans(
+    executor: Executor,
+    get_scan: Callable[[str, Optional[Dict[str, Any]]], requests.Response],
+    scan_ids: Iterable[str],
+    params: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, ScanResponse]:
+    """Call get_scan for every scan ID on executor, keeping errors per scan"""
+    params = params or {}
+    futures = {scan_id: executor.submit(get_scan, scan_id, params.get(scan_id)) for scan_id in scan_ids}
+    responses = {}
+    for scan_id, future in futures.items():
+        try:
+            responses[scan_id] = future.result()
+        except Exception as e:
+            responses[scan_id] = e
+    return responses
+
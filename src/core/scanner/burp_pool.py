@@ -0,0 +1,211 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from .burp_client import BurpClient, ScanResponse, fetch_scans
+
+logger = logging.getLogger(__name__)
+
+
+class BurpEndpoint:
+    def __init__(self, index: int, client: BurpClient):
+        """Health and load of one Burp instance in a pool"""
+        self.index = index
+        self.client = client
+        self.tasks = set()
+        self.failures = 0
+        self.down_until = 0.0
+        self.last_error: Optional[str] = None
+
+    @property
+    def url(self) -> str:
+        return self.client.base_url
+
+
+class BurpPool:
+    def __init__(
+        self,
+        base_urls: Iterable[str],
+        max_tasks: Optional[int] = None,
+        failure_threshold: int = 3,
+        cooldown: float = 60,
+        client_factory: Callable[[str], BurpClient] = BurpClient,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Spread scans over several Burp instances
+        Drop-in replacement for BurpClient. New scans go to the healthy
+        instance with the fewest live tasks; an instance that keeps failing
+        is taken out of rotation for a cooldown and creation fails over to
+        the next one. Scan IDs are always prefixed with the instance index,
+        e.g. "1-42", so polls are routed back to the instance running the
+        scan; attached scans have to be given in that form too.
+        Args:
+            base_urls: Burp REST API roots, their order defines the index
+            max_tasks: Live scans allowed per instance, unlimited if None
+            failure_threshold: Consecutive errors before an instance is
+                considered down
+            cooldown: Seconds a down instance is skipped before it is
+                health checked again
+            client_factory: Builds the client of each instance
+            clock: Monotonic time source, replaceable in tests
+        """
+        self.endpoints = [BurpEndpoint(i, client_factory(url)) for i, url in enumerate(base_urls)]
+        if not self.endpoints:
+            raise ValueError("BurpPool needs at least one Burp API URL")
+        self.max_tasks = max_tasks
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.headers = self.endpoints[0].client.headers
+        self.pool_size = sum(endpoint.client.pool_size for endpoint in self.endpoints)
+        # One set of poll threads for the whole pool, the clients never start theirs
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return ",".join(endpoint.url for endpoint in self.endpoints)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Poll threads of every instance, created on the first multi-scan poll"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="burp-poll")
+            return self._executor
+
+    def create_scan(self, data: Dict[str, Any]) -> requests.Response:
+        """POST a scan to the least-loaded healthy instance, failing over on errors"""
+        last_error = None
+        for endpoint in self._candidates():
+            try:
+                response = endpoint.client.create_scan(data)
+            except requests.exceptions.RequestException as e:
+                self._record_failure(endpoint, e)
+                last_error = e
+                continue
+            if response.status_code >= 500:
+                self._record_failure(endpoint, f"HTTP {response.status_code}")
+                last_error = response
+                continue
+            self._record_success(endpoint)
+            response.burp_endpoint = endpoint.index
+            return response
+
+        if isinstance(last_error, requests.Response):
+            return last_error
+        raise requests.exceptions.ConnectionError(f"No healthy Burp instance available: {last_error}")
+
+    def scan_id_from(self, response: requests.Response) -> Optional[str]:
+        """Pool-wide scan ID of a created scan, counted against its instance"""
+        location = response.headers.get("Location")
+        if not location:
+            return None
+        index = getattr(response, "burp_endpoint", 0)
+        task_id = location.split("/")[-1]
+        scan_id = f"{index}-{task_id}"
+        with self._lock:
+            self.endpoints[index].tasks.add(scan_id)
+        return scan_id
+
+    def release(self, scan_id: str):
+        """Stop counting a finished scan against its instance"""
+        try:
+            endpoint, _ = self._route(scan_id)
+        except ValueError:
+            return
+        with self._lock:
+            endpoint.tasks.discard(str(scan_id))
+
+    def get_scan(self, scan_id: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """GET /scan/{id} from the instance running the scan"""
+        endpoint, task_id = self._route(scan_id)
+        try:
+            response = endpoint.client.get_scan(task_id, params)
+        except requests.exceptions.RequestException as e:
+            self._record_failure(endpoint, e)
+            raise
+        if response.status_code >= 500:
+            self._record_failure(endpoint, f"HTTP {response.status_code}")
+        else:
+            self._record_success(endpoint)
+        return response
+
+    def get_scans(self, scan_ids: Iterable[str], params: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, ScanResponse]:
+        """Fetch many scans concurrently across all instances on one long-lived executor"""
+        return fetch_scans(self.executor, self.get_scan, scan_ids, params)
+
+    def check_health(self, endpoint: BurpEndpoint) -> bool:
+        """Probe an instance's API root, any HTTP answer counts as alive"""
+        try:
+            endpoint.client.session.get(endpoint.url, timeout=endpoint.client.timeout)
+        except requests.exceptions.RequestException as e:
+            self._record_failure(endpoint, e, force=True)
+            return False
+        self._record_success(endpoint)
+        return True
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Live tasks and health of every instance"""
+        now = self.clock()
+        return [
+            {
+                "url": endpoint.url,
+                "tasks": len(endpoint.tasks),
+                "healthy": endpoint.down_until <= now,
+                "failures": endpoint.failures,
+                "last_error": endpoint.last_error,
+            }
+            for endpoint in self.endpoints
+        ]
+
+    def close(self):
+        """Stop the poll threads and close the pooled connections of every instance"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        for endpoint in self.endpoints:
+            endpoint.client.close()
+
+    def _candidates(self) -> List[BurpEndpoint]:
+        """Instances that can take a new scan, least loaded first"""
+        now = self.clock()
+        candidates = []
+        for endpoint in self.endpoints:
+            if endpoint.down_until > now:
+                continue
+            if endpoint.down_until and not self.check_health(endpoint):
+                # Cooldown over but still unreachable
+                continue
+            if self.max_tasks is not None and len(endpoint.tasks) >= self.max_tasks:
+                continue
+            candidates.append(endpoint)
+        return sorted(candidates, key=lambda endpoint: (len(endpoint.tasks), endpoint.index))
+
+    def _route(self, scan_id: str) -> Tuple[BurpEndpoint, str]:
+        """Instance and Burp task ID of a pool-wide scan ID"""
+        index, sep, task_id = str(scan_id).partition("-")
+        if not (sep and task_id and index.isdigit() and int(index) < len(self.endpoints)):
+            raise ValueError(f"Scan ID {scan_id} does not name one of the {len(self.endpoints)} Burp instances, expected <index>-<task>")
+        return self.endpoints[int(index)], task_id
+
+    def _record_success(self, endpoint: BurpEndpoint):
+        with self._lock:
+            if endpoint.down_until:
+                logger.info(f"Burp instance {endpoint.url} is back")
+            endpoint.failures = 0
+            endpoint.down_until = 0.0
+
+    def _record_failure(self, endpoint: BurpEndpoint, error, force: bool = False):
+        with self._lock:
+            endpoint.failures += 1
+            endpoint.last_error = str(error)
+            if force or endpoint.failures >= self.failure_threshold:
+                endpoint.down_until = self.clock() + self.cooldown
+                logger.warning(f"Burp instance {endpoint.url} marked down for {self.cooldown}s: {error}")
@@ -2,6 +2,7 @@ import json
 import hashlib
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import shutil
 from tqdm import tqdm
 import zipfile
@@ -11,16 +12,43 @@ import logging
 import time 
 import argparse
 from pathlib import Path
+from .domain_index import DomainProgramIndex
+from ..chaos.dedup import ExternalSortedSet
+from ..chaos.downloader import ProgramDownloader
+from ..storage import DomainStore
 
 class Crawler:
-    def __init__(self, base_dir=None):
-        """Initialize crawler with base directory for file operations"""
+    def __init__(self, base_dir=None, workers=8, memory_budget_mb=64, store=None, session=None):
+        """
+        Initialize crawler with base directory for file operations
+        Args:
+            base_dir: Base directory holding the database directory
+            workers: Number of program archives downloaded concurrently
+            memory_budget_mb: Memory used for domain dedup before spilling
+            store: DomainStore to record domains in
+            session: Optional requests.Session, e.g. from a SessionManager,
+                used for every download
+        """
         self.base_dir = Path(base_dir) if base_dir else Path(__file__).parent.parent.parent
         self.database_dir = self.base_dir / "database"
         self.database_dir.mkdir(exist_ok=True)  # Create database dir if not exists
         self.CHAOS_INDEX = "https://chaos-data.projectdiscovery.io/index.json"
         self.CHAOS_BASE_URL = "https://chaos-data.projectdiscovery.io"
         self.BUGBOUNTY_URL = "https://github.com/projectdiscovery/public-bugbounty-programs/raw/main/chaos-bugbounty-list.json"
+
+        # Domain -> program index shared by get_tag_domain and map_domains
+        self.domain_index = None
+        self._domain_index_path = None
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        # The bug bounty list and the program archives share one pool
+        self.session = session
+        self.downloader = ProgramDownloader(workers=workers, session=self.session)
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.store = store or DomainStore.open_in(self.database_dir)
         
         # Setup logging
         logging.basicConfig(
@@ -40,36 +68,21 @@ class Crawler:
     def crawl_chaos_targets(self, output_file="chaos_domains.txt"):
         """Crawl and save chaos targets to file"""
         try:
-            res = requests.get(self.CHAOS_INDEX)
-            programs = res.json()
+            programs = self.downloader.fetch_index(self.CHAOS_INDEX)
         except Exception as e:
             self.logger.error(f"Failed to fetch chaos index: {e}")
             return False
 
-        all_domains = set()
-        
-        for program in tqdm(programs, desc="Downloading programs"):
-            name = program.get("name")
-            url = program.get("URL")
-            slug = url.split("/")[-1].replace(".zip", "")
-
-            try:
-                zip_res = requests.get(url)
-                z = zipfile.ZipFile(io.BytesIO(zip_res.content))
-                for file_name in z.namelist():
-                    if file_name.endswith(".txt"):
-                        with z.open(file_name) as f:
-                            domains = [line.decode("utf-8").strip() for line in f.readlines()]
-                            all_domains.update(domains)
-            except Exception as e:
-                self.logger.error(f"Failed to download {slug}: {e}")
-
-        output_path = self.base_dir / output_file
-        with open(output_path, "w") as f:
-            for domain in sorted(all_domains):
-                f.write(domain + "\n")
-
-        self.logger.info(f"Crawl complete. {len(all_domains)} domains saved to {output_file}")
+        with ExternalSortedSet(self.memory_budget, tmp_dir=self.database_dir) as all_domains:
+            for result in self.downloader.download(programs):
+                try:
+                    all_domains.update(result.domains)
+                except Exception as e:
+                    self.logger.error(f"Failed to extract {result.slug}: {e}")
+
+            count = all_domains.write(self.base_dir / output_file)
+
+        self.logger.info(f"Crawl complete. {count} domains saved to {output_file}")
         return True
 
     def download_and_verify(self, local_filename):
@@ -82,7 +95,7 @@ class Crawler:
             local_path.write_text("{}")
 
         try:
-            response = requests.get(self.BUGBOUNTY_URL)
+            response = self.session.get(self.BUGBOUNTY_URL, timeout=60)
             temp_file.write_bytes(response.content)
         except Exception as e:
             self.logger.error(f"Download failed: {e}")
@@ -131,31 +144,45 @@ class Crawler:
         with open(output_path, 'w', encoding='utf-8') as outfile:
             json.dump(results, outfile, indent=2, ensure_ascii=False)
 
+        self.domain_index = DomainProgramIndex.from_entries(results)
+        self._domain_index_path = output_path
+        self.store.replace_tags(results)
+
         self.logger.info(f"Wrote {len(results)} unique domains to tagged_domains.json")
         return True
 
+    def load_domain_index(self, tagged_file):
+        """
+        Return the domain index for a tagged file, building it only once
+        Args:
+            tagged_file: Name of the tagged domains file in the database dir
+        Returns:
+            DomainProgramIndex: Index of tagged domains to programs
+        """
+        tagged_path = self.database_dir / tagged_file
+        if self.domain_index is None or self._domain_index_path != tagged_path:
+            self.domain_index = DomainProgramIndex.from_file(tagged_path)
+            self._domain_index_path = tagged_path
+            self.logger.info(f"Indexed {len(self.domain_index)} tagged domains from {tagged_file}")
+        return self.domain_index
+
     def map_domains(self, tagged_file, chaos_file, output_file):
         """Map chaos domains to their programs"""
         try:
-            # Load tagged domains
-            with open(self.database_dir / tagged_file, 'r') as f:
-                tagged = json.load(f)
-
-            # Load chaos domains
-            with open(self.database_dir / chaos_file, 'r') as f:
-                chaos_lines = [line.strip() for line in f if line.strip()]
+            index = self.load_domain_index(tagged_file)
 
-            # Map domains to programs
+            # Map domains to programs by walking each hostname's labels
             result = []
-            for domain in chaos_lines:
-                program = next(
-                    (tag["program"] for tag in tagged if tag["domain"] in domain),
-                    None
-                )
-                result.append({
-                    "domain": domain,
-                    "program": program
-                })
+            with open(self.database_dir / chaos_file, 'r') as f:
+                for line in f:
+                    domain = line.strip()
+                    if domain:
+                        result.append({
+                            "domain": domain,
+                            "program": index.lookup(domain)
+                        })
+
+            self.store.assign_programs((entry["domain"], entry["program"]) for entry in result)
 
             # Write results
             with open(self.database_dir / output_file, 'w') as f:
@@ -0,0 +1,106 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+
+class DomainProgramIndex:
+    """
+    Reversed-label trie mapping hostnames to their bug bounty program.
+
+    Tagged domains are stored label by label from the TLD inwards, so a
+    lookup walks the labels of a hostname once and returns the program of
+    the longest tagged suffix. ``example.com`` matches ``example.com`` and
+    ``api.example.com`` but never ``notexample.com``.
+    """
+
+    # Marks a terminal node; not a str, so no label can collide with it
+    _PROGRAM = object()
+
+    def __init__(self):
+        self._root: Dict[Any, Any] = {}
+        self._size = 0
+
+    @staticmethod
+    def normalize(domain: str) -> str:
+        """Lowercase a domain and strip wildcards, dots and whitespace"""
+        domain = domain.strip().lower()
+        if domain.startswith("*."):
+            domain = domain[2:]
+        return domain.strip(".")
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[dict]) -> "DomainProgramIndex":
+        """
+        Build an index from ``{"domain": ..., "program": ...}`` entries
+        Args:
+            entries: Iterable of tagged domain dicts
+        Returns:
+            DomainProgramIndex: Populated index
+        """
+        index = cls()
+        for entry in entries:
+            index.add(entry["domain"], entry["program"])
+        return index
+
+    @classmethod
+    def from_file(cls, path) -> "DomainProgramIndex":
+        """
+        Build an index from a tagged_domains.json file
+        Args:
+            path: Path of the tagged domains JSON file
+        Returns:
+            DomainProgramIndex: Populated index
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_entries(json.load(f))
+
+    def add(self, domain: str, program: str) -> bool:
+        """
+        Register a domain suffix for a program
+        Args:
+            domain: Tagged domain, optionally prefixed with ``*.``
+            program: Program name the domain belongs to
+        Returns:
+            bool: False if the domain was empty or already registered
+        """
+        domain = self.normalize(domain)
+        if not domain:
+            return False
+
+        node = self._root
+        for label in reversed(domain.split(".")):
+            node = node.setdefault(label, {})
+
+        # First registration wins, matching the dedup order of get_tag_domain
+        if self._PROGRAM in node:
+            return False
+        node[self._PROGRAM] = program
+        self._size += 1
+        return True
+
+    def lookup(self, hostname: str) -> Optional[str]:
+        """
+        Resolve a hostname to the program of its longest tagged suffix
+        Args:
+            hostname: Hostname to resolve
+        Returns:
+            str: Program name, or None if no tagged suffix matches
+        """
+        node = self._root
+        program = None
+        for label in reversed(self.normalize(hostname).split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            program = node.get(self._PROGRAM, program)
+        return program
+
+    def map(self, hostnames: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """Yield ``(hostname, program)`` pairs for each hostname"""
+        for hostname in hostnames:
+            yield hostname, self.lookup(hostname)
+
+    def __contains__(self, hostname: str) -> bool:
+        return self.lookup(hostname) is not None
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,78 @@
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+
+class IssueEventCursor:
+    def __init__(self, page_size: Optional[int] = None):
+        """
+        Per-scan position in Burp's issue event stream
+        Polls send the ID of the last event seen as the ``after`` query
+        parameter, so Burp only returns events we have not processed yet.
+        A set of issue fingerprints guards against duplicates when the
+        API ignores the cursor or replays events; a cursor restored by a
+        new process also drops replays up to its restored ``after``.
+        Args:
+            page_size: Maximum issue events requested per poll
+        """
+        self.page_size = page_size
+        self.after: Optional[str] = None
+        self.count = 0
+        self._seen = set()
+        self._replayed_through: Optional[str] = None
+
+    def params(self) -> Dict[str, str]:
+        """Query parameters for the next /scan/{id} request"""
+        params = {}
+        if self.after is not None:
+            params["after"] = self.after
+        if self.page_size:
+            params["issue_events"] = self.page_size
+        return params
+
+    def restore(self, after: Optional[str], count: int):
+        """
+        Continue from a position saved by an earlier process
+        The fingerprints of the events handled before are gone, so events
+        up to ``after`` are skipped whenever the API replays them.
+        Args:
+            after: ID of the last event handled
+            count: Number of events handled
+        """
+        self.after = after
+        self.count = count
+        self._replayed_through = after
+
+    def consume(self, events: Iterable[dict]) -> List[dict]:
+        """
+        Advance the cursor over a batch of issue events
+        Args:
+            events: ``issue_events`` list from a /scan response
+        Returns:
+            List[dict]: Events not seen before, in order
+        """
+        events = list(events)
+        if self._replayed_through is not None:
+            ids = [str(event.get("id")) for event in events]
+            if self._replayed_through in ids:
+                # The API ignored after and replayed events handled before the restart
+                events = events[ids.index(self._replayed_through) + 1:]
+        new_events = []
+        for event in events:
+            if event.get("id") is not None:
+                self.after = str(event["id"])
+            key = self.fingerprint(event.get("issue", {}))
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            new_events.append(event)
+        self.count += len(new_events)
+        return new_events
+
+    @staticmethod
+    def fingerprint(issue: dict) -> bytes:
+        """Compact digest identifying an issue within one scan"""
+        if issue.get("serial_number") is not None:
+            raw = f"serial:{issue['serial_number']}"
+        else:
+            raw = "|".join(str(issue.get(field, "")) for field in ("type_index", "name", "origin", "path"))
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).digest()
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import re
+import socket
+import ssl
+import time
+from html import unescape
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+logger = logging.getLogger(__name__)
+
+TITLE_RE = re.compile(rb"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+class ProbeResult(NamedTuple):
+    host: str
+    alive: bool
+    url: Optional[str] = None
+    final_url: Optional[str] = None
+    status: Optional[int] = None
+    title: Optional[str] = None
+    redirects: Tuple[str, ...] = ()
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+class LivenessProber:
+    USER_AGENT = "Mozilla/5.0 (compatible; Sharingan liveness probe)"
+
+    def __init__(
+        self,
+        concurrency: int = 200,
+        timeout: float = 5,
+        schemes: Iterable[str] = ("https", "http"),
+        max_redirects: int = 3,
+        max_body: int = 16 * 1024
+    ):
+        """
+        Concurrent HTTP liveness probe built on asyncio streams
+        Each host is resolved and requested with a bare HTTP/1.1 GET,
+        trying the schemes in order; any HTTP answer counts as alive.
+        Redirects are followed to record the final URL and page title,
+        the URL that answered first is what gets scanned.
+        Args:
+            concurrency: Hosts probed at once
+            timeout: Seconds allowed per connection attempt and response
+            schemes: Schemes to try, the first one answering wins
+            max_redirects: Redirects followed per host
+            max_body: Bytes of body read when looking for a title
+        """
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.schemes = tuple(schemes)
+        self.max_redirects = max_redirects
+        self.max_body = max_body
+
+        # Liveness only, certificates of targets are not validated
+        self._ssl = ssl.create_default_context()
+        self._ssl.check_hostname = False
+        self._ssl.verify_mode = ssl.CERT_NONE
+
+    def probe(self, targets: Iterable[str]) -> List[ProbeResult]:
+        """Probe hosts or URLs from synchronous code"""
+        return asyncio.run(self.probe_async(targets))
+
+    async def probe_async(self, targets: Iterable[str]) -> List[ProbeResult]:
+        """
+        Probe hosts or URLs with bounded concurrency
+        Args:
+            targets: Bare hosts or URLs; a URL's scheme is tried first
+        Returns:
+            List[ProbeResult]: One result per distinct host, input order
+        """
+        slots = asyncio.Semaphore(self.concurrency)
+        unique = {}
+        for target in targets:
+            host, scheme, port, path = self._split(target)
+            if host and host not in unique:
+                unique[host] = (scheme, port, path)
+
+        async def bounded(host, scheme, port, path):
+            async with slots:
+                return await self._probe_host(host, scheme, port, path)
+
+        return list(await asyncio.gather(*(bounded(host, *rest) for host, rest in unique.items())))
+
+    async def _probe_host(self, host: str, scheme: Optional[str], port: Optional[int], path: str) -> ProbeResult:
+        """Try each scheme until one answers"""
+        started = time.monotonic()
+        schemes = (scheme,) + tuple(s for s in self.schemes if s != scheme) if scheme else self.schemes
+        error = None
+        for candidate in schemes:
+            netloc = f"{host}:{port}" if port and candidate == scheme else host
+            url = f"{candidate}://{netloc}{'' if path == '/' else path}"
+            try:
+                status, final_url, title, redirects = await self._follow(url)
+            except (OSError, asyncio.TimeoutError, ValueError) as e:
+                error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+                if isinstance(e, socket.gaierror):
+                    # Does not resolve, other schemes will not help
+                    break
+                continue
+            return ProbeResult(
+                host, True, url, final_url, status, title, tuple(redirects),
+                elapsed=round(time.monotonic() - started, 3)
+            )
+        return ProbeResult(host, False, error=error, elapsed=round(time.monotonic() - started, 3))
+
+    async def _follow(self, url: str):
+        """Request a URL, following redirects"""
+        redirects = []
+        for _ in range(self.max_redirects + 1):
+            status, headers, body = await asyncio.wait_for(self._request(url), self.timeout)
+            location = headers.get("location")
+            if 300 <= status < 400 and location:
+                redirects.append(url)
+                url = urljoin(url, location)
+                continue
+            break
+        return status, url, self._title(body), redirects
+
+    async def _request(self, url: str):
+        """Single GET over a fresh connection, returns status, headers and body prefix"""
+        parts = urlparse(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL {url}")
+        secure = parts.scheme == "https"
+        port = parts.port or (443 if secure else 80)
+        reader, writer = await asyncio.open_connection(
+            parts.hostname, port,
+            ssl=self._ssl if secure else None,
+            server_hostname=parts.hostname if secure else None
+        )
+        try:
+            target = parts.path or "/"
+            if parts.query:
+                target += f"?{parts.query}"
+            writer.write((
+                f"GET {target} HTTP/1.1\r\n"
+                f"Host: {parts.netloc}\r\n"
+                f"User-Agent: {self.USER_AGENT}\r\n"
+                "Accept: text/html,*/*\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("ascii", "ignore"))
+            await writer.drain()
+
+            status_line = await reader.readline()
+            fields = status_line.split(None, 2)
+            if len(fields) < 2 or not fields[0].startswith(b"HTTP/"):
+                raise ValueError("Not an HTTP response")
+            status = int(fields[1])
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            body = b""
+            if "text/html" in headers.get("content-type", "text/html"):
+                try:
+                    while len(body) < self.max_body and b"</title>" not in body.lower():
+                        chunk = await reader.read(self.max_body - len(body))
+                        if not chunk:
+                            break
+                        body += chunk
+                except OSError:
+                    pass
+            return status, headers, body
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _title(body: bytes) -> Optional[str]:
+        match = TITLE_RE.search(body)
+        if not match:
+            return None
+        title = " ".join(unescape(match.group(1).decode("utf-8", "replace")).split())
+        return title[:200] or None
+
+    @staticmethod
+    def _split(target: str):
+        """Host, scheme, port and path of a host or URL"""
+        target = target.strip()
+        if not target:
+            return None, None, None, "/"
+        if "://" not in target:
+            return target.lower().rstrip("."), None, None, "/"
+        parts = urlparse(target)
+        return (parts.hostname or "").lower(), parts.scheme, parts.port, parts.path or "/"
+
+    @classmethod
+    def host_of(cls, target: str) -> Optional[str]:
+        """Host a probe of the target is recorded under"""
+        return cls._split(target)[0]
+
+    @classmethod
+    def live_targets(cls, targets: Iterable[str], probes: Dict[str, Dict]) -> List[str]:
+        """
+        Targets whose host answered, in input order
+        Liveness is per host, but every URL given for a live host is kept
+        as given. A bare host becomes the origin on the scheme that
+        answered, never the URL or path a probe recorded for another input.
+        Args:
+            targets: Hosts or URLs
+            probes: Stored or fresh probe results keyed by host
+        """
+        live = []
+        for target in targets:
+            host = cls.host_of(target)
+            probe = probes.get(host) if host else None
+            if not probe or not probe["alive"]:
+                continue
+            target = target.strip()
+            if "://" not in target:
+                target = f"{urlparse(probe['url']).scheme}://{host}"
+            live.append(target)
+        return list(dict.fromkeys(live))
+
+    @staticmethod
+    def live_urls(results: Iterable[ProbeResult]) -> Dict[str, str]:
+        """Map of live hosts to the URL that answered first"""
+        return {result.host: result.url for result in results if result.alive}
@@ -0,0 +1,144 @@
+import logging
+import math
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class ScoredTarget(NamedTuple):
+    url: str
+    host: str
+    program: Optional[str]
+    score: float
+
+
+class TargetPlanner:
+    SEVERITY_WEIGHTS = {"high": 3.0, "medium": 2.0, "low": 1.0, "info": 0.1}
+
+    def __init__(
+        self,
+        store=None,
+        fingerprints=None,
+        liveness: Optional[Dict[str, bool]] = None,
+        max_batch_size: int = 10,
+        program_weight: float = 2.0,
+        freshness_weight: float = 3.0,
+        freshness_half_life: float = 7.0,
+        findings_weight: float = 1.0,
+        alive_weight: float = 1.0
+    ):
+        """
+        Rank scan targets and pack them into multi-URL Burp scans
+        Args:
+            store: Optional DomainStore providing programs and first_seen
+            fingerprints: Optional IssueFingerprintStore with past findings
+            liveness: Optional host -> alive map; dead hosts are dropped
+            max_batch_size: Most URLs put into a single Burp scan
+            program_weight: Bonus for hosts attributed to a program
+            freshness_weight: Bonus for a host first seen right now, halving
+                every freshness_half_life days
+            freshness_half_life: Days after which the freshness bonus halves
+            findings_weight: Weight of log-scaled, severity weighted findings
+                from earlier scans of the host
+            alive_weight: Bonus for hosts known to be alive
+        """
+        self.store = store
+        self.fingerprints = fingerprints
+        self.liveness = liveness or {}
+        self.max_batch_size = max(1, max_batch_size)
+        self.program_weight = program_weight
+        self.freshness_weight = freshness_weight
+        self.freshness_half_life = freshness_half_life
+        self.findings_weight = findings_weight
+        self.alive_weight = alive_weight
+
+    @staticmethod
+    def normalize(target: str) -> str:
+        """Turn a bare domain into a URL Burp can scan"""
+        target = target.strip()
+        return target if "://" in target else f"https://{target}"
+
+    def score(self, targets: Iterable[str], now: Optional[datetime] = None) -> List[ScoredTarget]:
+        """
+        Score targets, best first
+        Args:
+            targets: URLs or bare domains
+            now: Reference time for freshness, defaults to now
+        Returns:
+            List[ScoredTarget]: Live and unknown targets sorted by score
+        """
+        now = now or datetime.now(timezone.utc)
+        urls = list(OrderedDict.fromkeys(self.normalize(t) for t in targets if t and t.strip()))
+        parsed = [(url, urlparse(url)) for url in urls]
+
+        records = self.store.get_many({p.hostname for _, p in parsed if p.hostname}) if self.store else {}
+        findings = self.fingerprints.severity_counts({p.netloc.lower() for _, p in parsed}) if self.fingerprints else {}
+
+        scored = []
+        for url, parts in parsed:
+            host = (parts.hostname or "").lower()
+            alive = self.liveness.get(host)
+            if alive is False:
+                continue
+            record = records.get(host) or {}
+            program = record.get("program")
+
+            score = 0.0
+            if program:
+                score += self.program_weight
+            if record.get("first_seen"):
+                age_days = (now - self._parse_time(record["first_seen"])).total_seconds() / 86400
+                score += self.freshness_weight * 0.5 ** (max(0.0, age_days) / self.freshness_half_life)
+            severity_counts = findings.get(parts.netloc.lower(), {})
+            weighted = sum(self.SEVERITY_WEIGHTS.get(s, 0.1) * n for s, n in severity_counts.items())
+            score += self.findings_weight * math.log1p(weighted)
+            if alive:
+                score += self.alive_weight
+            scored.append(ScoredTarget(url, host, program, round(score, 4)))
+
+        # Stable sort keeps the input order among equal scores
+        scored.sort(key=lambda target: -target.score)
+        return scored
+
+    def batch_size_for(self, count: int, slots: Optional[int] = None) -> int:
+        """URLs per scan so that the targets fill the available Burp slots"""
+        if not slots:
+            return self.max_batch_size
+        return max(1, min(self.max_batch_size, math.ceil(count / slots)))
+
+    def plan(self, targets: Iterable[str], limit: Optional[int] = None, slots: Optional[int] = None) -> List[List[str]]:
+        """
+        Pick the best targets and group them into Burp scans
+        Hosts of the same program share scans, and scans are ordered by
+        their best target so likely findings surface first.
+        Args:
+            targets: URLs or bare domains
+            limit: Maximum number of targets to keep
+            slots: Burp scans that can run at once, used to size batches
+        Returns:
+            List[List[str]]: URL batches, one Burp scan each
+        """
+        scored = self.score(targets)
+        if limit is not None:
+            scored = scored[:limit]
+        size = self.batch_size_for(len(scored), slots)
+
+        groups: Dict[Optional[str], List[ScoredTarget]] = OrderedDict()
+        for target in scored:
+            groups.setdefault(target.program, []).append(target)
+
+        batches = []
+        for members in groups.values():
+            for start in range(0, len(members), size):
+                batches.append(members[start:start + size])
+        batches.sort(key=lambda batch: -batch[0].score)
+
+        logger.info(f"Planned {len(scored)} targets into {len(batches)} scans of up to {size} URLs")
+        return [[target.url for target in batch] for batch in batches]
+
+    @staticmethod
+    def _parse_time(value: str) -> datetime:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
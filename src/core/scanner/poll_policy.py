@@ -0,0 +1,84 @@
+import random
+from typing import Dict, Optional
+
+
+class AdaptivePollPolicy:
+    def __init__(
+        self,
+        base_interval: float = 30,
+        min_interval: float = 5,
+        max_interval: float = 300,
+        warmup: float = 60,
+        near_done_progress: int = 90,
+        jitter: float = 0.2,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Choose the delay before the next poll of a Burp scan from its metrics
+        Args:
+            base_interval: Delay when nothing better is known, e.g. paused scans
+            min_interval: Fastest poll rate, used at start-up and near completion
+            max_interval: Slowest poll rate for long-running scans
+            warmup: Seconds of scan time polled at min_interval, so short
+                scans and early findings are picked up quickly
+            near_done_progress: crawl_and_audit_progress from which the
+                fast path kicks in
+            jitter: Relative random spread applied to every delay
+            rng: Random source, seedable for tests
+        """
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.warmup = warmup
+        self.near_done_progress = near_done_progress
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+
+    def next_delay(
+        self,
+        status: Optional[str],
+        metrics: Optional[Dict] = None,
+        new_issues: int = 0,
+        failures: int = 0
+    ) -> float:
+        """
+        Compute the delay before polling a scan again
+        Args:
+            status: Last scan_status returned by Burp, None on errors
+            metrics: Last scan_metrics returned by Burp
+            new_issues: Issues found by the last poll
+            failures: Consecutive failed polls of this scan
+        Returns:
+            float: Seconds to wait
+        """
+        metrics = metrics or {}
+        elapsed = metrics.get("total_elapsed_time") or 0
+        progress = metrics.get("crawl_and_audit_progress") or 0
+
+        if status is None:
+            # API errors back off exponentially instead of hammering Burp
+            delay = self.base_interval * (2 ** min(failures, 4))
+        elif status == "paused":
+            delay = self.base_interval
+        elif elapsed < self.warmup or new_issues or self._near_done(progress, metrics):
+            delay = self.min_interval
+        else:
+            # Poll roughly ten times over the scan's life so far ...
+            delay = elapsed / 10
+            # ... but never sleep past the projected completion
+            if progress > 0:
+                remaining = elapsed * (100 - progress) / progress
+                delay = min(delay, remaining / 2)
+
+        delay = min(max(delay, self.min_interval), self.max_interval)
+        return delay * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _near_done(self, progress, metrics) -> bool:
+        """Whether the scan looks about to finish"""
+        if progress >= self.near_done_progress:
+            return True
+        crawl_queue = metrics.get("crawl_requests_queued")
+        audit_queue = metrics.get("audit_queue_items_waiting")
+        if progress <= 0 or crawl_queue is None or audit_queue is None:
+            return False
+        return crawl_queue + audit_queue == 0
@@ -0,0 +1,158 @@
+import json
+import logging
+import tempfile
+import textwrap
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ReportWriter:
+    SEVERITIES = ("high", "medium", "low", "info")
+
+    METRIC_LABELS = (
+        ("Requests Made", "crawl_requests_made"),
+        ("Network Errors", "crawl_network_errors"),
+        ("Unique Locations", "crawl_unique_locations_visited"),
+        ("Issues Found", "issue_events"),
+    )
+
+    def __init__(
+        self,
+        scan_id,
+        output_dir="reports",
+        timestamp: Optional[str] = None,
+        fingerprints=None,
+        only_new: bool = False
+    ):
+        """
+        Stream Burp issue events into Markdown and JSON scan reports
+        Events are spooled per severity to temporary files as they arrive
+        and only read back while the reports are written, so memory use
+        does not grow with the number of issues.
+        Args:
+            scan_id: Burp scan ID the report is for
+            output_dir: Directory the reports are written to
+            timestamp: Report timestamp, defaults to now
+            fingerprints: Optional IssueFingerprintStore used to flag
+                issues first seen in this scan
+            only_new: Drop issues already reported by earlier scans
+        """
+        self.scan_id = str(scan_id)
+        self.output_dir = Path(output_dir)
+        self.timestamp = timestamp or datetime.now().strftime("%Y_%m_%d-%H_%M_%S")
+        self.fingerprints = fingerprints
+        self.only_new = only_new and fingerprints is not None
+        self.counts = {severity: 0 for severity in self.SEVERITIES}
+        self.new_count = 0
+        self._spools = {
+            severity: tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+            for severity in self.SEVERITIES
+        }
+
+    @classmethod
+    def severity_of(cls, event: dict) -> str:
+        """Severity bucket of an issue event, unknown ones count as info"""
+        severity = event.get("issue", {}).get("severity", "").lower()
+        return severity if severity in cls.SEVERITIES else "info"
+
+    def add_events(self, events: Iterable[dict]):
+        """Spool issue events into their severity buckets"""
+        for event in events:
+            is_new = True
+            if self.fingerprints is not None:
+                is_new = self.fingerprints.record(event.get("issue", {}), self.scan_id)
+            if self.only_new and not is_new:
+                continue
+            severity = self.severity_of(event)
+            self._spools[severity].write(json.dumps([is_new, event]) + "\n")
+            self.counts[severity] += 1
+            self.new_count += is_new
+
+    def write(self, status: str, metrics: Optional[Dict] = None) -> Tuple[str, str]:
+        """
+        Write both reports and release the spools
+        Args:
+            status: Final scan_status reported by Burp
+            metrics: Final scan_metrics reported by Burp
+        Returns:
+            tuple: Paths of the Markdown and JSON reports
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        base = self.output_dir / f"scan_report_{self.scan_id}_{self.timestamp}"
+        md_path, json_path = f"{base}.md", f"{base}.json"
+        summary = {"scan_id": self.scan_id, "status": status, "timestamp": self.timestamp}
+        if self.fingerprints is not None:
+            summary["new_issues"] = self.new_count
+        metrics = metrics or {}
+
+        try:
+            with open(json_path, "w", encoding="utf-8") as f:
+                self._write_json(f, summary, metrics)
+            with open(md_path, "w", encoding="utf-8") as f:
+                self._write_markdown(f, summary, metrics)
+        finally:
+            self.close()
+
+        logger.info(f"Report for scan {self.scan_id} written: {sum(self.counts.values())} issues")
+        return md_path, json_path
+
+    def close(self):
+        """Discard spooled events"""
+        for spool in self._spools.values():
+            spool.close()
+
+    def _events(self, severity: str):
+        """Read spooled (is_new, event) pairs of one severity back one at a time"""
+        spool = self._spools[severity]
+        spool.seek(0)
+        for line in spool:
+            yield json.loads(line)
+
+    def _write_json(self, f, summary, metrics):
+        """Stream the JSON report, matching json.dump(..., indent=4) layout"""
+        def block(value, level):
+            return textwrap.indent(json.dumps(value, indent=4), " " * 4 * level).lstrip()
+
+        f.write("{\n")
+        f.write(f'    "summary": {block(summary, 1)},\n')
+        f.write(f'    "metrics": {block(metrics, 1)},\n')
+        f.write('    "vulnerabilities": {\n')
+        for i, severity in enumerate(self.SEVERITIES):
+            f.write(f'        "{severity}": [')
+            for j, (_, event) in enumerate(self._events(severity)):
+                f.write(",\n" if j else "\n")
+                f.write("            " + block(event, 3))
+            f.write("\n        ]" if self.counts[severity] else "]")
+            f.write(",\n" if i < len(self.SEVERITIES) - 1 else "\n")
+        f.write("    }\n}")
+
+    def _write_markdown(self, f, summary, metrics):
+        """Stream the Markdown report"""
+        f.write("# Scan Report\n\n## Summary\n\n")
+        f.write(f"- **Scan ID**: {summary['scan_id']}\n")
+        f.write(f"- **Status**: {summary['status']}\n")
+        f.write(f"- **Time**: {summary['timestamp']}\n")
+        if "new_issues" in summary:
+            f.write(f"- **New Since Last Scan**: {summary['new_issues']}\n")
+        f.write("\n")
+
+        f.write("## Scan Metrics\n\n")
+        for label, key in self.METRIC_LABELS:
+            f.write(f"- **{label}**: {metrics.get(key, 0)}\n")
+
+        f.write("\n## Vulnerabilities Found\n\n")
+        for severity in self.SEVERITIES:
+            if not self.counts[severity]:
+                continue
+            f.write(f"### {severity.capitalize()} ({self.counts[severity]})\n\n")
+            for is_new, event in self._events(severity):
+                issue = event.get("issue", {})
+                url = f"{issue.get('origin', '')}{issue.get('path', '')}" or "N/A"
+                marker = " (new)" if is_new and self.fingerprints is not None else ""
+                f.write(f"- **{issue.get('name', 'N/A')}**{marker}\n")
+                f.write(f"  - URL: {url}\n")
+                f.write(f"  - Confidence: {issue.get('confidence', 'N/A')}\n")
+            f.write("\n")
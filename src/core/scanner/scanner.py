@@ -6,21 +6,65 @@ import logging
 import urllib.parse
 import time 
 import os
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from ..notification.tele_notifyer import TelegramNotifier
+from ..notification.bus import NotificationBus
+from ..notification.sinks import TelegramSink
+from .burp_client import BurpClient
+from .burp_pool import BurpPool
+from .poll_policy import AdaptivePollPolicy
+from .issue_cursor import IssueEventCursor
+from .report import ReportWriter
 
 class Scanner:
-    def __init__(self, burp_api_url, bot_token=None, chat_id=None):
+    # Burp reports "succeeded"; "completed" is kept for older API versions
+    COMPLETED_STATUSES = ("succeeded", "completed")
+
+    def __init__(self, burp_api_url, bot_token=None, chat_id=None, fingerprint_store=None, bus=None):
         """
         Initialize Scanner with API URL and optional Telegram notification settings
+        burp_api_url may list several Burp instances, as a list or comma
+        separated, to spread scans over them with a BurpPool.
+        An optional IssueFingerprintStore suppresses alerts and marks report
+        entries for issues already found by earlier scans. Scan events are
+        published on a NotificationBus, by default one with a Telegram sink
+        when a bot token and chat ID are given; a given bus keeps its own
+        Telegram sink and the scanner shares that sink's notifier.
         """
         self.BURP_API_URL = burp_api_url
-        self.notifier = TelegramNotifier(bot_token, chat_id) if bot_token and chat_id else None
-        self.headers = {"Content-Type": "application/json"}
+        self.fingerprints = fingerprint_store
+        # Sinks deliver from their own threads so alerts never stall polling
+        self.bus = bus
+        if self.bus is not None:
+            self.notifier = next((sink.notifier for sink in self.bus.sinks if isinstance(sink, TelegramSink)), None)
+        else:
+            self.notifier = TelegramNotifier(bot_token, chat_id) if bot_token and chat_id else None
+            if self.notifier:
+                self.bus = NotificationBus([TelegramSink(self.notifier)])
+        burp_urls = burp_api_url if isinstance(burp_api_url, (list, tuple)) else str(burp_api_url or "").split(",")
+        burp_urls = [url.strip() for url in burp_urls if url and url.strip()]
+        self.client = BurpPool(burp_urls) if len(burp_urls) > 1 else BurpClient(burp_urls[0] if burp_urls else burp_api_url)
+        self.headers = self.client.headers
         
         # Constants
         self.SLEEP_TIME = 30  # seconds
         self.MAX_PAUSE_TIME = 15 * 60  # 15 minutes
+        self.MAX_POLL_FAILURES = 10  # consecutive polls without a status
+
+        # Polls adapt to scan progress, SLEEP_TIME is only the baseline
+        self.poll_policy = AdaptivePollPolicy(base_interval=self.SLEEP_TIME)
+        self.last_metrics = {}
+
+        # Per-scan issue event cursors, so polls only transfer new events
+        self.ISSUE_PAGE_SIZE = 500
+        self.REPORT_PAGE_SIZE = 1000
+        self.REPORT_ONLY_NEW = False
+        self.REPORT_WORKERS = 4
+        self._report_executor = None
+        self._report_lock = threading.Lock()
+        self.issue_cursors = {}
         
         # Configure logging
         logging.basicConfig(level=logging.DEBUG, 
@@ -47,16 +91,15 @@ class Scanner:
             }]
 
         logging.debug(f"Sending POST request to {self.BURP_API_URL}/scan with data: {data}")
-        response = requests.post(
-            f"{self.BURP_API_URL}/scan", 
-            headers=self.headers, 
-            data=json.dumps(data)
-        )
+        try:
+            response = self.client.create_scan(data)
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Failed to create scan: {e}")
+            return None
         
         if response.status_code == 201:
-            location_header = response.headers.get("Location")
-            if location_header:
-                scan_id = location_header.split("/")[-1]
+            scan_id = self.client.scan_id_from(response)
+            if scan_id:
                 logging.info(f"Scan created successfully. Scan ID: {scan_id}")
                 return scan_id
         
@@ -65,43 +108,168 @@ class Scanner:
         return None
 
     def check_scan_status(self, scan_id, last_issue_count=0):
-        """Check scan status and notify new vulnerabilities"""
-        url = f"{self.BURP_API_URL}/scan/{scan_id}"
-        logging.debug(f"Sending GET request to {url}")
+        """
+        Check scan status and notify new vulnerabilities
+        A last_issue_count of None records the current issue count as a
+        baseline without notifying.
+        """
+        logging.debug(f"Sending GET request to {self.BURP_API_URL}/scan/{scan_id}")
         
         try:
-            response = requests.get(url, headers=self.headers)
-            
-            if response.status_code == 200:
-                response_json = response.json()
-                scan_status = response_json.get("scan_status")
-                
-                if self.notifier and "issue_events" in response_json:
-                    current_issues = response_json["issue_events"]
-                    current_count = len(current_issues)
-                    
-                    if current_count > last_issue_count:
-                        self._notify_new_issues(
-                            current_issues[last_issue_count:current_count]
-                        )
-                    
-                    return scan_status, current_count
-                
-                return scan_status, last_issue_count
-                
-            elif response.status_code == 202:
-                return "running", last_issue_count
-                
-            logging.error(f"Failed to fetch scan status: {response.status_code}")
-            return None, last_issue_count
-                
+            response = self.client.get_scan(scan_id, self.issue_cursor(scan_id).params())
         except requests.exceptions.RequestException as e:
             logging.error(f"Error while fetching scan status: {e}")
             return None, last_issue_count
 
+        return self._parse_scan_status(scan_id, response, last_issue_count)
+
+    def check_scan_statuses(self, issue_counts):
+        """
+        Check many scans concurrently and notify new vulnerabilities
+        Args:
+            issue_counts: Dict mapping scan IDs to their last issue count
+        Returns:
+            Dict mapping scan IDs to (status, issue_count) tuples
+        """
+        responses = self.client.get_scans(
+            issue_counts,
+            {scan_id: self.issue_cursor(scan_id).params() for scan_id in issue_counts}
+        )
+        statuses = {}
+        for scan_id, response in responses.items():
+            if isinstance(response, Exception):
+                logging.error(f"Error while fetching status of scan {scan_id}: {response}")
+                statuses[scan_id] = (None, issue_counts[scan_id])
+            else:
+                statuses[scan_id] = self._parse_scan_status(scan_id, response, issue_counts[scan_id])
+        return statuses
+
+    def _parse_scan_status(self, scan_id, response, last_issue_count):
+        """Extract the status from a /scan response and notify new issues"""
+        if response.status_code == 200:
+            try:
+                response_json = response.json()
+            except ValueError as e:
+                # Burp answered 200 with a body that is not JSON, e.g. an
+                # error page of a proxy; counts as a failed poll
+                logging.error(f"Invalid status response for scan {scan_id}: {e}")
+                return None, last_issue_count
+            scan_status = response_json.get("scan_status")
+            self.last_metrics[scan_id] = response_json.get("scan_metrics", {})
+            
+            if "issue_events" in response_json:
+                cursor = self.issue_cursor(scan_id)
+                known_count = cursor.count
+                new_issues = cursor.consume(response_json["issue_events"])
+                if self.fingerprints:
+                    new_issues = [
+                        (issue, self.fingerprints.record(issue.get("issue", {}), scan_id))
+                        for issue in new_issues
+                    ]
+                else:
+                    new_issues = [(issue, True) for issue in new_issues]
+                
+                # Skip issues the caller handled before this cursor existed,
+                # and issues earlier scans already alerted on
+                if self.bus and last_issue_count is not None:
+                    already_handled = max(0, last_issue_count - known_count)
+                    unseen = [issue for issue, is_new in new_issues[already_handled:] if is_new]
+                    if unseen:
+                        self._notify_new_issues(unseen, scan_id)
+                
+                return scan_status, cursor.count
+            
+            return scan_status, last_issue_count
+            
+        elif response.status_code == 202:
+            return "running", last_issue_count
+            
+        logging.error(f"Failed to fetch scan status: {response.status_code}")
+        return None, last_issue_count
+
+    def issue_cursor(self, scan_id):
+        """Return the issue event cursor of a scan, creating it on first use"""
+        if scan_id not in self.issue_cursors:
+            self.issue_cursors[scan_id] = IssueEventCursor(self.ISSUE_PAGE_SIZE)
+        return self.issue_cursors[scan_id]
+
+    def forget_scan(self, scan_id):
+        """Drop the per-scan state of a scan that finished or was given up"""
+        self.client.release(scan_id)
+        self.last_metrics.pop(scan_id, None)
+        self.issue_cursors.pop(scan_id, None)
+
     def generate_report(self, scan_id, format="md", output_dir="reports"):
         """Generate a detailed report from scan results"""
-        # ...existing code for generate_report...
+        reports = self.generate_reports(scan_id, output_dir)
+        if not reports:
+            return None
+        md_report, json_report = reports
+        return json_report if format == "json" else md_report
+
+    def generate_reports(self, scan_id, output_dir="reports"):
+        """
+        Stream a scan's issue events into Markdown and JSON reports
+        Events are paged from Burp with a fresh cursor, so the full issue
+        list is never held in memory.
+        Args:
+            scan_id: ID of the scan to report on
+            output_dir: Directory the reports are written to
+        Returns:
+            tuple: Paths of the Markdown and JSON reports, None on failure
+        """
+        writer = ReportWriter(scan_id, output_dir, fingerprints=self.fingerprints, only_new=self.REPORT_ONLY_NEW)
+        cursor = IssueEventCursor(self.REPORT_PAGE_SIZE)
+        try:
+            while True:
+                response = self.client.get_scan(scan_id, cursor.params())
+                if response.status_code != 200:
+                    logging.error(f"Failed to fetch scan {scan_id} for report: {response.status_code}")
+                    writer.close()
+                    return None
+                response_json = response.json()
+                events = response_json.get("issue_events", [])
+                new_events = cursor.consume(events)
+                writer.add_events(new_events)
+                if len(events) < self.REPORT_PAGE_SIZE or not new_events:
+                    break
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Error while fetching scan {scan_id} for report: {e}")
+            writer.close()
+            return None
+        except ValueError as e:
+            # Burp answered 200 with a body that is not JSON
+            logging.error(f"Invalid response for scan {scan_id} report: {e}")
+            writer.close()
+            return None
+
+        return writer.write(
+            response_json.get("scan_status"),
+            response_json.get("scan_metrics", self.last_metrics.get(scan_id))
+        )
+
+    @property
+    def report_executor(self):
+        """Threads rendering reports off the poll loop, REPORT_WORKERS at once, created on first use"""
+        with self._report_lock:
+            if self._report_executor is None:
+                self._report_executor = ThreadPoolExecutor(
+                    max_workers=max(1, self.REPORT_WORKERS), thread_name_prefix="burp-report"
+                )
+            return self._report_executor
+
+    def generate_reports_many(self, scan_ids, output_dir="reports"):
+        """
+        Render reports for several scans in parallel on the report executor
+        Args:
+            scan_ids: IDs of the scans to report on
+            output_dir: Directory the reports are written to
+        Returns:
+            Dict mapping scan IDs to (Markdown, JSON) paths or None
+        """
+        scan_ids = list(scan_ids)
+        reports = self.report_executor.map(lambda scan_id: self.generate_reports(scan_id, output_dir), scan_ids)
+        return dict(zip(scan_ids, reports))
 
     def run_scan(self, target_urls, scan_configs, username=None, password=None):
         """Run complete scan process with monitoring and reporting"""
@@ -109,77 +277,123 @@ class Scanner:
         if not scan_id:
             return False
 
+        return self.monitor_scan(scan_id, last_issue_count=0)
+
+    def monitor_scan(self, scan_id, last_issue_count=None):
+        """
+        Monitor an existing Burp scan until it finishes
+        Args:
+            scan_id: ID of a scan that is already running in Burp
+            last_issue_count: Issues already handled; None attaches to a
+                scan without re-alerting on issues found before, e.g. when
+                resuming after a restart
+        Returns:
+            bool: True if the scan succeeded, False otherwise
+        """
+        logging.info(f"Monitoring scan {scan_id}")
+        try:
+            return self._monitor(scan_id, last_issue_count)
+        finally:
+            self.forget_scan(scan_id)
+
+    def _monitor(self, scan_id, last_issue_count):
+        """Poll loop of monitor_scan"""
         pause_counter = 0
-        last_issue_count = 0
+        failures = 0
+        delay = 0
 
         while True:
+            previous_count = last_issue_count
             status, last_issue_count = self.check_scan_status(scan_id, last_issue_count)
             
-            if status == "completed":
-                self._handle_scan_completion(scan_id)
+            if status in self.COMPLETED_STATUSES:
+                self.handle_scan_completion(scan_id)
                 return True
             elif status == "failed":
-                self._notify_scan_failure()
+                self.notify_scan_failure()
                 return False
             elif status == "paused":
-                pause_counter += self.SLEEP_TIME
+                pause_counter += delay
                 if pause_counter >= self.MAX_PAUSE_TIME:
-                    self._notify_scan_timeout(pause_counter)
+                    self.notify_scan_timeout(pause_counter)
                     return False
-                self._notify_scan_paused(pause_counter)
-            elif status == "running":
+                self.notify_scan_paused(pause_counter)
+            elif status is None:
+                failures += 1
                 pause_counter = 0
-                logging.info("Scan is still running...")
+                if failures >= self.MAX_POLL_FAILURES:
+                    # Wrong scan ID, or the Burp instance is gone
+                    message = f"Scan {scan_id} status unavailable after {failures} polls. Stopping monitoring."
+                    self._publish_alert(message, "error")
+                    logging.error(message)
+                    return False
             else:
-                logging.warning(f"Unexpected status: {status}")
+                failures = 0
                 pause_counter = 0
+                logging.info(f"Scan is still running ({status})...")
+
+            delay = self.poll_policy.next_delay(
+                status,
+                self.last_metrics.get(scan_id),
+                new_issues=self.count_new_issues(previous_count, last_issue_count),
+                failures=failures
+            )
+            time.sleep(delay)
 
-            time.sleep(self.SLEEP_TIME)
+    @staticmethod
+    def count_new_issues(previous_count, current_count):
+        """Issues found between two polls, 0 while no baseline is known"""
+        if previous_count is None or current_count is None:
+            return 0
+        return max(0, current_count - previous_count)
 
-    def _notify_new_issues(self, new_issues):
-        """Handle notification of new issues"""
+    def _notify_new_issues(self, new_issues, scan_id=None):
+        """Publish new issues, sinks decide which severities to alert on"""
         for issue in new_issues:
-            severity = issue["issue"].get("severity", "").lower()
-            if severity in ["high", "medium"]:
-                message = self.notifier.format_issue_message(issue["issue"])
-                self.notifier.send_message(message)
-                logging.info(f"Notified new {severity} severity issue")
+            self.bus.publish("issue", scan_id, issue["issue"])
+        logging.info(f"Published {len(new_issues)} new issues")
 
-    def _handle_scan_completion(self, scan_id):
+    def _publish_alert(self, message, level="info"):
+        """Publish a scan status alert"""
+        if self.bus:
+            self.bus.publish("alert", None, {"message": message, "level": level})
+
+    def close(self, timeout=30):
+        """Finish pending reports, flush queued notifications and release HTTP connections"""
+        with self._report_lock:
+            executor, self._report_executor = self._report_executor, None
+        if executor is not None:
+            # Reports publish to the bus, so they end before it closes
+            executor.shutdown(wait=True)
+        if self.bus:
+            self.bus.close(timeout)
+        self.client.close()
+
+    def handle_scan_completion(self, scan_id):
         """Handle successful scan completion"""
         logging.info("Scan completed successfully.")
-        md_report = self.generate_report(scan_id, format="md")
-        json_report = self.generate_report(scan_id, format="json")
+        md_report, json_report = self.generate_reports(scan_id) or (None, None)
         
-        if self.notifier:
-            try:
-                self.notifier.notify_vulnerabilities(json_report, md_report)
-            except Exception as e:
-                logging.error(f"Error sending final notification: {e}")
+        if self.bus and md_report:
+            self.bus.publish("report", scan_id, {"markdown": md_report, "json": json_report})
 
         if md_report and json_report:
             logging.info(f"Reports generated:\nMarkdown: {md_report}\nJSON: {json_report}")
 
-    def _notify_scan_failure(self):
+    def notify_scan_failure(self):
         """Handle scan failure notification"""
         message = "Scan failed."
-        if self.notifier:
-            alert_text = self.notifier.notify_alert(message)
-            self.notifier.send_message(alert_text)
+        self._publish_alert(message, "error")
         logging.error(message)
 
-    def _notify_scan_timeout(self, pause_duration):
+    def notify_scan_timeout(self, pause_duration):
         """Handle scan timeout notification"""
         message = f"Scan has been paused for {pause_duration/60} minutes. Stopping scan."
-        if self.notifier:
-            alert_text = self.notifier.notify_alert(message)
-            self.notifier.send_message(alert_text)
+        self._publish_alert(message, "warning")
         logging.warning(message)
 
-    def _notify_scan_paused(self, pause_duration):
+    def notify_scan_paused(self, pause_duration):
         """Handle scan pause notification"""
         message = f"Scan is paused (for {pause_duration/60:.1f} minutes)."
-        if self.notifier:
-            alert_text = self.notifier.notify_alert(message)
-            self.notifier.send_message(alert_text)
+        self._publish_alert(message)
         logging.info(message)
\ No newline at end of file
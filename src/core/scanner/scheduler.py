@@ -0,0 +1,339 @@
+import logging
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Dict, List, Optional, Union
+
+from ..storage.job_queue import ScanJobQueue
+
+logger = logging.getLogger(__name__)
+
+
+class ScanJob:
+    def __init__(self, url: Union[str, List[str]]):
+        """Book-keeping for a target, or a batch of targets sharing one Burp scan"""
+        self.urls = [url] if isinstance(url, str) else list(url)
+        self.url = ", ".join(self.urls)
+        self.job_id: Optional[int] = None
+        self.scan_id: Optional[str] = None
+        self.status: Optional[str] = None
+        self.issue_count: Optional[int] = 0
+        self.pause_time = 0.0
+        self.failures = 0
+        self.started_at: Optional[float] = None
+        # Passed before_submit, so after_finish is owed once it ends
+        self.admitted = False
+        self.last_poll: Optional[float] = None
+        self.next_poll: float = 0.0
+        # Reports of a completed scan, rendered off the poll loop
+        self.report: Optional[Future] = None
+
+
+class ScanScheduler:
+    def __init__(
+        self,
+        scanner,
+        max_concurrent: int = 4,
+        poll_interval: Optional[float] = None,
+        before_submit: Optional[Callable[[str], bool]] = None,
+        can_submit: Optional[Callable[[], bool]] = None,
+        after_finish: Optional[Callable[[str], None]] = None,
+        job_queue: Optional[ScanJobQueue] = None,
+        cycle: str = "",
+        max_poll_failures: int = 10
+    ):
+        """
+        Keep up to N Burp scans in flight and poll them from one loop
+        Args:
+            scanner: Scanner used to create and poll Burp scans
+            max_concurrent: Maximum number of scans running at once
+            poll_interval: Fixed seconds between polls of a scan, defaults
+                to the scanner's adaptive poll_policy
+            before_submit: Optional hook called with each URL before its
+                scan is created, returning False skips the target
+            can_submit: Optional check before each submission; while it
+                returns False and scans are running, new targets wait and
+                the running scans keep being polled
+            after_finish: Optional hook called with the URL of every target
+                that passed before_submit once its scan has ended
+            job_queue: Optional durable queue; targets are then claimed
+                from it, progress is persisted and scans left running by
+                a previous run of this worker are resumed
+            cycle: Queue cycle the targets belong to, a target is only
+                scanned once per cycle and only scans of this cycle left
+                running by a previous run are resumed
+            max_poll_failures: Consecutive failed polls after which a scan
+                is given up, e.g. when its Burp instance is gone
+        """
+        self.scanner = scanner
+        self.max_concurrent = max(1, max_concurrent)
+        self.poll_interval = poll_interval
+        self.before_submit = before_submit
+        self.can_submit = can_submit
+        self.after_finish = after_finish
+        self.job_queue = job_queue
+        self.cycle = cycle
+        self.max_poll_failures = max(1, max_poll_failures)
+
+    def run(
+        self,
+        target_urls: List[Union[str, List[str]]],
+        scan_configs: List[str],
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        attach: Optional[Dict[str, str]] = None
+    ) -> Dict:
+        """
+        Scan every target, admitting new ones as running scans finish
+        Args:
+            target_urls: URLs to scan, one Burp scan each; a list of URLs
+                is scanned as one multi-URL Burp scan
+            scan_configs: Named Burp scan configurations
+            username: Optional login username
+            password: Optional login password
+            attach: Existing Burp scans to monitor instead of creating,
+                mapping scan ID to target URL; they and scans recovered
+                from the job queue count against max_concurrent
+        Returns:
+            Dict containing scan results and statistics
+        """
+        results = {
+            "successful_scans": [],
+            "failed_scans": [],
+            "total_vulnerabilities": 0,
+            "scan_time": 0
+        }
+        started = time.monotonic()
+        pending = deque(target_urls)
+        active: Dict[str, ScanJob] = {}
+        # Taken targets waiting for can_submit, ahead of anything else
+        deferred: deque = deque()
+        # Completed scans whose reports are still being generated
+        reporting: List[ScanJob] = []
+
+        # Scans already running in Burp take slots before any new target
+        running = deque(self.attach(scan_id, url) for scan_id, url in (attach or {}).items())
+
+        if self.job_queue is not None:
+            added = self.job_queue.enqueue(pending, self.cycle)
+            logger.info(f"Queued {added} new targets for cycle '{self.cycle}'")
+            pending.clear()
+            running.extend(self._resume(record) for record in self.job_queue.recover(self.cycle))
+
+        if len(running) > self.max_concurrent:
+            logger.warning(
+                f"{len(running)} scans are already running, monitoring {self.max_concurrent} "
+                f"at a time and holding new targets until they finish"
+            )
+
+        try:
+            while True:
+                self._collect_reports(reporting, results)
+                while running and len(active) < self.max_concurrent:
+                    job = running.popleft()
+                    job.last_poll = time.monotonic()
+                    active[job.scan_id] = job
+                slots = self.max_concurrent - len(active) - len(running)
+                admitted = [deferred.popleft() for _ in range(min(max(0, slots), len(deferred)))]
+                admitted += self._take(pending, slots - len(admitted))
+                for index, job in enumerate(admitted):
+                    if active and self.can_submit is not None and not self.can_submit():
+                        # Keep polling instead of blocking in before_submit
+                        deferred.extendleft(reversed(admitted[index:]))
+                        break
+                    if self._submit(job, scan_configs, username, password, results):
+                        active[job.scan_id] = job
+                if not active:
+                    if admitted:
+                        continue
+                    if not reporting:
+                        break
+
+                # Only poll the scans whose adaptive delay has elapsed
+                now = time.monotonic()
+                due = {scan_id: job.issue_count for scan_id, job in active.items() if job.next_poll <= now}
+                if due:
+                    statuses = self.scanner.check_scan_statuses(due)
+                    for scan_id, (status, issue_count) in statuses.items():
+                        job = active[scan_id]
+                        try:
+                            finished = self._handle_status(job, status, issue_count, results)
+                        except Exception as e:
+                            # Only this scan is given up, the others keep being polled
+                            logger.exception(f"Error handling scan {scan_id} for {job.url}")
+                            self._fail(job, str(e), results)
+                            finished = True
+                        if finished:
+                            del active[scan_id]
+                            if job.report is None:
+                                self.scanner.forget_scan(scan_id)
+                            else:
+                                reporting.append(job)
+                            self._finished(job)
+
+                timeout = None
+                if active:
+                    wake = min(job.next_poll for job in active.values())
+                    timeout = max(0, wake - time.monotonic())
+                if reporting:
+                    # Wake up early for a finished report
+                    wait([job.report for job in reporting], timeout, return_when=FIRST_COMPLETED)
+                elif timeout is not None:
+                    time.sleep(timeout)
+        finally:
+            # Nothing tracks scans left running after an error any more
+            for job in active.values():
+                self._finished(job)
+
+        results["scan_time"] = round(time.monotonic() - started, 1)
+        return results
+
+    def _collect_reports(self, reporting: List[ScanJob], results):
+        """Record the scans whose reports are done as succeeded, or failed if reporting raised"""
+        for job in [job for job in reporting if job.report.done()]:
+            reporting.remove(job)
+            error = job.report.exception()
+            if error is not None:
+                logger.error(f"Error handling scan {job.scan_id} for {job.url}: {error}")
+                self._fail(job, str(error), results)
+            else:
+                logger.info(f"Scan completed successfully for {job.url}")
+                results["successful_scans"].extend(job.urls)
+                results["total_vulnerabilities"] += job.issue_count or 0
+                if self.job_queue is not None and job.job_id is not None:
+                    self.job_queue.finish(job.job_id, ScanJobQueue.SUCCEEDED, issue_count=job.issue_count)
+            self.scanner.forget_scan(job.scan_id)
+
+    def _finished(self, job: ScanJob):
+        """Report the end of an admitted job to after_finish, once"""
+        if job.admitted and self.after_finish is not None:
+            job.admitted = False
+            self.after_finish(job.url)
+
+    @staticmethod
+    def attach(scan_id: str, url: Union[str, List[str]]) -> ScanJob:
+        """Build a job for an already running scan without re-alerting old issues"""
+        logger.info(f"Attaching to scan {scan_id} for {url}")
+        job = ScanJob(url)
+        job.scan_id = scan_id
+        job.issue_count = None
+        job.started_at = job.last_poll = time.monotonic()
+        return job
+
+    def _resume(self, record: Dict) -> ScanJob:
+        """Rebuild a job left running by a previous run from the queue"""
+        job = self.attach(record["scan_id"], record["urls"])
+        job.job_id = record["id"]
+        if record["issue_count"] is not None:
+            # Continue the issue stream where it stopped instead of
+            # treating everything found so far as a fresh baseline
+            self.scanner.issue_cursor(job.scan_id).restore(record["cursor_after"], record["issue_count"])
+            job.issue_count = record["issue_count"]
+        return job
+
+    def _take(self, pending: deque, slots: int) -> List[ScanJob]:
+        """Next targets to submit, claimed from the job queue if there is one"""
+        if slots <= 0:
+            return []
+        if self.job_queue is not None:
+            jobs = []
+            for record in self.job_queue.claim(slots, self.cycle):
+                job = ScanJob(record["urls"])
+                job.job_id = record["id"]
+                jobs.append(job)
+            return jobs
+        return [ScanJob(pending.popleft()) for _ in range(min(slots, len(pending)))]
+
+    def _submit(self, job: ScanJob, scan_configs, username, password, results) -> bool:
+        """Create the Burp scan of a job, recording failures in results"""
+        url = job.url
+        try:
+            logger.info(f"Starting scan for {url}")
+            if self.before_submit:
+                if not self.before_submit(url):
+                    self._fail(job, "VPN rotation failed", results)
+                    return False
+                job.admitted = True
+
+            if self.job_queue is not None and job.job_id is not None:
+                self.job_queue.mark_submitting(job.job_id)
+            job.scan_id = self.scanner.create_scan(job.urls, scan_configs, username, password)
+        except Exception as e:
+            logger.error(f"Error scanning {url}: {e}")
+            self._fail(job, str(e), results)
+            self._finished(job)
+            return False
+
+        if not job.scan_id:
+            logger.error(f"Failed to create scan for {url}")
+            self._fail(job, "Scan creation failed", results)
+            self._finished(job)
+            return False
+
+        job.started_at = job.last_poll = time.monotonic()
+        if self.job_queue is not None:
+            self.job_queue.mark_running(job.job_id, job.scan_id)
+        return True
+
+    def _fail(self, job: ScanJob, reason: str, results):
+        """Record failed targets in results and the job queue"""
+        results["failed_scans"].extend({"url": url, "reason": reason} for url in job.urls)
+        if self.job_queue is not None and job.job_id is not None:
+            self.job_queue.finish(job.job_id, ScanJobQueue.FAILED, reason, job.issue_count)
+
+    def _handle_status(self, job: ScanJob, status, issue_count, results) -> bool:
+        """
+        Apply a polled status to its job
+        Returns:
+            bool: True once the scan has finished, successfully or not
+        """
+        new_issues = self.scanner.count_new_issues(job.issue_count, issue_count)
+        if self.job_queue is not None and job.job_id is not None and issue_count != job.issue_count:
+            cursor = self.scanner.issue_cursor(job.scan_id)
+            self.job_queue.update_progress(job.job_id, issue_count, cursor.after)
+        job.issue_count = issue_count
+        now = time.monotonic()
+        elapsed, job.last_poll = now - job.last_poll, now
+        job.status = status
+        job.failures = job.failures + 1 if status is None else 0
+        job.next_poll = now + self._next_delay(job, new_issues)
+
+        if status in self.scanner.COMPLETED_STATUSES:
+            # Paging a large audit into reports must not hold up the polls
+            # of the other scans; the job stays running until they are done
+            job.report = self.scanner.report_executor.submit(self.scanner.handle_scan_completion, job.scan_id)
+            return True
+
+        if status == "failed":
+            self.scanner.notify_scan_failure()
+            logger.error(f"Scan failed for {job.url}")
+            self._fail(job, "Scan execution failed", results)
+            return True
+
+        if status == "paused":
+            job.pause_time += elapsed
+            if job.pause_time >= self.scanner.MAX_PAUSE_TIME:
+                self.scanner.notify_scan_timeout(job.pause_time)
+                self._fail(job, "Scan paused too long", results)
+                return True
+            self.scanner.notify_scan_paused(job.pause_time)
+        else:
+            job.pause_time = 0
+            if status is None:
+                logger.warning(f"Could not fetch status of scan {job.scan_id} for {job.url}")
+                if job.failures >= self.max_poll_failures:
+                    self._fail(job, f"Scan status unavailable after {job.failures} polls", results)
+                    return True
+
+        return False
+
+    def _next_delay(self, job: ScanJob, new_issues: int) -> float:
+        """Seconds until the job should be polled again"""
+        if self.poll_interval is not None:
+            return self.poll_interval
+        return self.scanner.poll_policy.next_delay(
+            job.status,
+            self.scanner.last_metrics.get(job.scan_id),
+            new_issues=new_issues,
+            failures=job.failures
+        )
@@ -0,0 +1,8 @@
+"""
+Persistent storage modules
+"""
+from .domain_store import DomainStore
+from .fingerprint_store import IssueFingerprintStore
+from .job_queue import ScanJobQueue
+
+__all__ = ['DomainStore', 'IssueFingerprintStore', 'ScanJobQueue']
\ No newline at end of file
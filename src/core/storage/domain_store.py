@@ -0,0 +1,285 @@
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def utc_now() -> str:
+    """Current UTC time as an ISO-8601 string, sortable as text"""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class DomainStore:
+    DEFAULT_FILENAME = "domains.db"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS domains (
+            domain TEXT PRIMARY KEY,
+            program TEXT,
+            source TEXT,
+            source_program TEXT,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_domains_program ON domains (program);
+        CREATE INDEX IF NOT EXISTS idx_domains_last_seen ON domains (last_seen);
+
+        CREATE TABLE IF NOT EXISTS tagged_domains (
+            domain TEXT PRIMARY KEY,
+            program TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_tagged_program ON tagged_domains (program);
+
+        CREATE TABLE IF NOT EXISTS probes (
+            domain TEXT PRIMARY KEY,
+            alive INTEGER NOT NULL,
+            url TEXT,
+            final_url TEXT,
+            status INTEGER,
+            title TEXT,
+            redirects TEXT,
+            error TEXT,
+            probed_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_probes_alive ON probes (alive, probed_at);
+    """
+
+    def __init__(self, path, batch_size=10000):
+        """
+        SQLite-backed store of discovered domains and their programs
+        Args:
+            path: Database file, created with its schema if missing
+            batch_size: Rows per executemany call on bulk inserts
+        """
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    @classmethod
+    def open_in(cls, database_dir) -> "DomainStore":
+        """Open the default store inside a database directory"""
+        return cls(Path(database_dir) / cls.DEFAULT_FILENAME)
+
+    def add_domains(
+        self,
+        domains: Iterable[str],
+        program: Optional[str] = None,
+        source: Optional[str] = None,
+        source_program: Optional[str] = None
+    ) -> int:
+        """
+        Bulk insert domains, refreshing last_seen for known ones
+        Args:
+            domains: Domains to record
+            program: Program the domains are attributed to, which puts them
+                in scope; keeps the stored one if None
+            source: Where the domains were discovered, e.g. "chaos"
+            source_program: Name the source lists the domains under, kept
+                for reference only and not an attribution
+        Returns:
+            int: Number of domains processed
+        """
+        now = utc_now()
+        rows = ((domain, program, source, source_program, now, now) for domain in domains)
+        return self._executemany("""
+            INSERT INTO domains (domain, program, source, source_program, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(domain) DO UPDATE SET
+                program = COALESCE(excluded.program, domains.program),
+                source = COALESCE(excluded.source, domains.source),
+                source_program = COALESCE(excluded.source_program, domains.source_program),
+                last_seen = excluded.last_seen
+        """, rows)
+
+    def assign_programs(self, pairs: Iterable[Tuple[str, Optional[str]]]) -> int:
+        """
+        Bulk update the program of known domains
+        Args:
+            pairs: (domain, program) tuples, pairs without a program are skipped
+        Returns:
+            int: Number of pairs processed
+        """
+        rows = ((program, domain) for domain, program in pairs if program)
+        return self._executemany("UPDATE domains SET program = ? WHERE domain = ?", rows)
+
+    def replace_tags(self, entries: Iterable[dict]) -> int:
+        """
+        Replace the tagged domain list used to attribute programs
+        Args:
+            entries: ``{"domain": ..., "program": ...}`` dicts
+        Returns:
+            int: Number of tags stored
+        """
+        rows = ((entry["domain"], entry["program"]) for entry in entries)
+        total = 0
+        # One transaction, so a failed insert keeps the previous tags
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tagged_domains")
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    return total
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO tagged_domains (domain, program) VALUES (?, ?)", batch
+                )
+                total += len(batch)
+
+    def tagged_entries(self) -> Iterator[Dict[str, str]]:
+        """Yield stored tags as ``{"domain": ..., "program": ...}`` dicts"""
+        for row in self._query("SELECT domain, program FROM tagged_domains ORDER BY rowid"):
+            yield {"domain": row["domain"], "program": row["program"]}
+
+    def domains_for_program(self, program: str) -> List[str]:
+        """Point query of every domain attributed to a program"""
+        return [
+            row["domain"] for row in
+            self._query("SELECT domain FROM domains WHERE program = ? ORDER BY domain", (program,))
+        ]
+
+    def iter_domains(self, in_scope: bool = False, source: Optional[str] = None) -> Iterator[str]:
+        """
+        Stream stored domains in sorted order
+        Args:
+            in_scope: Only yield domains attributed to a program
+            source: Only yield domains from this source
+        Returns:
+            Iterator[str]: Matching domains
+        """
+        clauses, params = [], []
+        if in_scope:
+            clauses.append("program IS NOT NULL")
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        # A dedicated read connection streams rows without holding the lock
+        conn = sqlite3.connect(str(self.path))
+        try:
+            for (domain,) in conn.execute(f"SELECT domain FROM domains {where} ORDER BY domain", params):
+                yield domain
+        finally:
+            conn.close()
+
+    def get(self, domain: str) -> Optional[dict]:
+        """Return the stored record of a domain, or None"""
+        rows = list(self._query("SELECT * FROM domains WHERE domain = ?", (domain,)))
+        return dict(rows[0]) if rows else None
+
+    def get_many(self, domains: Iterable[str], chunk_size: int = 500) -> Dict[str, dict]:
+        """Return the stored records of many domains, keyed by domain"""
+        domains = iter(domains)
+        records = {}
+        while True:
+            chunk = list(islice(domains, chunk_size))
+            if not chunk:
+                return records
+            placeholders = ",".join("?" * len(chunk))
+            for row in self._query(f"SELECT * FROM domains WHERE domain IN ({placeholders})", chunk):
+                records[row["domain"]] = dict(row)
+
+    def record_probes(self, results: Iterable) -> int:
+        """
+        Store liveness probe results, replacing earlier ones
+        Args:
+            results: ProbeResult tuples from a LivenessProber
+        Returns:
+            int: Number of results stored
+        """
+        now = utc_now()
+        rows = (
+            (r.host, int(r.alive), r.url, r.final_url, r.status, r.title,
+             json.dumps(list(r.redirects)), r.error, now)
+            for r in results
+        )
+        return self._executemany("""
+            INSERT OR REPLACE INTO probes
+                (domain, alive, url, final_url, status, title, redirects, error, probed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+    def probes(self, domains: Iterable[str], max_age: Optional[float] = None, chunk_size: int = 500) -> Dict[str, dict]:
+        """
+        Latest probe results of domains, keyed by domain
+        Args:
+            domains: Domains to look up
+            max_age: Ignore results older than this many seconds
+        """
+        since = None
+        if max_age is not None:
+            since = (datetime.now(timezone.utc) - timedelta(seconds=max_age)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        domains = iter(domains)
+        results = {}
+        while True:
+            chunk = list(islice(domains, chunk_size))
+            if not chunk:
+                return results
+            placeholders = ",".join("?" * len(chunk))
+            sql = f"SELECT * FROM probes WHERE domain IN ({placeholders})"
+            params = list(chunk)
+            if since:
+                sql += " AND probed_at >= ?"
+                params.append(since)
+            for row in self._query(sql, params):
+                record = dict(row)
+                record["alive"] = bool(record["alive"])
+                record["redirects"] = json.loads(record["redirects"] or "[]")
+                results[row["domain"]] = record
+
+    def liveness(self, domains: Iterable[str], max_age: Optional[float] = None) -> Dict[str, bool]:
+        """Whether each probed domain answered, unprobed domains are left out"""
+        return {domain: record["alive"] for domain, record in self.probes(domains, max_age).items()}
+
+    def programs(self) -> List[str]:
+        """List every program with at least one domain"""
+        return [
+            row["program"] for row in
+            self._query("SELECT DISTINCT program FROM domains WHERE program IS NOT NULL ORDER BY program")
+        ]
+
+    def count(self, program: Optional[str] = None) -> int:
+        """Count stored domains, optionally for a single program"""
+        if program:
+            rows = self._query("SELECT COUNT(*) AS n FROM domains WHERE program = ?", (program,))
+        else:
+            rows = self._query("SELECT COUNT(*) AS n FROM domains")
+        return next(iter(rows))["n"]
+
+    def close(self):
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _query(self, sql, params=()):
+        """Run a read query and return all rows"""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _executemany(self, sql, rows) -> int:
+        """Run a write statement over rows in batches, one transaction per batch"""
+        rows = iter(rows)
+        total = 0
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                return total
+            with self._lock, self._conn:
+                self._conn.executemany(sql, batch)
+            total += len(batch)
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List
+from urllib.parse import urlparse
+
+from .domain_store import utc_now
+
+
+class IssueFingerprintStore:
+    DEFAULT_FILENAME = "findings.db"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            fingerprint TEXT PRIMARY KEY,
+            issue_type TEXT,
+            host TEXT,
+            path TEXT,
+            evidence_hash TEXT,
+            name TEXT,
+            severity TEXT,
+            first_scan_id TEXT NOT NULL,
+            last_scan_id TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_fingerprints_first_scan ON fingerprints (first_scan_id);
+
+        CREATE TABLE IF NOT EXISTS scan_issues (
+            scan_id TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            PRIMARY KEY (scan_id, fingerprint)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path):
+        """
+        Persistent index of issue fingerprints across scans
+        Args:
+            path: Database file, created with its schema if missing
+        """
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+        # fingerprint -> first_scan_id, so repeat lookups skip SQLite
+        self._first_scan: Dict[str, str] = {}
+
+    @classmethod
+    def open_in(cls, database_dir) -> "IssueFingerprintStore":
+        """Open the default store inside a database directory"""
+        return cls(Path(database_dir) / cls.DEFAULT_FILENAME)
+
+    @staticmethod
+    def fingerprint(issue: dict) -> Dict[str, str]:
+        """
+        Identify an issue independently of the scan that found it
+        Args:
+            issue: ``issue`` object of a Burp issue event
+        Returns:
+            Dict with issue_type, host, path, evidence_hash and fingerprint
+        """
+        host = urlparse(issue.get("origin", "")).netloc.lower()
+        path = issue.get("path", "").split("?", 1)[0]
+        # Request/response bodies differ on every scan, only hash the details
+        evidence = [item.get("detail") for item in issue.get("evidence", []) if isinstance(item, dict)]
+        evidence_hash = hashlib.sha1(
+            json.dumps(evidence, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        parts = {
+            "issue_type": str(issue.get("type_index", issue.get("name", ""))),
+            "host": host,
+            "path": path,
+            "evidence_hash": evidence_hash,
+        }
+        parts["fingerprint"] = hashlib.sha1("|".join(parts.values()).encode("utf-8")).hexdigest()
+        return parts
+
+    def record(self, issue: dict, scan_id) -> bool:
+        """
+        Record that a scan found an issue
+        Args:
+            issue: ``issue`` object of a Burp issue event
+            scan_id: Scan that found the issue
+        Returns:
+            bool: True if the issue was first seen in this scan
+        """
+        scan_id = str(scan_id)
+        parts = self.fingerprint(issue)
+        key = parts["fingerprint"]
+        now = utc_now()
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO scan_issues (scan_id, fingerprint) VALUES (?, ?)",
+                (scan_id, key)
+            )
+            if key not in self._first_scan:
+                self._conn.execute("""
+                    INSERT INTO fingerprints (
+                        fingerprint, issue_type, host, path, evidence_hash, name, severity,
+                        first_scan_id, last_scan_id, first_seen, last_seen
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(fingerprint) DO UPDATE SET
+                        last_scan_id = excluded.last_scan_id,
+                        last_seen = excluded.last_seen
+                """, (
+                    key, parts["issue_type"], parts["host"], parts["path"], parts["evidence_hash"],
+                    issue.get("name"), issue.get("severity"), scan_id, scan_id, now, now
+                ))
+                row = self._conn.execute(
+                    "SELECT first_scan_id FROM fingerprints WHERE fingerprint = ?", (key,)
+                ).fetchone()
+                self._first_scan[key] = row["first_scan_id"]
+            else:
+                self._conn.execute(
+                    "UPDATE fingerprints SET last_scan_id = ?, last_seen = ? WHERE fingerprint = ?",
+                    (scan_id, now, key)
+                )
+        return self._first_scan[key] == scan_id
+
+    def is_known(self, issue: dict) -> bool:
+        """Whether any scan has recorded this issue before"""
+        key = self.fingerprint(issue)["fingerprint"]
+        if key in self._first_scan:
+            return True
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT first_scan_id FROM fingerprints WHERE fingerprint = ?", (key,)
+            ).fetchone()
+        if row:
+            self._first_scan[key] = row["first_scan_id"]
+        return row is not None
+
+    def filter_new(self, events: Iterable[dict], scan_id) -> List[dict]:
+        """Record issue events and keep those first seen in this scan"""
+        return [event for event in events if self.record(event.get("issue", {}), scan_id)]
+
+    def diff(self, scan_id) -> Dict[str, List[dict]]:
+        """
+        "New since last scan" view of a scan
+        Args:
+            scan_id: Scan to compare against everything recorded before it
+        Returns:
+            Dict with "new" and "recurring" lists of fingerprint records
+        """
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT f.* FROM scan_issues s
+                JOIN fingerprints f ON f.fingerprint = s.fingerprint
+                WHERE s.scan_id = ?
+                ORDER BY f.severity, f.host, f.path
+            """, (str(scan_id),)).fetchall()
+        view = {"new": [], "recurring": []}
+        for row in rows:
+            view["new" if row["first_scan_id"] == str(scan_id) else "recurring"].append(dict(row))
+        return view
+
+    def severity_counts(self, hosts: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        """
+        Findings recorded per host and severity
+        Args:
+            hosts: Hosts to look up, as stored, i.e. lowercase netloc
+        Returns:
+            Dict mapping each host with findings to {severity: count}
+        """
+        hosts = list(dict.fromkeys(hosts))
+        counts: Dict[str, Dict[str, int]] = {}
+        for start in range(0, len(hosts), 500):
+            chunk = hosts[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(f"""
+                    SELECT host, LOWER(severity) AS severity, COUNT(*) AS n FROM fingerprints
+                    WHERE host IN ({placeholders}) GROUP BY host, LOWER(severity)
+                """, chunk).fetchall()
+            for row in rows:
+                counts.setdefault(row["host"], {})[row["severity"]] = row["n"]
+        return counts
+
+    def close(self):
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
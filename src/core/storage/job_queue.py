@@ -0,0 +1,295 @@
+import logging
+import socket
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .domain_store import utc_now
+
+logger = logging.getLogger(__name__)
+
+
+class ScanJobQueue:
+    DEFAULT_FILENAME = "jobs.db"
+
+    PENDING = "pending"
+    CLAIMED = "claimed"
+    # Burp scan being created; a crash here leaves its scan ID unknown
+    SUBMITTING = "submitting"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    # Batches of URLs scanned together are stored as one job, the url
+    # column holds them joined; scan_job_urls has a row per URL
+    BATCH_SEPARATOR = "\n"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scan_jobs (
+            id INTEGER PRIMARY KEY,
+            cycle TEXT NOT NULL DEFAULT '',
+            url TEXT NOT NULL,
+            status TEXT NOT NULL,
+            worker TEXT,
+            scan_id TEXT,
+            issue_count INTEGER,
+            cursor_after TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            reason TEXT,
+            created_at TEXT NOT NULL,
+            claimed_at TEXT,
+            started_at TEXT,
+            finished_at TEXT,
+            updated_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_scan_jobs_status ON scan_jobs (status, id);
+        CREATE TABLE IF NOT EXISTS scan_job_urls (
+            cycle TEXT NOT NULL,
+            url TEXT NOT NULL,
+            job_id INTEGER NOT NULL REFERENCES scan_jobs (id),
+            position INTEGER NOT NULL,
+            PRIMARY KEY (cycle, url)
+        );
+        CREATE INDEX IF NOT EXISTS idx_scan_job_urls_job ON scan_job_urls (job_id);
+    """
+
+    def __init__(self, path, worker: Optional[str] = None, busy_timeout: float = 30):
+        """
+        Durable queue of scan jobs shared by scheduler processes
+        Every target is a row recording its Burp scan ID, status, issue
+        cursor and timings. Jobs are claimed inside an immediate
+        transaction, so concurrent workers never take the same target,
+        and a restarted worker picks its running scans back up.
+        Args:
+            path: Database file, created with its schema if missing
+            worker: Name of this worker, defaults to the hostname
+            busy_timeout: Seconds to wait for another worker's write lock
+        """
+        self.path = Path(path)
+        self.worker = worker or socket.gethostname()
+        self._lock = threading.RLock()
+        # Autocommit mode, transactions are opened explicitly below
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    @classmethod
+    def open_in(cls, database_dir, worker: Optional[str] = None) -> "ScanJobQueue":
+        """Open the default queue inside a database directory"""
+        return cls(Path(database_dir) / cls.DEFAULT_FILENAME, worker=worker)
+
+    @staticmethod
+    def new_cycle() -> str:
+        """Name for a fresh scan cycle, unique per run"""
+        return f"{datetime.now().strftime('%Y-%m-%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction holding the database lock from the start"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def enqueue(self, urls: Iterable[Union[str, List[str]]], cycle: str = "") -> int:
+        """
+        Add targets to the queue, skipping URLs already queued for the cycle
+        URLs are deduplicated one by one, so a batch only keeps the URLs
+        no earlier job of the cycle, from any run or worker, contains.
+        Args:
+            urls: Target URLs, or lists of URLs forming one multi-URL scan
+            cycle: Scan cycle, a URL is scanned at most once per cycle
+        Returns:
+            int: Number of jobs added
+        """
+        now = utc_now()
+        added = 0
+        with self._transaction() as conn:
+            for batch in urls:
+                batch = [batch] if isinstance(batch, str) else batch
+                fresh = [
+                    url for url in dict.fromkeys(batch)
+                    if not conn.execute(
+                        "SELECT 1 FROM scan_job_urls WHERE cycle = ? AND url = ?", (cycle, url)
+                    ).fetchone()
+                ]
+                if not fresh:
+                    continue
+                job_id = conn.execute("""
+                    INSERT INTO scan_jobs (cycle, url, status, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (cycle, self.BATCH_SEPARATOR.join(fresh), self.PENDING, now, now)).lastrowid
+                conn.executemany(
+                    "INSERT INTO scan_job_urls (cycle, url, job_id, position) VALUES (?, ?, ?, ?)",
+                    ((cycle, url, job_id, position) for position, url in enumerate(fresh))
+                )
+                added += 1
+        return added
+
+    def unqueued(self, urls: Iterable[str], cycle: str = "") -> List[str]:
+        """URLs no job of the cycle contains yet, to filter targets before batching"""
+        urls = list(dict.fromkeys(urls))
+        with self._lock:
+            queued = {
+                row["url"] for row in self._conn.execute(
+                    "SELECT url FROM scan_job_urls WHERE cycle = ?", (cycle,)
+                )
+            }
+        return [url for url in urls if url not in queued]
+
+    def claim(self, limit: int = 1, cycle: Optional[str] = None) -> List[Dict]:
+        """
+        Atomically take pending jobs for this worker
+        Args:
+            limit: Maximum jobs to claim
+            cycle: Only claim jobs of this cycle
+        Returns:
+            List[Dict]: Claimed jobs, oldest first
+        """
+        if limit <= 0:
+            return []
+        now = utc_now()
+        query = "SELECT id FROM scan_jobs WHERE status = ?"
+        params = [self.PENDING]
+        if cycle is not None:
+            query += " AND cycle = ?"
+            params.append(cycle)
+        query += " ORDER BY id LIMIT ?"
+        params.append(limit)
+
+        with self._transaction() as conn:
+            ids = [row["id"] for row in conn.execute(query, params)]
+            conn.executemany("""
+                UPDATE scan_jobs
+                SET status = ?, worker = ?, claimed_at = ?, updated_at = ?, attempts = attempts + 1
+                WHERE id = ?
+            """, ((self.CLAIMED, self.worker, now, now, job_id) for job_id in ids))
+        return [self.get(job_id) for job_id in ids]
+
+    def mark_submitting(self, job_id: int):
+        """Record that the Burp scan of a claimed job is about to be created"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE scan_jobs SET status = ?, updated_at = ? WHERE id = ?",
+                (self.SUBMITTING, utc_now(), job_id)
+            )
+
+    def mark_running(self, job_id: int, scan_id: str):
+        """Record the Burp scan created for a claimed job"""
+        now = utc_now()
+        with self._transaction() as conn:
+            conn.execute("""
+                UPDATE scan_jobs SET status = ?, scan_id = ?, started_at = ?, updated_at = ?
+                WHERE id = ?
+            """, (self.RUNNING, str(scan_id), now, now, job_id))
+
+    def update_progress(self, job_id: int, issue_count: Optional[int], cursor_after: Optional[str]):
+        """Persist the issue cursor of a running job"""
+        with self._transaction() as conn:
+            conn.execute("""
+                UPDATE scan_jobs SET issue_count = ?, cursor_after = ?, updated_at = ?
+                WHERE id = ?
+            """, (issue_count, cursor_after, utc_now(), job_id))
+
+    def finish(self, job_id: int, status: str, reason: Optional[str] = None, issue_count: Optional[int] = None):
+        """Mark a job succeeded or failed"""
+        now = utc_now()
+        with self._transaction() as conn:
+            conn.execute("""
+                UPDATE scan_jobs
+                SET status = ?, reason = ?, issue_count = COALESCE(?, issue_count),
+                    finished_at = ?, updated_at = ?
+                WHERE id = ?
+            """, (status, reason, issue_count, now, now, job_id))
+
+    def recover(self, cycle: Optional[str] = None) -> List[Dict]:
+        """
+        Prepare this worker's jobs after a restart
+        Jobs claimed before a crash but never submitted go back to pending.
+        Jobs that crashed while their Burp scan was being created are
+        failed rather than retried, since Burp may already run that scan.
+        Args:
+            cycle: Only recover jobs of this cycle, all cycles if None
+        Returns:
+            List[Dict]: Jobs with a Burp scan still to monitor
+        """
+        where = "WHERE status = ? AND worker = ?"
+        params = (self.worker,)
+        if cycle is not None:
+            where += " AND cycle = ?"
+            params += (cycle,)
+        now = utc_now()
+        with self._transaction() as conn:
+            released = conn.execute(
+                f"UPDATE scan_jobs SET status = ?, worker = NULL, updated_at = ? {where}",
+                (self.PENDING, now, self.CLAIMED) + params
+            ).rowcount
+            interrupted = conn.execute(
+                f"UPDATE scan_jobs SET status = ?, reason = ?, finished_at = ?, updated_at = ? {where}",
+                (self.FAILED, "Interrupted while creating the Burp scan", now, now, self.SUBMITTING) + params
+            ).rowcount
+        if released:
+            logger.info(f"Released {released} claimed but unsubmitted jobs")
+        if interrupted:
+            logger.warning(f"{interrupted} jobs crashed while their Burp scan was created, check Burp for orphaned scans")
+        return self._select(f"{where} ORDER BY id", (self.RUNNING,) + params)
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        """Look up a single job"""
+        rows = self._select("WHERE id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    def jobs(self, status: Optional[str] = None, cycle: Optional[str] = None) -> List[Dict]:
+        """Jobs filtered by status and cycle"""
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if cycle is not None:
+            clauses.append("cycle = ?")
+            params.append(cycle)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        return self._select(f"{where}ORDER BY id", params)
+
+    def counts(self, cycle: Optional[str] = None) -> Dict[str, int]:
+        """Number of jobs per status"""
+        query = "SELECT status, COUNT(*) AS n FROM scan_jobs"
+        params = ()
+        if cycle is not None:
+            query += " WHERE cycle = ?"
+            params = (cycle,)
+        with self._lock:
+            rows = self._conn.execute(query + " GROUP BY status", params).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def close(self):
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _select(self, clause: str, params) -> List[Dict]:
+        """Fetch jobs as dicts, with the decoded URL list under urls"""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT * FROM scan_jobs {clause}", params).fetchall()
+        jobs = [dict(row) for row in rows]
+        for job in jobs:
+            job["urls"] = job["url"].split(self.BATCH_SEPARATOR)
+        return jobs
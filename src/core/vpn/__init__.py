@@ -1,6 +1,22 @@
 """
 VPN management modules
 """
-from .nordvpn import NordVPNRotator
+from ..._lazy import attach
 
-__all__ = ['NordVPNRotator']
\ No newline at end of file
+_EXPORTS = {
+    'NordVPNRotator': '.nordvpn',
+    'VPNBackend': '.backend',
+    'NordVPNCLI': '.backend',
+    'RotationService': '.rotation',
+    'Identity': '.rotation'
+}
+
+__getattr__, __dir__ = attach(__name__, _EXPORTS)
+
+__all__ = [
+    'NordVPNRotator',
+    'VPNBackend',
+    'NordVPNCLI',
+    'RotationService',
+    'Identity'
+]
\ No newline at end of file
@@ -0,0 +1,64 @@
+import abc
+import logging
+import subprocess
+from typing import List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class VPNBackend(abc.ABC):
+    """Interface to the VPN client that actually moves the exit IP"""
+
+    @abc.abstractmethod
+    def connect(self, location: str) -> bool:
+        """Connect to a server in a country, city or server group"""
+
+    @abc.abstractmethod
+    def disconnect(self) -> bool:
+        """Drop the current VPN connection"""
+
+    @abc.abstractmethod
+    def status(self) -> Optional[str]:
+        """Raw status output of the client, None if it cannot be read"""
+
+
+class NordVPNCLI(VPNBackend):
+    def __init__(self, binary: Sequence[str] = ("nordvpn",), timeout: float = 60):
+        """
+        Drive the ``nordvpn`` command line client
+        Args:
+            binary: Command prefix running the client, replaceable by a
+                stand-in script in tests
+            timeout: Seconds a single command may take
+        """
+        self.binary = [binary] if isinstance(binary, str) else list(binary)
+        self.timeout = timeout
+
+    def run(self, *args: str) -> Optional[str]:
+        """Run a client command and return its output, None on failure"""
+        cmd: List[str] = self.binary + list(args)
+        try:
+            result = subprocess.run(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=self.timeout,
+                check=True
+            )
+        except subprocess.CalledProcessError as e:
+            logger.error(f"{' '.join(cmd)} failed: {e.stderr.decode(errors='replace').strip()}")
+            return None
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.error(f"{' '.join(cmd)} failed: {e}")
+            return None
+        return result.stdout.decode(errors="replace").strip()
+
+    def connect(self, location: str) -> bool:
+        output = self.run("connect", location)
+        return bool(output) and "connected" in output.lower()
+
+    def disconnect(self) -> bool:
+        return self.run("disconnect") is not None
+
+    def status(self) -> Optional[str]:
+        return self.run("status")
@@ -1,11 +1,46 @@
-import subprocess
+import ipaddress
+import logging
 import random
 import time
-from fake_useragent import UserAgent
 from typing import Optional
 
+import requests
+
+from ..identity.user_agent import UserAgentManager
+from .backend import NordVPNCLI, VPNBackend
+
+logger = logging.getLogger(__name__)
+
 class NordVPNRotator:
-    def __init__(self):
+    # Plain text echo of the caller's address, checked natively instead of curl
+    IP_CHECK_URL = "https://ifconfig.me/ip"
+
+    def __init__(
+        self,
+        backend: Optional[VPNBackend] = None,
+        ip_check_url: str = IP_CHECK_URL,
+        ip_check_timeout: float = 5,
+        settle_timeout: float = 30,
+        poll_interval: float = 0.5,
+        user_agents: Optional[UserAgentManager] = None
+    ):
+        """
+        Rotate the exit IP through NordVPN together with the User-Agent
+        Args:
+            backend: VPN client driver, defaults to the nordvpn CLI
+            ip_check_url: URL answering with the caller's public IP
+            ip_check_timeout: Seconds allowed per IP check
+            settle_timeout: Seconds to wait for traffic to flow after connecting
+            poll_interval: Seconds between connectivity checks while settling
+            user_agents: User-Agent pool, defaults to the built-in one
+        """
+        self.backend = backend or NordVPNCLI()
+        self.ip_check_url = ip_check_url
+        self.ip_check_timeout = ip_check_timeout
+        self.settle_timeout = settle_timeout
+        self.poll_interval = poll_interval
+        self.session = requests.Session()
+
         # Thêm danh sách server Việt Nam
         self.vietnam_servers = [
             'vn', 'vn#1', 'vn#2', 'vn#3', 'vn#4',
@@ -17,7 +52,7 @@ class NordVPNRotator:
             'se', 'no', 'ca', 'jp', 'au'
         ]
         
-        self.ua = UserAgent()
+        self.ua = user_agents or UserAgentManager()
         self.vietnam_only = False  # Flag để chọn chỉ dùng server VN
 
     def set_vietnam_only(self, enabled: bool = True):
@@ -25,21 +60,6 @@ class NordVPNRotator:
         self.vietnam_only = enabled
         print(f"[*] Chế độ chỉ dùng server Việt Nam: {'Bật' if enabled else 'Tắt'}")
 
-    def run_command(self, cmd: list) -> Optional[str]:
-        """Chạy command shell và return output."""
-        try:
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                check=True
-            )
-            return result.stdout.decode().strip()
-        except subprocess.CalledProcessError as e:
-            print(f"Lỗi khi chạy lệnh {' '.join(cmd)}")
-            print(f"Error: {e.stderr.decode()}")
-            return None
-
     def connect_vpn(self, country: str = None) -> bool:
         """Kết nối tới server NordVPN."""
         if not country:
@@ -49,48 +69,61 @@ class NordVPNRotator:
             else:
                 country = random.choice(self.countries + self.vietnam_servers)
             
-        print(f"[*] Đang kết nối tới NordVPN server ở {country}...")
+        logger.info(f"Connecting to NordVPN server in {country}")
         
         # Ngắt kết nối hiện tại nếu có
-        self.run_command(['nordvpn', 'disconnect'])
+        self.backend.disconnect()
         
         # Kết nối tới server mới
-        result = self.run_command(['nordvpn', 'connect', country])
-        if result and "connected" in result.lower():
-            print(f"[+] Đã kết nối tới {country}")
+        if self.backend.connect(country):
+            logger.info(f"Connected to {country}")
             return True
         return False
 
     def get_current_ip(self) -> Optional[str]:
         """Lấy địa chỉ IP hiện tại."""
-        result = self.run_command(['curl', 'ifconfig.me'])
-        if result:
-            print(f"[+] IP hiện tại: {result}")
-            return result
-        return None
+        try:
+            response = self.session.get(self.ip_check_url, timeout=self.ip_check_timeout)
+            response.raise_for_status()
+            ip = str(ipaddress.ip_address(response.text.strip()))
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.debug(f"IP check against {self.ip_check_url} failed: {e}")
+            return None
+        return ip
+
+    def wait_for_ip(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Poll the IP check until traffic flows through the new tunnel
+        Args:
+            timeout: Seconds to keep polling, defaults to settle_timeout
+        Returns:
+            Optional[str]: Exit IP, None if nothing answered in time
+        """
+        deadline = time.monotonic() + (self.settle_timeout if timeout is None else timeout)
+        while True:
+            ip = self.get_current_ip()
+            if ip or time.monotonic() >= deadline:
+                return ip
+            time.sleep(self.poll_interval)
 
     def get_random_user_agent(self) -> str:
         """Lấy random User-Agent."""
-        user_agent = self.ua.random
-        print(f"[+] User-Agent: {user_agent}")
-        return user_agent
+        return self.ua.get_random()
 
-    def rotate_identity(self) -> tuple:
+    def rotate_identity(self, country: Optional[str] = None) -> tuple:
         """Đổi cả IP và User-Agent."""
-        print("\n[*] Đang tạo identity mới...")
-        
         # Đổi IP
-        country = random.choice(self.countries)
-        if not self.connect_vpn(country):
-            print("[!] Không thể kết nối VPN")
+        if not self.connect_vpn(country or random.choice(self.countries)):
+            logger.error("Could not connect to NordVPN")
             return None, None
             
-        # Đợi vài giây để kết nối ổn định
-        time.sleep(3)
-        
-        # Lấy IP mới và UA mới
-        new_ip = self.get_current_ip()
+        # Đợi tới khi kết nối thông thay vì sleep cố định
+        new_ip = self.wait_for_ip()
+        if not new_ip:
+            logger.error("No connectivity after connecting to NordVPN")
+            return None, None
         new_ua = self.get_random_user_agent()
+        logger.info(f"New identity {new_ip}")
         
         return new_ip, new_ua
 
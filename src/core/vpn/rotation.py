@@ -0,0 +1,223 @@
+import logging
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Identity(NamedTuple):
+    ip: str
+    user_agent: str
+    created_at: float
+    scans: int = 0
+
+
+class RotationService:
+    def __init__(
+        self,
+        rotator,
+        every_n_scans: Optional[int] = 10,
+        interval: Optional[float] = None,
+        wait_timeout: float = 120,
+        retry_delay: float = 10,
+        max_failures: Optional[int] = 3,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Rotate the VPN identity in the background
+        A worker thread connects the next identity while scans keep being
+        polled. Rotation is due after every_n_scans submissions or every
+        interval seconds, whichever comes first, instead of before each
+        target. Burp keeps sending a scan's traffic until it finishes, so a
+        due rotation first waits for every scan submitted through
+        before_submit to be reported by scan_finished; until the new
+        identity is up, ready() is False and ScanScheduler admits no new
+        targets but keeps polling. Scans the service never saw, e.g. ones
+        attached or resumed from an earlier run, are not waited for and
+        may see the tunnel drop while they run. After max_failures failed
+        rotations in a row, submissions are refused right away instead of
+        waiting, until a rotation succeeds again.
+        Args:
+            rotator: NordVPNRotator, or anything with rotate_identity()
+            every_n_scans: Submissions per identity, None to rotate on time only
+            interval: Seconds per identity, None to rotate on count only
+            wait_timeout: Seconds a submission waits for an identity
+            retry_delay: Seconds between attempts after a failed rotation
+            max_failures: Failed rotations in a row after which submissions
+                fail fast, None to always wait up to wait_timeout
+            clock: Monotonic time source, replaceable in tests
+        """
+        self.rotator = rotator
+        self.every_n_scans = every_n_scans
+        self.interval = interval
+        self.wait_timeout = wait_timeout
+        self.retry_delay = retry_delay
+        self.max_failures = max_failures
+        self.clock = clock
+
+        self.rotations = 0
+        self.failures = 0
+        # Failed rotations since the last identity came up
+        self.failed_in_a_row = 0
+        self._listeners: List[Callable[[Identity], None]] = []
+        self._identity: Optional[Identity] = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._wake = threading.Event()
+        self._in_flight = 0
+        self._drained = threading.Condition(self._lock)
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "RotationService":
+        """Start the worker, which connects the first identity right away"""
+        thread = self._thread
+        if thread is not None:
+            if not self._stopping:
+                return self
+            # A stopped worker may still be in a rotation attempt; two
+            # workers must never rotate at the same time
+            thread.join()
+        self._stopping = False
+        self._wake.set()
+        self._thread = threading.Thread(target=self._run, name="vpn-rotation", daemon=True)
+        self._thread.start()
+        return self
+
+    def subscribe(self, callback: Callable[[Identity], None]):
+        """Call back with every newly connected identity, from the worker thread"""
+        self._listeners.append(callback)
+
+    def current(self) -> Optional[Identity]:
+        """Identity in use, None while rotating"""
+        with self._lock:
+            return self._identity if self._ready.is_set() else None
+
+    def ready(self) -> bool:
+        """Whether a submission would be decided right away, ScanScheduler's can_submit hook"""
+        return self._ready.is_set() or self._failing()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> Optional[Identity]:
+        """Block until an identity is connected"""
+        self._ready.wait(self.wait_timeout if timeout is None else timeout)
+        return self.current()
+
+    def request_rotation(self):
+        """Retire the current identity, later submissions wait for the next one"""
+        with self._lock:
+            self._ready.clear()
+        self._wake.set()
+
+    def before_submit(self, url: str) -> bool:
+        """
+        ScanScheduler hook, counts a submission against the current identity
+        Only waits for an identity when ready() is False, which the
+        scheduler avoids while it has scans to poll.
+        Returns:
+            bool: False if no identity became ready within wait_timeout,
+                or right away while rotation keeps failing
+        """
+        if self._thread is None or self._stopping:
+            self.start()
+        if not self._ready.is_set() and self._failing():
+            logger.error(f"VPN rotation failed {self.failed_in_a_row} times in a row, skipping {url}")
+            return False
+        if not self._ready.wait(self.wait_timeout):
+            logger.error(f"No VPN identity ready for {url}")
+            return False
+        with self._lock:
+            identity = self._identity
+            if identity is None:
+                return False
+            identity = self._identity = identity._replace(scans=identity.scans + 1)
+            self._in_flight += 1
+        if self._due(identity):
+            self.request_rotation()
+        return True
+
+    def scan_finished(self, url: str):
+        """ScanScheduler hook, a scan admitted by before_submit has ended"""
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            if not self._in_flight:
+                self._drained.notify_all()
+
+    def stop(self, timeout: float = 10):
+        """Stop the worker, leaving the current connection up"""
+        self._stopping = True
+        self._wake.set()
+        with self._lock:
+            self._drained.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                # Kept, so start() waits for it instead of adding a second worker
+                logger.warning("VPN rotation worker is still busy, it exits after its current attempt")
+            else:
+                self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _failing(self) -> bool:
+        return bool(self.max_failures) and self.failed_in_a_row >= self.max_failures
+
+    def _due(self, identity: Identity) -> bool:
+        if self.every_n_scans and identity.scans >= self.every_n_scans:
+            return True
+        return bool(self.interval) and self.clock() - identity.created_at >= self.interval
+
+    def _run(self):
+        while not self._stopping:
+            timeout = None
+            if self.interval and self._ready.is_set():
+                with self._lock:
+                    age = self.clock() - self._identity.created_at
+                timeout = max(0.0, self.interval - age)
+            if not self._wake.wait(timeout):
+                # Interval elapsed without submissions
+                self.request_rotation()
+            self._wake.clear()
+            if self._stopping:
+                break
+            if self._ready.is_set():
+                continue
+            self._rotate()
+
+    def _rotate(self):
+        """Connect a new identity, retrying until it works or the service stops"""
+        with self._lock:
+            if self._in_flight:
+                logger.info(f"Rotating the VPN identity once {self._in_flight} running scans finish")
+            while self._in_flight and not self._stopping:
+                self._drained.wait()
+        while not self._stopping:
+            try:
+                ip, user_agent = self.rotator.rotate_identity()
+            except Exception as e:
+                logger.error(f"VPN rotation raised: {e}")
+                ip = user_agent = None
+            if ip:
+                identity = Identity(ip, user_agent, self.clock())
+                # Listeners reset state tied to the old exit before anything uses the new one
+                for callback in self._listeners:
+                    try:
+                        callback(identity)
+                    except Exception as e:
+                        logger.error(f"Identity listener failed: {e}")
+                with self._lock:
+                    self._identity = identity
+                    self.rotations += 1
+                    self.failed_in_a_row = 0
+                    self._ready.set()
+                logger.info(f"VPN identity {ip} ready")
+                return
+            self.failures += 1
+            self.failed_in_a_row += 1
+            logger.warning(f"VPN rotation failed, retrying in {self.retry_delay}s")
+            if self._wake.wait(self.retry_delay):
+                self._wake.clear()
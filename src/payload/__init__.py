@@ -2,12 +2,27 @@
 Configuration management
 """
 import json
+from functools import lru_cache
 from pathlib import Path
 
+CONFIG_DIR = Path(__file__).resolve().parent.parent / "config"
+
+# Module attributes parsed from CONFIG_DIR on first access
+_CONFIGS = {
+    'CHECKING_CONFIG': 'Checking.json',
+    'CRAWLING_CONFIG': 'Crawling.json'
+}
+
+@lru_cache(maxsize=None)
 def load_config(filename):
-    config_path = Path(__file__).parent / filename
+    config_path = CONFIG_DIR / filename
     with open(config_path) as f:
         return json.load(f)
 
-CHECKING_CONFIG = load_config('Checking.json')
-CRAWLING_CONFIG = load_config('Crawling.json')
\ No newline at end of file
+def __getattr__(name):
+    if name in _CONFIGS:
+        return load_config(_CONFIGS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_CONFIGS))
\ No newline at end of file
@@ -0,0 +1,108 @@
+import timeit
+
+from src.core.notification import formatting
+from src.core.notification.formatting import escape_markdown, format_issue_message, html_to_text
+
+DESCRIPTION = (
+    "<p>SQL injection vulnerabilities arise when user-controllable data is incorporated "
+    "into database SQL queries in an unsafe manner.</p><ul><li>The <b>id</b> parameter "
+    "appears to be vulnerable.</li><li>Payloads: <b>'</b> and <b>''</b> (e.g. 1=1).</li></ul>"
+    "<br>See https://portswigger.net/web-security/sql-injection &amp; CWE-89."
+)
+
+ISSUE = {
+    "id": "1337",
+    "name": "SQL injection (second-order)",
+    "severity": "high",
+    "confidence": "firm",
+    "origin": "https://shop.example.com",
+    "path": "/api/v1/items?id=1&sort=name-desc",
+    "description": DESCRIPTION,
+}
+
+
+def legacy_format_issue_message(issue):
+    """Previous TelegramNotifier.format_issue_message, kept as the baseline"""
+    def escape_markdown(text):
+        special_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
+        for char in special_chars:
+            text = text.replace(char, f"\\{char}")
+        return text
+
+    def truncate_text(text, max_length):
+        if len(text) <= max_length:
+            return text
+        return text[:max_length-3] + "..."
+
+    origin = issue.get('origin', '')
+    path = issue.get('path', '')
+    full_url = f"{origin}{path}" if origin and path else "N/A"
+    message = "*💣💣 New Security Issue Found 💣💣*\n\n"
+    message += f"*Issue ID*: `{issue.get('id', 'N/A')}`\n"
+    message += f"*Name*: `{escape_markdown(issue.get('name', 'N/A'))}`\n"
+    message += f"*Severity*: `{issue.get('severity', 'N/A')}`\n"
+    message += f"*Confidence*: `{issue.get('confidence', 'N/A')}`\n"
+    message += f"*URL*: `{escape_markdown(full_url)}`\n"
+    if "description" in issue:
+        desc = issue["description"]
+        desc = desc.replace("<b>", "").replace("</b>", "")
+        desc = desc.replace("<br>", "\n")
+        desc = desc.replace("<ul>", "\n").replace("</ul>", "")
+        desc = desc.replace("<li>", "• ").replace("</li>", "\n")
+        desc = truncate_text(desc, 500)
+        message += f"\n*Description*:\n{escape_markdown(desc)}\n"
+    return message
+
+
+def test_escape_matches_legacy_escaping():
+    text = "a_b*c[d]e(f)g~h`i>j#k+l-m=n|o{p}q.r!s\\t"
+    expected = text
+    for char in formatting.MARKDOWN_SPECIAL_CHARS:
+        expected = expected.replace(char, f"\\{char}")
+    assert escape_markdown(text) == expected
+
+def test_html_to_text():
+    assert html_to_text("plain text") == "plain text"
+    assert html_to_text("<b>bold</b> &amp; <i>more</i><br>next") == "bold & more\nnext"
+    assert html_to_text("<ul><li>one</li><li>two</li></ul>") == "\n• one\n• two\n"
+
+def test_matches_legacy_output_for_simple_markup():
+    issue = dict(ISSUE, description="<b>Bold</b> text<br><ul><li>first</li><li>second</li></ul>")
+    assert format_issue_message(issue) == legacy_format_issue_message(issue)
+    issue.pop("description")
+    assert format_issue_message(issue) == legacy_format_issue_message(issue)
+
+def test_escape_strategies_agree():
+    text = html_to_text(DESCRIPTION)
+    table, pattern = escape_alternatives()
+    assert text.translate(table) == pattern.sub(r"\\\g<0>", text) == escape_markdown(text)
+
+def escape_alternatives():
+    """str.translate() table and regex equivalent to escape_markdown"""
+    import re
+    table = str.maketrans({char: f"\\{char}" for char in formatting.MARKDOWN_SPECIAL_CHARS})
+    pattern = re.compile(f"[{re.escape(formatting.MARKDOWN_SPECIAL_CHARS)}]")
+    return table, pattern
+
+def bench_formatting_vs_legacy():
+    issues = [dict(ISSUE, id=str(i), path=f"/api/v1/items/{i}") for i in range(200)]
+    legacy = min(timeit.repeat(lambda: [legacy_format_issue_message(i) for i in issues], number=5, repeat=5))
+    current = min(timeit.repeat(lambda: [format_issue_message(i) for i in issues], number=5, repeat=5))
+    print(f"format_issue_message: legacy {legacy * 1000:.2f}ms, current {current * 1000:.2f}ms, {legacy / current:.1f}x")
+
+def bench_escape_strategies():
+    """Keeps the str.replace() choice in formatting.escape_markdown honest"""
+    text = html_to_text(DESCRIPTION)
+    table, pattern = escape_alternatives()
+    timings = {
+        "replace": min(timeit.repeat(lambda: escape_markdown(text), number=2000, repeat=5)),
+        "translate": min(timeit.repeat(lambda: text.translate(table), number=2000, repeat=5)),
+        "re.sub": min(timeit.repeat(lambda: pattern.sub(r"\\\g<0>", text), number=2000, repeat=5)),
+    }
+    print("escape_markdown: " + ", ".join(f"{name} {t * 1000:.2f}ms" for name, t in timings.items()))
+
+
+if __name__ == "__main__":
+    # Timings depend on the machine, so they are printed rather than asserted
+    bench_formatting_vs_legacy()
+    bench_escape_strategies()
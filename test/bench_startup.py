@@ -0,0 +1,73 @@
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Heavy dependencies a storage or report command must not pay for
+HEAVY_MODULES = ["requests", "urllib3", "tqdm", "dotenv", "fake_useragent", "asyncio", "ssl"]
+
+# Budget for importing the package on top of bare interpreter startup;
+# eager imports of every subsystem took about 200 ms
+IMPORT_BUDGET = 0.1
+
+
+def run_python(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, check=True,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    return result.stdout.decode()
+
+def best_of(code: str, runs: int = 5) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        run_python(code)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def test_package_import_loads_no_subsystems():
+    loaded = json.loads(run_python(
+        "import json, sys\n"
+        "import src, src.core, src.payload, src.core.storage\n"
+        "print(json.dumps(sorted(sys.modules)))"
+    ))
+    assert not [name for name in HEAVY_MODULES if name in loaded]
+    assert not [name for name in loaded if name.startswith(("src.core.scanner", "src.core.vpn", "src.core.chaos"))]
+
+def test_public_names_resolve_on_first_access():
+    output = run_python(
+        "import sys, src\n"
+        "assert 'src.core.scanner.scanner' not in sys.modules\n"
+        "from src.core.scanner.scanner import Scanner\n"
+        "assert src.Scanner is Scanner and src.core.Scanner is Scanner\n"
+        "from src.core import *\n"
+        "import src.core.vpn as vpn\n"
+        "assert 'RotationService' in dir(vpn)\n"
+        "print(NordVPNRotator.__module__)"
+    )
+    assert output.strip() == "src.core.vpn.nordvpn"
+
+def test_unknown_names_raise_attribute_error():
+    import src.core
+    with pytest.raises(AttributeError):
+        src.core.ProtonVPNManager
+
+def test_payload_configs_parse_on_first_access():
+    output = run_python(
+        "import src.payload as payload\n"
+        "print(payload.load_config.cache_info().currsize)\n"
+        "print(sorted(payload.CHECKING_CONFIG) == sorted(payload.load_config('Checking.json')))\n"
+        "print(payload.load_config.cache_info().currsize)"
+    )
+    assert output.split() == ["0", "True", "1"]
+
+def test_import_startup_budget():
+    baseline = best_of("pass")
+    startup = best_of("import src, src.payload, src.core.storage")
+    assert startup - baseline < IMPORT_BUDGET, f"{(startup - baseline) * 1000:.0f} ms over interpreter startup"
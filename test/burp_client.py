@@ -0,0 +1,65 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.core.scanner.burp_client import BurpClient
+
+
+class FakeBurpHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(201)
+        self.send_header("Location", "/scan/42")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        scan_id = self.path.split("?")[0].split("/")[-1]
+        body = json.dumps({"task_id": scan_id, "scan_status": "running"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def burp():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBurpHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = BurpClient(f"http://127.0.0.1:{server.server_port}", timeout=(2, 2))
+    yield client
+    client.close()
+    server.shutdown()
+
+def test_create_scan(burp):
+    response = burp.create_scan({"urls": ["https://example.com"]})
+    assert response.status_code == 201
+    assert response.headers["Location"].endswith("/42")
+
+def test_get_scans_polls_concurrently(burp):
+    responses = burp.get_scans([str(i) for i in range(50)])
+    assert len(responses) == 50
+    assert all(r.json()["task_id"] == scan_id for scan_id, r in responses.items())
+
+def test_get_scans_returns_errors_per_scan():
+    client = BurpClient("http://127.0.0.1:9", timeout=(0.2, 0.2), retries=0)
+    responses = client.get_scans(["1"])
+    assert isinstance(responses["1"], Exception)
+
+def test_get_scans_reuses_threads_inside_running_loop(burp):
+    burp.get_scans(["1", "2"])
+    threads = threading.active_count()
+
+    async def poll():
+        return burp.get_scans(["3"])
+
+    assert asyncio.run(poll())["3"].json()["task_id"] == "3"
+    assert threading.active_count() == threads
@@ -0,0 +1,122 @@
+import itertools
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from src.core.scanner.burp_client import BurpClient
+from src.core.scanner.burp_pool import BurpPool
+from src.core.scanner.scanner import Scanner
+
+DEAD_URL = "http://127.0.0.1:9"
+
+
+class CountingBurpHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(201)
+        self.send_header("Location", f"/scan/{next(self.server.task_ids)}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        task_id = self.path.split("?")[0].rstrip("/").split("/")[-1]
+        body = json.dumps({"task_id": task_id, "port": self.server.server_port, "scan_status": "running"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def client(url):
+    return BurpClient(url, timeout=(0.5, 2), retries=0)
+
+@pytest.fixture
+def burps():
+    servers = []
+    for _ in range(2):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), CountingBurpHandler)
+        server.task_ids = itertools.count(1)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    yield [f"http://127.0.0.1:{server.server_port}" for server in servers], servers
+    for server in servers:
+        server.shutdown()
+
+def create(pool):
+    return pool.scan_id_from(pool.create_scan({"urls": ["https://example.com"]}))
+
+def test_scans_go_to_least_loaded_instance(burps):
+    urls, _ = burps
+    pool = BurpPool(urls, client_factory=client)
+    assert [create(pool) for _ in range(4)] == ["0-1", "1-1", "0-2", "1-2"]
+
+    pool.release("0-1")
+    pool.release("0-2")
+    assert create(pool) == "0-3"
+    assert [s["tasks"] for s in pool.status()] == [1, 2]
+
+def test_max_tasks_per_instance(burps):
+    urls, _ = burps
+    pool = BurpPool(urls[:1], max_tasks=1, client_factory=client)
+    assert create(pool) == "0-1"
+    with pytest.raises(requests.exceptions.ConnectionError):
+        pool.create_scan({"urls": ["https://example.com"]})
+
+def test_polls_are_routed_to_owning_instance(burps):
+    urls, servers = burps
+    pool = BurpPool(urls, client_factory=client)
+    responses = pool.get_scans(["0-7", "1-9", "3", "2-5"])
+    assert responses["0-7"].json() == {"task_id": "7", "port": servers[0].server_port, "scan_status": "running"}
+    assert responses["1-9"].json()["port"] == servers[1].server_port
+    # IDs that name no instance are never sent to an arbitrary one
+    assert isinstance(responses["3"], ValueError)
+    assert isinstance(responses["2-5"], ValueError)
+
+def test_failover_when_instance_is_down(burps):
+    urls, _ = burps
+    now = [0.0]
+    pool = BurpPool([DEAD_URL, urls[0]], failure_threshold=2, cooldown=30, client_factory=client, clock=lambda: now[0])
+    assert create(pool) == "1-1"
+    assert create(pool) == "1-2"
+    dead, alive = pool.status()
+    assert not dead["healthy"] and alive["healthy"]
+
+    # Skipped while cooling down, health checked again afterwards
+    assert create(pool) == "1-3"
+    now[0] = 31
+    assert create(pool) == "1-4"
+    assert not pool.status()[0]["healthy"]
+
+def test_scanner_builds_pool_from_comma_separated_urls(burps):
+    urls, _ = burps
+    scanner = Scanner(",".join(urls))
+    assert isinstance(scanner.client, BurpPool)
+    assert scanner.create_scan(["https://example.com"], ["Checking"]) == "0-1"
+    assert isinstance(Scanner(urls[0]).client, BurpClient)
+
+def test_finished_scans_release_their_instance(burps):
+    urls, _ = burps
+    scanner = Scanner(",".join(urls))
+    scan_id = scanner.create_scan(["https://example.com"], ["Checking"])
+    assert [s["tasks"] for s in scanner.client.status()] == [1, 0]
+    # Also on paths that never saw a final Burp status, e.g. a pause timeout
+    scanner.forget_scan(scan_id)
+    assert [s["tasks"] for s in scanner.client.status()] == [0, 0]
+
+def test_pool_shares_one_lazily_started_executor(burps):
+    urls, _ = burps
+    pool = BurpPool(urls, client_factory=client)
+    assert pool._executor is None
+    scan_ids = [create(pool) for _ in range(2)]
+    assert set(pool.get_scans(scan_ids)) == set(scan_ids)
+    assert pool._executor is not None
+    # Polls of every instance ran on the pool's threads, not the clients'
+    assert all(endpoint.client._executor is None for endpoint in pool.endpoints)
+    pool.close()
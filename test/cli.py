@@ -0,0 +1,171 @@
+import io
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.cli import DaemonClient, DaemonError, DaemonServer, Runtime, main
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"<title>up</title>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class BurpHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        issue = {"serial_number": "1", "name": "SQL injection", "severity": "high", "path": "/login"}
+        body = json.dumps({
+            "scan_status": "succeeded",
+            "issue_events": [{"id": "1", "type": "issue_found", "issue": issue}]
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+@pytest.fixture
+def daemon(tmp_path):
+    runtime = Runtime(tmp_path, events_file=str(tmp_path / "events.jsonl"))
+    server = DaemonServer(runtime, tmp_path / "d.sock")
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    yield server
+    if thread.is_alive():
+        DaemonClient(server.path).call("shutdown")
+        thread.join(5)
+
+def test_report_runs_locally(tmp_path, capsys):
+    assert main(["--base-dir", str(tmp_path), "report"]) == 0
+    assert json.loads(capsys.readouterr().out) == {"cycle": None, "counts": {}, "jobs": []}
+
+def test_probe_reads_targets_from_stdin(tmp_path, capsys, monkeypatch, site):
+    monkeypatch.setattr("sys.stdin", io.StringIO(f"{site}\n\nhttp://localhost:9\n"))
+    assert main(["--base-dir", str(tmp_path), "probe", "--timeout", "2"]) == 0
+    assert capsys.readouterr().out.splitlines() == [site]
+
+def test_scan_without_burp_fails_cleanly(tmp_path, capsys, monkeypatch):
+    monkeypatch.delenv("BURP_API_URL", raising=False)
+    assert main(["--base-dir", str(tmp_path), "scan", "--no-probe", "https://a.example.com"]) == 1
+    assert "Burp API URL" in capsys.readouterr().err
+
+def test_daemon_reuses_components_across_jobs(daemon, site):
+    client = DaemonClient(daemon.path)
+    assert client.alive()
+    assert client.call("probe", {"targets": [site], "timeout": 2}) == [site]
+    store = daemon.runtime.store
+    # Second job answers from the stored probe of the same warm store
+    assert client.call("probe", {"targets": [site]}) == [site]
+    assert daemon.runtime.store is store
+    assert client.call("ping")["jobs"] == 2
+
+def test_commands_go_through_running_daemon(tmp_path, daemon, capsys):
+    args = ["--base-dir", str(tmp_path), "--socket", str(daemon.path)]
+    assert main(args + ["notify", "hello", "--level", "warning"]) == 0
+    capsys.readouterr()
+    event = json.loads((tmp_path / "events.jsonl").read_text())
+    assert event["kind"] == "alert" and event["payload"] == {"message": "hello", "level": "warning"}
+
+    assert main(args + ["report"]) == 0
+    assert json.loads(capsys.readouterr().out)["jobs"] == []
+    # Both commands ran inside the daemon, not in this process
+    assert DaemonClient(daemon.path).call("ping")["jobs"] == 2
+
+def test_daemon_reports_job_errors(daemon):
+    with pytest.raises(DaemonError, match="Unknown command"):
+        DaemonClient(daemon.path).call("format-disk")
+    with pytest.raises(DaemonError, match="TypeError"):
+        DaemonClient(daemon.path).call("probe", {"hosts": ["a.example.com"]})
+    # The daemon keeps serving after failed jobs
+    assert DaemonClient(daemon.path).alive()
+
+def test_single_daemon_per_socket_and_cleanup(tmp_path, daemon):
+    with pytest.raises(DaemonError, match="already listening"):
+        DaemonServer(Runtime(tmp_path), daemon.path)
+    assert oct(daemon.path.stat().st_mode & 0o777) == "0o600"
+    DaemonClient(daemon.path).call("shutdown")
+    threading.Event().wait(0.5)
+    assert not daemon.path.exists()
+    assert not DaemonClient(daemon.path).alive()
+
+def test_stale_socket_is_replaced(tmp_path):
+    path = tmp_path / "stale.sock"
+    # A socket file left behind by a daemon that did not clean up
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+    server = DaemonServer(Runtime(tmp_path), path)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    assert DaemonClient(path).alive()
+    DaemonClient(path).call("shutdown")
+    thread.join(5)
+
+def test_socket_path_that_is_not_a_socket_is_kept(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("keep me")
+    with pytest.raises(DaemonError, match="not a socket"):
+        DaemonServer(Runtime(tmp_path), path)
+    assert path.read_text() == "keep me"
+
+def test_client_only_flags_are_rejected_with_a_daemon(tmp_path, daemon, capsys):
+    args = ["--base-dir", str(tmp_path), "--socket", str(daemon.path)]
+    assert main(args + ["--webhook", "http://127.0.0.1:9/hook", "notify", "hello"]) == 1
+    assert "--webhook" in capsys.readouterr().err
+    assert not (tmp_path / "events.jsonl").exists()
+    assert DaemonClient(daemon.path).call("ping")["jobs"] == 0
+
+def test_exclusive_commands_run_one_at_a_time(tmp_path):
+    runtime = Runtime(tmp_path)
+    running, peak = [], []
+    def discover(**kwargs):
+        running.append(1)
+        peak.append(len(running))
+        threading.Event().wait(0.1)
+        running.pop()
+        return []
+    runtime.discover = discover
+    threads = [threading.Thread(target=runtime.run, args=("discover", {})) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert max(peak) == 1
+
+def test_report_renders_succeeded_scans(tmp_path, capsys):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BurpHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with Runtime(tmp_path).jobs as jobs:
+        jobs.enqueue(["https://a.example.com", "https://b.example.com"], cycle="c1")
+        done, failed = jobs.claim(2, cycle="c1")
+        jobs.mark_running(done["id"], "7")
+        jobs.finish(done["id"], "succeeded", issue_count=1)
+        jobs.finish(failed["id"], "failed", "Scan creation failed")
+
+    args = ["--base-dir", str(tmp_path), "--burp-api-url", f"http://127.0.0.1:{server.server_port}", "--local"]
+    try:
+        assert main(args + ["report", "--cycle", "c1", "--render", "--output-dir", str(tmp_path / "out")]) == 0
+    finally:
+        server.shutdown()
+    reports = json.loads(capsys.readouterr().out)["reports"]
+    assert list(reports) == ["7"]
+    assert "SQL injection" in open(reports["7"]["markdown"]).read()
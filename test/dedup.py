@@ -0,0 +1,29 @@
+import pytest
+from src.core.chaos.dedup import ExternalSortedSet
+
+
+@pytest.fixture
+def tiny_set(tmp_path):
+    # A budget this small forces a spilled run every couple of items
+    with ExternalSortedSet(memory_budget=250, tmp_dir=tmp_path) as domains:
+        yield domains
+
+def test_sorted_unique_across_runs(tiny_set):
+    tiny_set.update(["c.com", "a.com", "b.com", "a.com", "d.com", "c.com", "b.com"])
+    assert len(tiny_set._runs) > 1
+    assert list(tiny_set) == ["a.com", "b.com", "c.com", "d.com"]
+
+def test_write_is_atomic_and_counts(tiny_set, tmp_path):
+    tiny_set.update(["b.com", "a.com", "b.com"])
+    output = tmp_path / "chaos_domains.txt"
+    assert tiny_set.write(output) == 2
+    assert output.read_text() == "a.com\nb.com\n"
+    assert not (tmp_path / "chaos_domains.txt.tmp").exists()
+
+def test_close_removes_runs(tmp_path):
+    domains = ExternalSortedSet(memory_budget=1, tmp_dir=tmp_path)
+    domains.update(["a.com", "b.com"])
+    runs = list(domains._runs)
+    domains.close()
+    assert runs and not any(tmp_path.joinpath(run).exists() for run in runs)
+    assert not domains
@@ -0,0 +1,122 @@
+import json
+import threading
+
+import pytest
+from src.core.notification.delivery_queue import TelegramDeliveryQueue, TokenBucket
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.text = json.dumps(body or {})
+        self._body = body or {}
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    """Records sendMessage payloads, answering with the queued status codes"""
+    def __init__(self, responses=()):
+        self.responses = list(responses)
+        self.payloads = []
+        self.sent = threading.Event()
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def post(self, url, json=None, timeout=None):
+        self.payloads.append(json)
+        self.sent.set()
+        if self.responses:
+            return self.responses.pop(0)
+        return FakeResponse(200, {"ok": True})
+
+
+def test_token_bucket_limits_bursts():
+    now = [0.0]
+    bucket = TokenBucket(rate=1, capacity=2, clock=lambda: now[0])
+    bucket.take()
+    bucket.take()
+    assert bucket.wait_time() == pytest.approx(1)
+    now[0] = 0.5
+    assert bucket.wait_time() == pytest.approx(0.5)
+    now[0] = 5
+    assert bucket.wait_time() == 0
+
+def test_messages_coalesced_and_flushed_on_close():
+    session = FakeSession()
+    queue = TelegramDeliveryQueue("token", "42", rate=1, burst=1, session=session)
+    # Hold the worker until all messages are queued
+    with queue._cond:
+        for i in range(5):
+            queue.enqueue(f"issue {i}")
+    queue.close(timeout=5)
+
+    texts = [payload["text"] for payload in session.payloads]
+    assert "\n\n".join(texts) == "\n\n".join(f"issue {i}" for i in range(5))
+    assert all(len(text) <= TelegramDeliveryQueue.MAX_MESSAGE_LENGTH for text in texts)
+    assert len(texts) <= 2
+    assert queue.sent == 5 and queue.pending() == 0
+
+def test_batches_respect_telegram_limit():
+    session = FakeSession()
+    queue = TelegramDeliveryQueue("token", "42", rate=1000, burst=100, session=session)
+    with queue._cond:
+        for _ in range(3):
+            queue.enqueue("x" * 3000)
+        queue.enqueue("y" * 5000)
+    queue.close(timeout=5)
+
+    assert [len(p["text"]) for p in session.payloads] == [3000, 3000, 3000, 4096]
+
+def test_retry_after_is_honored():
+    session = FakeSession([FakeResponse(429, {"ok": False, "parameters": {"retry_after": 0.2}})])
+    queue = TelegramDeliveryQueue("token", "42", session=session)
+    queue.enqueue("alert")
+    queue.close(timeout=5)
+
+    assert [p["text"] for p in session.payloads] == ["alert", "alert"]
+    assert queue.sent == 1
+
+def test_enqueue_does_not_block_on_slow_delivery():
+    release = threading.Event()
+    session = FakeSession()
+    post = session.post
+    session.post = lambda *a, **kw: (release.wait(5), post(*a, **kw))[1]
+    queue = TelegramDeliveryQueue("token", "42", session=session)
+    queue.enqueue("first")
+    queue.enqueue("second")
+    assert not session.payloads
+    release.set()
+    queue.close(timeout=5)
+    assert queue.sent == 2
+
+def test_rejected_batch_is_resent_one_by_one():
+    session = FakeSession([FakeResponse(400, {"ok": False}), FakeResponse(200), FakeResponse(400, {"ok": False})])
+    queue = TelegramDeliveryQueue("token", "42", rate=1000, burst=100, session=session)
+    with queue._cond:
+        for i in range(3):
+            queue.enqueue(f"issue {i}")
+    queue.close(timeout=5)
+
+    assert [p["text"] for p in session.payloads] == ["issue 0\n\nissue 1\n\nissue 2", "issue 0", "issue 1", "issue 2"]
+    assert queue.sent == 2 and queue.dropped == 1
+
+def test_client_errors_are_not_retried():
+    session = FakeSession([FakeResponse(403, {"ok": False})])
+    queue = TelegramDeliveryQueue("token", "42", session=session)
+    queue.enqueue("alert")
+    queue.close(timeout=5)
+
+    assert len(session.payloads) == 1
+    assert queue.dropped == 1 and queue.pending() == 0
+
+def test_flush_waits_until_messages_are_sent():
+    session = FakeSession([FakeResponse(429, {"parameters": {"retry_after": 0.2}})])
+    queue = TelegramDeliveryQueue("token", "42", session=session)
+    queue.enqueue("issue 1")
+    assert queue.flush(timeout=5)
+    # Returned only after the rate limited send was retried
+    assert queue.sent == 1 and len(session.payloads) == 2
+    queue.close()
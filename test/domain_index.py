@@ -0,0 +1,44 @@
+import json
+import pytest
+from src.core.scanner.domain_index import DomainProgramIndex
+
+
+@pytest.fixture
+def index():
+    return DomainProgramIndex.from_entries([
+        {"domain": "example.com", "program": "example"},
+        {"domain": "*.corp.example.com", "program": "example-corp"},
+        {"domain": "4chan.org", "program": "4chan"},
+        {"domain": "4chan.org", "program": "duplicate"},
+    ])
+
+def test_index_size(index):
+    assert len(index) == 3
+
+def test_lookup_exact_and_subdomain(index):
+    assert index.lookup("example.com") == "example"
+    assert index.lookup("api.example.com") == "example"
+    assert index.lookup("API.Example.COM.") == "example"
+
+def test_lookup_longest_suffix_wins(index):
+    assert index.lookup("vpn.corp.example.com") == "example-corp"
+
+def test_lookup_respects_label_boundaries(index):
+    assert index.lookup("notexample.com") is None
+    assert index.lookup("example.com.evil.net") is None
+    assert "com" not in index
+
+def test_empty_labels_do_not_break_the_trie(index):
+    assert index.lookup("a..example.com") == "example"
+    assert index.add("b..example.com", "other")
+    assert index.lookup("b..example.com") == "other"
+    assert index.lookup("example.com") == "example"
+
+def test_first_registration_wins(index):
+    assert index.lookup("boards.4chan.org") == "4chan"
+
+def test_from_file(tmp_path):
+    path = tmp_path / "tagged_domains.json"
+    path.write_text(json.dumps([{"domain": "8x8.com", "program": "8x8"}]))
+    index = DomainProgramIndex.from_file(path)
+    assert index.lookup("www.8x8.com") == "8x8"
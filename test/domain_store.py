@@ -0,0 +1,52 @@
+import pytest
+from src.core.storage.domain_store import DomainStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    with DomainStore(tmp_path / "domains.db", batch_size=2) as store:
+        yield store
+
+def test_bulk_insert_and_point_query(store):
+    assert store.add_domains(["b.4chan.org", "a.4chan.org", "cdn.4cdn.org"], program="4chan", source="chaos") == 3
+    store.add_domains(["orphan.example.net"], source="chaos")
+
+    assert store.domains_for_program("4chan") == ["a.4chan.org", "b.4chan.org", "cdn.4cdn.org"]
+    assert store.count() == 4
+    assert store.count("4chan") == 3
+    assert list(store.iter_domains(in_scope=True)) == ["a.4chan.org", "b.4chan.org", "cdn.4cdn.org"]
+
+def test_reinsert_keeps_first_seen_and_program(store):
+    store.add_domains(["a.4chan.org"], program="4chan", source="chaos")
+    first = store.get("a.4chan.org")
+    store.add_domains(["a.4chan.org"])
+    again = store.get("a.4chan.org")
+
+    assert again["program"] == "4chan"
+    assert again["first_seen"] == first["first_seen"]
+    assert again["last_seen"] >= first["last_seen"]
+
+def test_chaos_listing_name_is_not_an_attribution(store):
+    store.add_domains(["a.4chan.org", "cdn.example.net"], source="chaos", source_program="4chan")
+    assert list(store.iter_domains(in_scope=True)) == []
+    assert store.get("cdn.example.net")["source_program"] == "4chan"
+
+    store.assign_programs([("a.4chan.org", "4chan")])
+    assert list(store.iter_domains(in_scope=True)) == ["a.4chan.org"]
+
+def test_assign_programs_skips_unmapped(store):
+    store.add_domains(["a.8x8.com", "unknown.net"])
+    store.assign_programs([("a.8x8.com", "8x8"), ("unknown.net", None)])
+    assert store.programs() == ["8x8"]
+    assert store.get("unknown.net")["program"] is None
+
+def test_replace_tags(store):
+    store.replace_tags([{"domain": "old.com", "program": "old"}])
+    store.replace_tags([{"domain": "4chan.org", "program": "4chan"}])
+    assert list(store.tagged_entries()) == [{"domain": "4chan.org", "program": "4chan"}]
+
+def test_failed_replace_tags_keeps_previous_tags(store):
+    store.replace_tags([{"domain": "4chan.org", "program": "4chan"}])
+    with pytest.raises(KeyError):
+        store.replace_tags([{"domain": "8x8.com", "program": "8x8"}, {"domain": "broken.com"}])
+    assert list(store.tagged_entries()) == [{"domain": "4chan.org", "program": "4chan"}]
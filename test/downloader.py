@@ -0,0 +1,69 @@
+import pytest
+from src.core.chaos.downloader import ProgramDownloader
+
+
+PROGRAMS = [
+    {"name": "Alpha", "URL": "https://chaos.test/alpha.zip"},
+    {"name": "Beta", "URL": "https://chaos.test/beta.zip"},
+    {"name": "Gamma", "URL": "https://chaos.test/gamma.zip"},
+]
+
+@pytest.fixture
+def downloader():
+    return ProgramDownloader(workers=3, per_host=2, retries=2, backoff=0)
+
+def test_download_reports_every_program(downloader):
+    results = list(downloader.download(PROGRAMS, lambda url: {url.split("/")[-1]}))
+    assert sorted(r.slug for r in results) == ["alpha", "beta", "gamma"]
+    assert all(r.error is None for r in results)
+
+def test_download_retries_transient_errors(downloader):
+    attempts = {}
+
+    def flaky(url):
+        attempts[url] = attempts.get(url, 0) + 1
+        if attempts[url] < 3:
+            raise IOError("connection reset")
+        return {"a.example.com"}
+
+    results = list(downloader.download(PROGRAMS[:1], flaky))
+    assert results[0].domains == {"a.example.com"}
+    assert attempts[PROGRAMS[0]["URL"]] == 3
+
+def test_download_gives_up_after_retries(downloader):
+    def broken(url):
+        raise IOError("gone")
+
+    results = list(downloader.download(PROGRAMS[:1], broken))
+    assert results[0].error == "gone"
+    assert results[0].domains == set()
+
+def test_download_bounds_unconsumed_results():
+    downloader = ProgramDownloader(workers=2, retries=0)
+    programs = [{"name": str(i), "URL": f"https://chaos.test/p{i}.zip"} for i in range(40)]
+    started = []
+
+    def fetch(url):
+        started.append(url)
+        return {url}
+
+    results = downloader.download(programs, fetch)
+    next(results)
+    # The consumer has not moved on, so at most workers * 2 programs ran
+    assert len(started) <= 4
+    assert len(list(results)) == 39
+
+def test_archive_domains_streams_and_closes(tmp_path):
+    import io
+    import zipfile
+    from src.core.chaos.downloader import ArchiveDomains
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as z:
+        z.writestr("alpha.txt", "A.example.com\n\nb.example.com\n")
+        z.writestr("README.md", "not-a-domain\n")
+    buffer.seek(0)
+
+    domains = ArchiveDomains(buffer)
+    assert list(domains) == ["a.example.com", "b.example.com"]
+    assert buffer.closed
@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+
+import pytest
+from src.core.scanner.report import ReportWriter
+from src.core.storage import IssueFingerprintStore
+
+
+def issue(path="/login", type_index=1049088, detail="param q", origin="https://example.com"):
+    return {
+        "name": "SQL injection",
+        "type_index": type_index,
+        "severity": "high",
+        "origin": origin,
+        "path": path,
+        "evidence": [{"type": "InformationListEvidence", "detail": detail, "request_response": {"request": "x"}}],
+    }
+
+@pytest.fixture
+def store(tmp_path):
+    with IssueFingerprintStore.open_in(tmp_path) as store:
+        yield store
+
+def test_fingerprint_ignores_scan_specific_fields():
+    a = issue(path="/login?session=1")
+    b = issue(path="/login?session=2", origin="https://EXAMPLE.com")
+    b["serial_number"] = 99
+    b["evidence"][0]["request_response"] = {"request": "y"}
+    assert IssueFingerprintStore.fingerprint(a)["fingerprint"] == IssueFingerprintStore.fingerprint(b)["fingerprint"]
+    assert IssueFingerprintStore.fingerprint(a) != IssueFingerprintStore.fingerprint(issue(detail="param id"))
+
+def test_record_is_new_only_in_first_scan(store):
+    assert store.record(issue(), "1")
+    assert store.record(issue(), "1")
+    assert not store.record(issue(), "2")
+    assert store.record(issue(path="/admin"), "2")
+    assert store.is_known(issue())
+    assert not store.is_known(issue(path="/other"))
+
+def test_diff_and_persistence(tmp_path):
+    with IssueFingerprintStore.open_in(tmp_path) as store:
+        store.record(issue(), "1")
+    with IssueFingerprintStore.open_in(tmp_path) as store:
+        events = [{"issue": issue()}, {"issue": issue(path="/admin")}]
+        assert [e["issue"]["path"] for e in store.filter_new(events, "2")] == ["/admin"]
+        view = store.diff("2")
+    assert [row["path"] for row in view["new"]] == ["/admin"]
+    assert [row["path"] for row in view["recurring"]] == ["/login"]
+
+def test_report_marks_new_issues(store, tmp_path):
+    store.record(issue(), "1")
+    writer = ReportWriter("2", tmp_path, fingerprints=store)
+    writer.add_events([{"issue": issue()}, {"issue": issue(path="/admin")}])
+    md_path, json_path = writer.write("succeeded")
+
+    report = json.loads(Path(json_path).read_text())
+    assert report["summary"]["new_issues"] == 1
+    assert len(report["vulnerabilities"]["high"]) == 2
+    assert "New Since Last Scan**: 1" in Path(md_path).read_text()
+
+    writer = ReportWriter("3", tmp_path, fingerprints=store, only_new=True)
+    writer.add_events([{"issue": issue()}, {"issue": issue(path="/new")}])
+    _, json_path = writer.write("succeeded")
+    high = json.loads(Path(json_path).read_text())["vulnerabilities"]["high"]
+    assert [e["issue"]["path"] for e in high] == ["/new"]
@@ -0,0 +1,81 @@
+import pytest
+from src.core.scanner.issue_cursor import IssueEventCursor
+from src.core.scanner.scanner import Scanner
+
+
+def event(event_id, serial):
+    return {"id": str(event_id), "type": "issue_found", "issue": {"serial_number": serial, "severity": "high"}}
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return self.body
+
+class FakeBurpClient:
+    headers = {}
+
+    def __init__(self, events):
+        self.events = events
+        self.requests = []
+
+    def get_scan(self, scan_id, params=None):
+        params = params or {}
+        self.requests.append(params)
+        ids = [e["id"] for e in self.events]
+        start = ids.index(params["after"]) + 1 if "after" in params else 0
+        return FakeResponse({"scan_status": "running", "issue_events": self.events[start:]})
+
+    def release(self, scan_id):
+        pass
+
+class RecordingBus:
+    def __init__(self):
+        self.sent = []
+
+    def publish(self, kind, scan_id=None, payload=None):
+        self.sent.append(payload["serial_number"])
+
+@pytest.fixture
+def scanner():
+    scanner = Scanner("http://burp.test")
+    scanner.client = FakeBurpClient([event(1, "a"), event(2, "b")])
+    scanner.bus = RecordingBus()
+    return scanner
+
+def test_cursor_tracks_after_and_dedupes():
+    cursor = IssueEventCursor(page_size=100)
+    assert cursor.params() == {"issue_events": 100}
+    assert len(cursor.consume([event(1, "a"), event(2, "b")])) == 2
+    assert cursor.params() == {"after": "2", "issue_events": 100}
+    # Replayed events are dropped even if the API ignores the cursor
+    assert cursor.consume([event(1, "a"), event(3, "c")]) == [event(3, "c")]
+    assert cursor.count == 3
+
+def test_polls_only_transfer_new_events(scanner):
+    assert scanner.check_scan_status("7", 0) == ("running", 2)
+    scanner.client.events.append(event(3, "c"))
+    assert scanner.check_scan_status("7", 2) == ("running", 3)
+
+    assert scanner.client.requests[-1]["after"] == "2"
+    assert scanner.bus.sent == ["a", "b", "c"]
+
+def test_attach_baseline_does_not_realert(scanner):
+    assert scanner.check_scan_status("7", None) == ("running", 2)
+    scanner.client.events.append(event(3, "c"))
+    scanner.check_scan_status("7", 2)
+    assert scanner.bus.sent == ["c"]
+
+def test_resumed_count_skips_handled_issues(scanner):
+    scanner.check_scan_status("7", 1)
+    assert scanner.bus.sent == ["b"]
+
+def test_finished_scans_drop_their_state(scanner):
+    scanner.client.events.append(event(3, "c"))
+    scanner.check_scan_status("7", 0)
+    scanner.check_scan_status("8", 0)
+    scanner.forget_scan("7")
+    assert list(scanner.issue_cursors) == list(scanner.last_metrics) == ["8"]
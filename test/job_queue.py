@@ -0,0 +1,146 @@
+import threading
+
+import pytest
+from src.core.scanner.issue_cursor import IssueEventCursor
+from src.core.scanner.scheduler import ScanScheduler
+from src.core.storage import ScanJobQueue
+from test.scheduler import URLS, FakeScanner
+
+
+class CrashingScanner(FakeScanner):
+    """FakeScanner with issue cursors that dies after a number of polls"""
+    def __init__(self, crash_after=None, **kwargs):
+        super().__init__(**kwargs)
+        self.crash_after = crash_after
+        self.issue_cursors = {}
+
+    def issue_cursor(self, scan_id):
+        return self.issue_cursors.setdefault(scan_id, IssueEventCursor())
+
+    def check_scan_statuses(self, issue_counts):
+        if self.crash_after is not None:
+            self.crash_after -= 1
+            if self.crash_after < 0:
+                raise KeyboardInterrupt
+        return super().check_scan_statuses(issue_counts)
+
+@pytest.fixture
+def queue(tmp_path):
+    with ScanJobQueue.open_in(tmp_path, worker="w1") as queue:
+        yield queue
+
+def test_enqueue_skips_targets_already_in_cycle(queue):
+    assert queue.enqueue(URLS[:3], cycle="c1") == 3
+    assert queue.enqueue(URLS[:4], cycle="c1") == 1
+    assert queue.enqueue(URLS[:1], cycle="c2") == 1
+    assert queue.counts() == {"pending": 5}
+
+def test_concurrent_claims_never_overlap(tmp_path, queue):
+    queue.enqueue(URLS)
+    queue.enqueue([f"https://x{i}.example.com" for i in range(200)])
+    claimed = []
+
+    def worker(name):
+        with ScanJobQueue.open_in(tmp_path, worker=name) as q:
+            while True:
+                jobs = q.claim(3)
+                if not jobs:
+                    return
+                claimed.extend(job["id"] for job in jobs)
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(claimed) == len(set(claimed)) == 207
+    assert queue.counts() == {"claimed": 207}
+
+def test_recover_releases_unsubmitted_claims(queue):
+    queue.enqueue(URLS[:2])
+    first, second = queue.claim(2)
+    queue.mark_running(first["id"], "17")
+    queue.update_progress(first["id"], 3, "42")
+
+    running = queue.recover()
+    assert [(job["scan_id"], job["issue_count"], job["cursor_after"]) for job in running] == [("17", 3, "42")]
+    assert queue.get(second["id"])["status"] == "pending"
+
+def test_scheduler_resumes_after_crash(queue):
+    scanner = CrashingScanner(crash_after=1, polls_until_done=3)
+    with pytest.raises(KeyboardInterrupt):
+        ScanScheduler(scanner, max_concurrent=2, poll_interval=0, job_queue=queue).run(URLS[:4], ["Checking"])
+    assert queue.counts() == {"running": 2, "pending": 2}
+
+    # A fresh process resumes the running scans instead of recreating them
+    restarted = CrashingScanner(polls_until_done=2)
+    restarted.urls = dict(scanner.urls)
+    results = ScanScheduler(restarted, max_concurrent=2, poll_interval=0, job_queue=queue).run(URLS[:4], ["Checking"])
+
+    assert sorted(results["successful_scans"]) == sorted(URLS[:4])
+    assert len(restarted.urls) == 4
+    assert queue.counts() == {"succeeded": 4}
+
+    # Nothing left to do in this cycle
+    again = ScanScheduler(CrashingScanner(), poll_interval=0, job_queue=queue).run(URLS[:4], ["Checking"])
+    assert again["successful_scans"] == []
+
+def test_resume_does_not_realert_when_burp_ignores_after(queue):
+    from src.core.scanner.scanner import Scanner
+    from test.issue_cursor import FakeBurpClient, FakeResponse, RecordingBus, event
+
+    class IgnoringAfterClient(FakeBurpClient):
+        """Answers every poll with the whole event stream"""
+        def get_scans(self, scan_ids, params=None):
+            self.requests.append(params)
+            status = "succeeded" if len(self.requests) > 1 else "running"
+            return {scan_id: FakeResponse({"scan_status": status, "issue_events": self.events}) for scan_id in scan_ids}
+
+    queue.enqueue(URLS[:1])
+    (job,) = queue.claim(1)
+    queue.mark_running(job["id"], "7")
+    queue.update_progress(job["id"], 2, "2")
+
+    # A restarted process; Burp found one more issue in the meantime
+    scanner = Scanner("http://burp.test")
+    scanner.client = IgnoringAfterClient([event(1, "a"), event(2, "b"), event(3, "c")])
+    scanner.bus = RecordingBus()
+    scanner.handle_scan_completion = lambda scan_id: None
+    results = ScanScheduler(scanner, poll_interval=0, job_queue=queue).run([], ["Checking"])
+
+    assert scanner.client.requests[0]["7"]["after"] == "2"
+    assert scanner.bus.sent == ["c"]
+    assert results["total_vulnerabilities"] == 3
+
+def test_failures_are_persisted(queue):
+    scanner = CrashingScanner(fail_urls=[URLS[0]])
+    ScanScheduler(scanner, poll_interval=0, job_queue=queue).run(URLS[:2], ["Checking"])
+    failed = queue.jobs(status="failed")
+    assert [(job["url"], job["reason"]) for job in failed] == [(URLS[0], "Scan creation failed")]
+
+def test_new_cycles_are_unique():
+    assert ScanJobQueue.new_cycle() != ScanJobQueue.new_cycle()
+
+def test_crash_while_submitting_is_not_resubmitted(queue):
+    queue.enqueue(URLS[:2], cycle="c1")
+    first, second = queue.claim(2, cycle="c1")
+    queue.mark_submitting(first["id"])
+
+    assert queue.recover("c2") == []
+    assert queue.get(first["id"])["status"] == "submitting"
+    assert queue.recover("c1") == []
+    assert queue.get(first["id"])["status"] == "failed"
+    assert queue.get(second["id"])["status"] == "pending"
+    # Only the unsubmitted job is claimed again
+    assert [job["id"] for job in queue.claim(2, cycle="c1")] == [second["id"]]
+
+def test_urls_are_deduplicated_across_batches(tmp_path, queue):
+    assert queue.enqueue([URLS[:2], [URLS[1], URLS[2], URLS[2]]], cycle="c1") == 2
+    assert queue.enqueue([URLS[:3]], cycle="c1") == 0
+    # Another worker's rerun with a different batching
+    with ScanJobQueue.open_in(tmp_path, worker="w2") as other:
+        assert other.enqueue([[URLS[2], URLS[3]]], cycle="c1") == 1
+    assert [job["urls"] for job in queue.jobs()] == [URLS[:2], [URLS[2]], [URLS[3]]]
+    assert queue.unqueued(URLS[:5], cycle="c1") == [URLS[4]]
+    assert queue.unqueued(URLS[:2], cycle="c2") == URLS[:2]
@@ -0,0 +1,99 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.core.scanner.liveness import LivenessProber
+from src.core.storage import DomainStore
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/old":
+            self.send_response(301)
+            self.send_header("Location", "/home")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = b"<html><head><title> Acme &amp; Co\n Portal </title></head><body>hi</body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class SlowHandler(SiteHandler):
+    def do_GET(self):
+        time.sleep(2)
+        super().do_GET()
+
+def serve(handler, host="127.0.0.1"):
+    server = ThreadingHTTPServer((host, 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+@pytest.fixture
+def site():
+    server = serve(SiteHandler)
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+def test_probe_records_status_title_and_redirects(site):
+    result, = LivenessProber(timeout=2).probe([f"{site}/old"])
+    assert result.alive and result.status == 200
+    assert result.url == f"{site}/old"
+    assert result.final_url == f"{site}/home"
+    assert result.redirects == (f"{site}/old",)
+    assert result.title == "Acme & Co Portal"
+
+def test_dead_and_slow_hosts_are_not_alive(site):
+    slow = serve(SlowHandler)
+    prober = LivenessProber(timeout=0.5, schemes=("http",))
+    started = time.monotonic()
+    results = prober.probe(["http://127.0.0.1:9", f"http://127.0.0.1:{slow.server_port}", site])
+    slow.shutdown()
+
+    # All three share a host, only the first URL per host is probed
+    assert len(results) == 1 and not results[0].alive
+
+    results = {r.host: r for r in prober.probe(["http://localhost:9", site])}
+    assert not results["localhost"].alive and results["localhost"].error
+    assert results["127.0.0.1"].alive
+    assert time.monotonic() - started < 3
+
+def test_concurrency_is_bounded():
+    # Listening on every loopback address gives four distinct hosts
+    slow = serve(SlowHandler, "0.0.0.0")
+    prober = LivenessProber(concurrency=2, timeout=0.3, schemes=("http",))
+    hosts = [f"http://127.0.0.{i}:{slow.server_port}" for i in range(1, 5)]
+    started = time.monotonic()
+    results = prober.probe(hosts)
+    slow.shutdown()
+    assert [r.alive for r in results] == [False] * 4
+    # Two rounds of two timed out probes
+    assert 0.55 < time.monotonic() - started < 1.5
+
+def test_results_are_stored_and_queried(site, tmp_path):
+    results = LivenessProber(timeout=2).probe([site, "http://localhost:9"])
+    with DomainStore.open_in(tmp_path) as store:
+        assert store.record_probes(results) == 2
+        assert store.liveness(["127.0.0.1", "localhost", "unknown.test"]) == {"127.0.0.1": True, "localhost": False}
+        record = store.probes(["127.0.0.1"])["127.0.0.1"]
+        assert record["title"] == "Acme & Co Portal" and record["redirects"] == []
+        assert store.probes(["127.0.0.1"], max_age=-60) == {}
+
+def test_every_url_of_a_live_host_is_kept():
+    probes = {
+        "a.example.com": {"alive": True, "url": "https://a.example.com/login"},
+        "b.example.com": {"alive": False, "url": None},
+    }
+    targets = [
+        "https://a.example.com/api", "a.example.com", "https://a.example.com/admin",
+        "https://b.example.com/", "c.example.com", "https://a.example.com/api"
+    ]
+    assert LivenessProber.live_targets(targets, probes) == [
+        "https://a.example.com/api", "https://a.example.com", "https://a.example.com/admin"
+    ]
@@ -3,17 +3,14 @@ import sys
 import logging
 import json
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from dotenv import load_dotenv
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.core.vpn import NordVPNRotator
-from src.core.scanner import Scanner, Crawler
-from src.core.chaos import ChaosScanner
-from src.core.notification import TelegramNotifier
+from src.cli import Runtime
 
 class TargetScanner:
     def __init__(
@@ -21,17 +18,26 @@ class TargetScanner:
         burp_api_url: str,
         bot_token: Optional[str] = None,
         chat_id: Optional[str] = None,
-        base_dir: Optional[str] = None
+        base_dir: Optional[str] = None,
+        webhook_url: Optional[str] = None,
+        events_file: Optional[str] = None,
+        rotate_every: Optional[int] = 10,
+        rotate_interval: Optional[float] = None
     ):
-        """Initialize TargetScanner with all necessary components"""
-        self.base_dir = Path(base_dir) if base_dir else Path.cwd()
-        
-        # Initialize components
-        self.vpn = NordVPNRotator()
-        self.scanner = Scanner(burp_api_url, bot_token, chat_id)
-        self.crawler = Crawler(base_dir)
-        self.chaos = ChaosScanner(base_dir)
-        self.notifier = TelegramNotifier(bot_token, chat_id) if bot_token and chat_id else None
+        """Initialize TargetScanner on top of the sharingan command runtime"""
+        # Components are built by the runtime on first use and shared
+        # with the sharingan commands, so both behave the same
+        self.runtime = Runtime(
+            base_dir,
+            burp_api_url=burp_api_url,
+            bot_token=bot_token,
+            chat_id=chat_id,
+            webhook_url=webhook_url,
+            events_file=events_file,
+            rotate_every=rotate_every,
+            rotate_interval=rotate_interval
+        )
+        self.jobs = self.runtime.jobs
         
         # Setup logging
         logging.basicConfig(
@@ -42,92 +48,98 @@ class TargetScanner:
 
     def scan_targets(
         self,
-        target_urls: List[str],
+        target_urls: List[Union[str, List[str]]],
         scan_configs: List[str],
         use_vpn: bool = True,
         username: Optional[str] = None,
-        password: Optional[str] = None
+        password: Optional[str] = None,
+        max_concurrent: int = 4,
+        attach: Optional[Dict[str, str]] = None,
+        cycle: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Perform complete scan of target URLs with VPN rotation
         
         Args:
-            target_urls: List of URLs to scan
+            target_urls: List of URLs to scan, or URL batches sharing a Burp scan
             scan_configs: List of scan configuration names
             use_vpn: Whether to use VPN rotation
             username: Optional login username
             password: Optional login password
+            max_concurrent: Maximum number of Burp scans in flight
+            attach: Running Burp scans to resume monitoring, mapping
+                scan ID to target URL
+            cycle: Job queue cycle to resume, a new one by default;
+                targets already scanned in the cycle are skipped and
+                scans left running by a crashed run are resumed
         
         Returns:
             Dict containing scan results and statistics
         """
-        results = {
-            "successful_scans": [],
-            "failed_scans": [],
-            "total_vulnerabilities": 0,
-            "scan_time": 0
-        }
-
-        for url in target_urls:
-            try:
-                self.logger.info(f"Starting scan for {url}")
-                
-                # Rotate VPN if enabled
-                if use_vpn:
-                    self.logger.info("Rotating VPN connection")
-                    if not self.vpn.rotate_identity():
-                        self.logger.error("Failed to rotate VPN")
-                        results["failed_scans"].append({"url": url, "reason": "VPN rotation failed"})
-                        continue
-
-                # Run the scan
-                scan_id = self.scanner.create_scan([url], scan_configs, username, password)
-                if not scan_id:
-                    self.logger.error(f"Failed to create scan for {url}")
-                    results["failed_scans"].append({"url": url, "reason": "Scan creation failed"})
-                    continue
-
-                # Monitor scan progress
-                success = self.scanner.run_scan([url], scan_configs, username, password)
-                
-                if success:
-                    self.logger.info(f"Scan completed successfully for {url}")
-                    results["successful_scans"].append(url)
-                else:
-                    self.logger.error(f"Scan failed for {url}")
-                    results["failed_scans"].append({"url": url, "reason": "Scan execution failed"})
+        try:
+            return self.runtime.schedule(
+                target_urls, scan_configs, max_concurrent, cycle, use_vpn,
+                username, password, attach=attach
+            )
+        finally:
+            if use_vpn:
+                self.runtime.rotation.stop()
 
-            except Exception as e:
-                self.logger.error(f"Error scanning {url}: {e}")
-                results["failed_scans"].append({"url": url, "reason": str(e)})
+    def probe_targets(
+        self,
+        targets: List[str],
+        max_age: Optional[float] = 6 * 3600,
+        concurrency: int = 200,
+        timeout: float = 5
+    ) -> List[str]:
+        """
+        Drop targets that do not answer HTTP before they reach Burp
+        
+        Args:
+            targets: Discovered domains or URLs
+            max_age: Reuse stored probe results younger than this many seconds
+            concurrency: Hosts probed at once
+            timeout: Seconds allowed per host and scheme
+        
+        Returns:
+            URLs of the live targets, in input order
+        """
+        return self.runtime.probe(targets, max_age, concurrency, timeout)
 
-        return results
+    def plan_targets(
+        self,
+        targets: List[str],
+        max_targets: Optional[int] = None,
+        max_concurrent: int = 4,
+        batch_size: int = 10
+    ) -> List[List[str]]:
+        """
+        Rank targets and group them into multi-URL Burp scans
+        
+        Args:
+            targets: Discovered domains or URLs
+            max_targets: Keep only the best scored targets
+            max_concurrent: Burp scans running at once, used to size batches
+            batch_size: Most URLs per Burp scan, 1 scans every URL alone
+        
+        Returns:
+            List of URL batches, one Burp scan each
+        """
+        return self.runtime.plan(targets, max_targets, max_concurrent, batch_size)
 
-    def discover_targets(self) -> List[str]:
+    def discover_targets(self, program: Optional[str] = None) -> List[str]:
         """
         Discover potential target URLs using Chaos and Crawler
         
+        Args:
+            program: Only return targets belonging to this program
+        
         Returns:
             List of discovered target URLs
         """
         try:
-            # Crawl chaos targets
-            self.chaos.crawl_chaos_targets()
-            
-            # Process and tag domains
-            self.crawler.download_and_verify('local_chaos-bugbounty-list.json')
-            self.crawler.get_tag_domain('local_chaos-bugbounty-list.json')
-            self.crawler.map_domains(
-                "tagged_domains.json",
-                "chaos_domains.txt",
-                "chaos_domain_tagged.json"
-            )
-            
-            # Read and return discovered targets
-            with open(self.base_dir / "chaos_domain_tagged.json") as f:
-                targets = [domain["domain"] for domain in json.load(f)]
-            
-            return targets
+            # Refresh chaos targets, tag domains and load them from the store
+            return self.runtime.discover(program)
             
         except Exception as e:
             self.logger.error(f"Error discovering targets: {e}")
@@ -145,6 +157,10 @@ def main():
         action="store_true",
         help="Enable target discovery through crawling"
     )
+    parser.add_argument(
+        "--program",
+        help="Only scan discovered targets belonging to this program"
+    )
     parser.add_argument(
         "--target-urls",
         nargs="+",
@@ -157,11 +173,58 @@ def main():
         default=5,
         help="Maximum number of targets to scan (default: 5)"
     )
+    parser.add_argument(
+        "--no-probe",
+        action="store_true",
+        help="Skip the HTTP liveness probe and send every target to Burp"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10,
+        help="Maximum URLs grouped into one Burp scan (default: 10)"
+    )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=4,
+        help="Maximum number of Burp scans running at once (default: 4)"
+    )
+    parser.add_argument(
+        "--attach",
+        nargs="+",
+        metavar="SCAN_ID=URL",
+        default=[],
+        help="Resume monitoring running Burp scans instead of creating new ones"
+    )
+    parser.add_argument(
+        "--cycle",
+        help="Resume this scan cycle instead of starting a new one"
+    )
+    parser.add_argument(
+        "--webhook",
+        help="Also POST scan events as JSON to this URL"
+    )
+    parser.add_argument(
+        "--events-file",
+        help="Also append scan events to this JSONL file"
+    )
     parser.add_argument(
         "--use-vpn",
         action="store_true",
         help="Enable VPN rotation during scanning"
     )
+    parser.add_argument(
+        "--rotate-every",
+        type=int,
+        default=10,
+        help="Burp scans submitted per VPN identity (default: 10)"
+    )
+    parser.add_argument(
+        "--rotate-interval",
+        type=float,
+        help="Also rotate the VPN identity after this many seconds"
+    )
     args = parser.parse_args()
     
     # Load environment variables
@@ -171,34 +234,54 @@ def main():
     scanner = TargetScanner(
         burp_api_url=os.getenv('BURP_API_URL'),
         bot_token=os.getenv('BOT_TOKEN'),
-        chat_id=os.getenv('CHAT_ID')
+        chat_id=os.getenv('CHAT_ID'),
+        webhook_url=args.webhook,
+        events_file=args.events_file,
+        rotate_every=args.rotate_every,
+        rotate_interval=args.rotate_interval
     )
     
     # Get targets either from crawling or command line
     targets = []
     if args.crawl:
         scanner.logger.info("Starting target discovery through crawling...")
-        targets = scanner.discover_targets()
+        targets = scanner.discover_targets(args.program)
         scanner.logger.info(f"Discovered {len(targets)} targets")
     
     # Add any manually specified targets
     targets.extend(args.target_urls)
+    attach = dict(item.split("=", 1) for item in args.attach)
     
-    if not targets:
-        scanner.logger.error("No targets specified. Use --crawl or --target-urls")
+    if not targets and not attach and not args.cycle:
+        scanner.logger.error("No targets specified. Use --crawl, --target-urls, --attach or --cycle to resume")
         return
     
-    # Limit number of targets
-    targets = targets[:args.max_targets]
-    scanner.logger.info(f"Scanning {len(targets)} targets")
+    # Batch only URLs the resumed cycle has not queued yet
+    if targets and args.cycle:
+        targets = scanner.jobs.unqueued(targets, args.cycle)
+    
+    # Only spend Burp time on hosts that answer
+    if targets and not args.no_probe:
+        targets = scanner.probe_targets(targets)
+    
+    # Keep the most promising targets and pack them into Burp scans
+    batches = scanner.plan_targets(targets, args.max_targets, args.max_concurrent, args.batch_size)
+    scanner.logger.info(f"Scanning {sum(map(len, batches))} targets in {len(batches)} Burp scans")
     scanner.logger.info(f"VPN rotation is {'enabled' if args.use_vpn else 'disabled'}")
     
     # Scan targets
-    results = scanner.scan_targets(
-        target_urls=targets,
-        scan_configs=["Checking"],
-        use_vpn=args.use_vpn
-    )
+    try:
+        results = scanner.scan_targets(
+            target_urls=batches,
+            scan_configs=["Checking"],
+            use_vpn=args.use_vpn,
+            max_concurrent=args.max_concurrent,
+            attach=attach,
+            cycle=args.cycle
+        )
+    finally:
+        # Deliver notifications still queued in the sinks before exiting
+        scanner.runtime.close()
     
     # Print results
     print(json.dumps(results, indent=2))
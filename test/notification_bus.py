@@ -0,0 +1,118 @@
+import json
+import threading
+import time
+
+import pytest
+from src.core.notification import (
+    JsonlSink, LocalNotificationServer, NotificationBus, Sink, TelegramNotifier, TelegramSink, WebhookSink
+)
+
+
+class RecordingSink(Sink):
+    def __init__(self, delay=0.0, kinds=None, max_queue=1000):
+        self.delay = delay
+        self.kinds = kinds
+        self.max_queue = max_queue
+        self.events = []
+        self.closed = False
+
+    def handle(self, event):
+        time.sleep(self.delay)
+        self.events.append(event)
+
+    def close(self):
+        self.closed = True
+
+class BlockingSink(RecordingSink):
+    def __init__(self, max_queue):
+        super().__init__(max_queue=max_queue)
+        self.release = threading.Event()
+
+    def handle(self, event):
+        self.release.wait(5)
+        self.events.append(event)
+
+@pytest.fixture
+def server():
+    with LocalNotificationServer() as server:
+        yield server
+
+def test_slow_sink_does_not_delay_others():
+    fast, slow = RecordingSink(), RecordingSink(delay=0.2)
+    bus = NotificationBus([slow, fast])
+    for i in range(5):
+        bus.publish("issue", "1", {"serial_number": i})
+
+    deadline = time.monotonic() + 2
+    while len(fast.events) < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(fast.events) == 5 and len(slow.events) < 5
+
+    bus.close()
+    assert len(slow.events) == 5 and slow.closed
+
+def test_full_queue_drops_oldest():
+    sink = BlockingSink(max_queue=2)
+    bus = NotificationBus([sink])
+    for i in range(6):
+        bus.publish("issue", "1", {"n": i})
+    sink.release.set()
+    bus.close()
+
+    # The first event was already being handled when the queue filled up
+    assert [e.payload["n"] for e in sink.events][-2:] == [4, 5]
+    assert bus.stats()["BlockingSink"]["dropped"] >= 3
+
+def test_sinks_filter_kinds():
+    alerts = RecordingSink(kinds={"alert"})
+    with NotificationBus([alerts]) as bus:
+        bus.publish("issue", "1", {})
+        bus.publish("alert", None, {"message": "Scan failed."})
+    assert [e.kind for e in alerts.events] == ["alert"]
+
+def test_jsonl_sink(tmp_path):
+    path = tmp_path / "events" / "scan.jsonl"
+    with NotificationBus([JsonlSink(path)]) as bus:
+        bus.publish("issue", 7, {"name": "XSS"})
+        bus.publish("report", 7, {"markdown": "r.md"})
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(l["kind"], l["scan_id"]) for l in lines] == [("issue", "7"), ("report", "7")]
+
+def test_webhook_sink_against_local_server(server):
+    with NotificationBus([WebhookSink(f"{server.url}/hook")]) as bus:
+        bus.publish("alert", None, {"message": "Scan is paused"})
+    assert server.received[0]["path"] == "/hook"
+    assert server.received[0]["body"]["payload"] == {"message": "Scan is paused"}
+
+def test_telegram_sink_against_local_server(server, tmp_path):
+    report = tmp_path / "report.md"
+    report.write_text("# Scan Report\n")
+    notifier = TelegramNotifier("token", "42", api_base=server.url)
+    with NotificationBus([TelegramSink(notifier)]) as bus:
+        bus.publish("issue", "1", {"name": "SQL injection", "severity": "high"})
+        bus.publish("issue", "1", {"name": "Cookie", "severity": "info"})
+        bus.publish("report", "1", {"markdown": str(report), "json": None})
+    assert server.wait_for(2)
+
+    paths = sorted(request["path"] for request in server.received)
+    assert paths == ["/bottoken/sendDocument", "/bottoken/sendMessage"]
+    message = next(r["body"] for r in server.received if r["path"].endswith("sendMessage"))
+    assert "SQL injection" in message["text"] and "Cookie" not in message["text"]
+
+def test_flush_waits_for_telegram_delivery(server):
+    notifier = TelegramNotifier("token", "42", api_base=server.url)
+    with NotificationBus([TelegramSink(notifier)]) as bus:
+        bus.publish("alert", None, {"message": "Scan is paused"})
+        bus.flush()
+        # Sent by the time flush returns, not merely queued for Telegram
+        assert [r["path"] for r in server.received] == ["/bottoken/sendMessage"]
+        assert bus.stats()["TelegramSink"]["sent"] == 1
+
+def test_scanner_shares_the_telegram_sink_notifier():
+    from src.core.scanner.scanner import Scanner
+
+    sink = TelegramSink(TelegramNotifier("token", "42"))
+    with NotificationBus([sink]) as bus:
+        scanner = Scanner("http://burp.test", "token", "42", bus=bus)
+        assert scanner.notifier is sink.notifier
+        assert bus.sinks == [sink]
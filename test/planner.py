@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+
+import pytest
+from src.core.scanner.planner import TargetPlanner
+from src.core.storage import DomainStore, IssueFingerprintStore
+from src.core.storage.domain_store import utc_now
+
+NOW = datetime(2025, 5, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def stores(tmp_path):
+    with DomainStore.open_in(tmp_path) as store, IssueFingerprintStore.open_in(tmp_path) as fingerprints:
+        yield store, fingerprints
+
+def seed(store, domain, program, first_seen):
+    store.add_domains([domain], program=program)
+    store._conn.execute("UPDATE domains SET first_seen = ? WHERE domain = ?", (first_seen, domain))
+    store._conn.commit()
+
+def test_score_ranks_program_freshness_findings_and_liveness(stores):
+    store, fingerprints = stores
+    seed(store, "new.acme.com", "acme", "2025-05-01T00:00:00Z")
+    seed(store, "old.acme.com", "acme", "2024-01-01T00:00:00Z")
+    seed(store, "vuln.acme.com", "acme", "2024-01-01T00:00:00Z")
+    fingerprints.record({"type_index": 1, "severity": "High", "origin": "https://vuln.acme.com", "path": "/"}, "1")
+    planner = TargetPlanner(store, fingerprints, liveness={"dead.acme.com": False, "old.acme.com": True})
+
+    scored = planner.score(["stray.example.com", "old.acme.com", "dead.acme.com", "vuln.acme.com", "new.acme.com"], NOW)
+    assert [t.host for t in scored] == ["new.acme.com", "vuln.acme.com", "old.acme.com", "stray.example.com"]
+    assert scored[0].url == "https://new.acme.com"
+    assert scored[-1].score == 0
+
+def test_plan_batches_by_program_and_capacity(stores):
+    store, _ = stores
+    for i in range(6):
+        seed(store, f"a{i}.acme.com", "acme", utc_now())
+    for i in range(3):
+        seed(store, f"b{i}.beta.com", "beta", "2024-01-01T00:00:00Z")
+    planner = TargetPlanner(store, max_batch_size=4)
+    targets = [f"b{i}.beta.com" for i in range(3)] + [f"a{i}.acme.com" for i in range(6)]
+
+    batches = planner.plan(targets, slots=3)
+    assert [len(batch) for batch in batches] == [3, 3, 3]
+    assert all(url.endswith("acme.com") for url in batches[0] + batches[1])
+    assert all(url.endswith("beta.com") for url in batches[2])
+
+    # Batches never exceed max_batch_size, and limit keeps the best targets
+    assert [len(batch) for batch in planner.plan(targets, slots=1)] == [4, 2, 3]
+    assert sum(map(len, planner.plan(targets, limit=2))) == 2
+
+def test_plan_without_stores_keeps_order():
+    planner = TargetPlanner(max_batch_size=1)
+    assert planner.plan(["https://a.test/x", "b.test", "b.test"]) == [["https://a.test/x"], ["https://b.test"]]
@@ -0,0 +1,46 @@
+import random
+import pytest
+from src.core.scanner.poll_policy import AdaptivePollPolicy
+
+
+@pytest.fixture
+def policy():
+    return AdaptivePollPolicy(
+        base_interval=30, min_interval=5, max_interval=300, jitter=0, rng=random.Random(1)
+    )
+
+def test_fast_polls_during_warmup(policy):
+    assert policy.next_delay("running", {"total_elapsed_time": 10}) == 5
+
+def test_long_scans_back_off_to_max(policy):
+    metrics = {"total_elapsed_time": 4 * 3600, "crawl_and_audit_progress": 10}
+    assert policy.next_delay("running", metrics) == 300
+
+def test_delay_never_overshoots_projected_end(policy):
+    metrics = {"total_elapsed_time": 1000, "crawl_and_audit_progress": 80}
+    # 250s projected remaining -> poll within half of it
+    assert policy.next_delay("running", metrics) == 100
+
+def test_fast_path_near_completion(policy):
+    assert policy.next_delay("auditing", {"total_elapsed_time": 5000, "crawl_and_audit_progress": 95}) == 5
+    empty_queues = {
+        "total_elapsed_time": 5000,
+        "crawl_and_audit_progress": 40,
+        "crawl_requests_queued": 0,
+        "audit_queue_items_waiting": 0,
+    }
+    assert policy.next_delay("auditing", empty_queues) == 5
+
+def test_new_issues_poll_sooner(policy):
+    metrics = {"total_elapsed_time": 2000, "crawl_and_audit_progress": 10}
+    assert policy.next_delay("running", metrics, new_issues=2) == 5
+
+def test_errors_back_off_exponentially(policy):
+    assert policy.next_delay(None, failures=1) == 60
+    assert policy.next_delay(None, failures=10) == 300
+
+def test_jitter_stays_within_bounds():
+    policy = AdaptivePollPolicy(jitter=0.2, rng=random.Random(7))
+    delays = [policy.next_delay("paused") for _ in range(100)]
+    assert all(24 <= d <= 36 for d in delays)
+    assert len(set(delays)) > 1
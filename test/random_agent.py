@@ -1,5 +1,8 @@
+import json
+import random
+
 import pytest
-from src.core.identity.user_agent import UserAgentManager
+from src.core.identity.user_agent import AliasTable, UserAgentManager
 
 @pytest.fixture
 def ua_manager():
@@ -12,4 +15,61 @@ def test_get_random_user_agent(ua_manager):
     ua = ua_manager.get_random()
     assert ua is not None
     assert isinstance(ua, str)
-    assert len(ua) > 0
\ No newline at end of file
+    assert len(ua) > 0
+
+
+def test_seeded_managers_repeat_the_same_sequence():
+    first = UserAgentManager(seed=7)
+    second = UserAgentManager(seed=7)
+    assert [first.get_random() for _ in range(50)] == [second.get_random() for _ in range(50)]
+
+def test_draws_follow_browser_share():
+    manager = UserAgentManager(seed=1)
+    draws = [manager.get_random() for _ in range(20000)]
+    chrome = sum("Chrome/" in ua and "Edg/" not in ua for ua in draws) / len(draws)
+    firefox = sum("Firefox/" in ua for ua in draws) / len(draws)
+    assert abs(chrome - 0.65 / 0.93) < 0.02
+    assert abs(firefox - 0.04 / 0.93) < 0.01
+
+def test_browser_filter(ua_manager):
+    assert all("Firefox/" in ua_manager.get_random("firefox") for _ in range(20))
+    with pytest.raises(ValueError):
+        ua_manager.get_random("netscape")
+
+def test_pool_is_loaded_once(ua_manager):
+    assert UserAgentManager().agents is ua_manager.agents
+
+def test_pool_file_replaces_builtin(tmp_path):
+    path = tmp_path / "agents.json"
+    path.write_text(json.dumps([
+        {"browser": "Chrome", "user_agent": "agent-a", "weight": 3},
+        {"browser": "firefox", "user_agent": "agent-b", "weight": 1},
+        {"browser": "firefox", "user_agent": "", "weight": 5},
+    ]))
+    manager = UserAgentManager(path, seed=3)
+    assert len(manager) == 2
+    draws = [manager.get_random() for _ in range(4000)]
+    assert set(draws) == {"agent-a", "agent-b"}
+    assert abs(draws.count("agent-a") / len(draws) - 0.75) < 0.03
+    assert manager.get_random("chrome") == "agent-a"
+
+def test_alias_table_matches_weights():
+    table = AliasTable([0.0, 1.0, 2.0, 7.0])
+    rng = random.Random(0)
+    counts = [0] * len(table)
+    for _ in range(50000):
+        counts[table.sample(rng)] += 1
+    assert counts[0] == 0
+    for count, weight in zip(counts[1:], (0.1, 0.2, 0.7)):
+        assert abs(count / 50000 - weight) < 0.01
+    with pytest.raises(ValueError):
+        AliasTable([0.0])
+
+def test_alias_table_never_draws_zero_weights():
+    # Weights whose scaled values do not sum back to exactly n
+    weights = [0.0, 0.1, 0.0, 0.7, 0.2, 0.0]
+    table = AliasTable(weights)
+    rng = random.Random(3)
+    assert {table.sample(rng) for _ in range(20000)} == {1, 3, 4}
+    with pytest.raises(ValueError):
+        AliasTable([1.0, -0.5])
@@ -0,0 +1,91 @@
+import json
+from pathlib import Path
+
+import pytest
+from src.core.scanner.report import ReportWriter
+
+SAMPLE = Path(__file__).parent.parent / "reports" / "scan_report_39_2025_04_14-20_51_01"
+
+
+def issue_event(serial, severity, name="SQL injection"):
+    return {
+        "id": str(serial),
+        "type": "issue_found",
+        "issue": {
+            "serial_number": serial,
+            "name": name,
+            "severity": severity,
+            "confidence": "certain",
+            "origin": "https://example.com",
+            "path": f"/item/{serial}",
+        },
+    }
+
+def test_empty_report_matches_existing_layout(tmp_path):
+    sample = json.loads(SAMPLE.with_suffix(".json").read_text())
+    writer = ReportWriter("39", tmp_path, timestamp="2025_04_14-20_51_01")
+    md_path, json_path = writer.write("succeeded", sample["metrics"])
+
+    assert Path(json_path).read_text() == SAMPLE.with_suffix(".json").read_text()
+    assert Path(md_path).read_text().startswith(SAMPLE.with_suffix(".md").read_text().rstrip("\n"))
+
+def test_events_grouped_by_severity(tmp_path):
+    writer = ReportWriter("7", tmp_path)
+    writer.add_events([
+        issue_event(1, "high"),
+        issue_event(2, "info", "Cookie without HttpOnly"),
+        issue_event(3, "High"),
+        issue_event(4, "false_positive"),
+    ])
+    md_path, json_path = writer.write("succeeded", {"issue_events": 4})
+
+    report = json.loads(Path(json_path).read_text())
+    vulnerabilities = report["vulnerabilities"]
+    assert [e["issue"]["serial_number"] for e in vulnerabilities["high"]] == [1, 3]
+    assert vulnerabilities["medium"] == []
+    assert len(vulnerabilities["info"]) == 2
+
+    markdown = Path(md_path).read_text()
+    assert "### High (2)" in markdown
+    assert "https://example.com/item/3" in markdown
+    assert "### Medium" not in markdown
+
+class PagedBurpClient:
+    headers = {}
+
+    def __init__(self, events):
+        self.events = events
+        self.calls = 0
+
+    def get_scan(self, scan_id, params=None):
+        self.calls += 1
+        params = params or {}
+        start = int(params.get("after", 0))
+        page = self.events[start:start + params.get("issue_events", len(self.events))]
+        body = {"scan_status": "succeeded", "scan_metrics": {"issue_events": len(self.events)}, "issue_events": page}
+        return type("Response", (), {"status_code": 200, "json": lambda self: body})()
+
+def test_scanner_pages_events_into_reports(tmp_path):
+    from src.core.scanner.scanner import Scanner
+
+    scanner = Scanner("http://burp.test")
+    scanner.REPORT_PAGE_SIZE = 2
+    scanner.client = PagedBurpClient([issue_event(i, "medium") for i in range(1, 6)])
+
+    reports = scanner.generate_reports_many(["9"], output_dir=tmp_path)
+    md_path, json_path = reports["9"]
+
+    report = json.loads(Path(json_path).read_text())
+    assert len(report["vulnerabilities"]["medium"]) == 5
+    assert scanner.client.calls == 3
+
+def test_non_json_report_response_is_skipped(tmp_path):
+    from src.core.scanner.scanner import Scanner
+
+    class HtmlBurpClient:
+        def get_scan(self, scan_id, params=None):
+            return type("Response", (), {"status_code": 200, "json": lambda self: json.loads("<html>")})()
+
+    scanner = Scanner("http://burp.test")
+    scanner.client = HtmlBurpClient()
+    assert scanner.generate_reports_many(["9", "10"], output_dir=tmp_path) == {"9": None, "10": None}
@@ -0,0 +1,265 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.scanner.scanner import Scanner
+from src.core.scanner.scheduler import ScanScheduler
+
+
+class FakeScanner:
+    SLEEP_TIME = 0
+    MAX_PAUSE_TIME = 60
+    COMPLETED_STATUSES = ("succeeded", "completed")
+
+    def __init__(self, polls_until_done=2, fail_urls=()):
+        # One worker keeps reports in completion order
+        self.report_executor = ThreadPoolExecutor(max_workers=1)
+        self.polls_until_done = polls_until_done
+        self.fail_urls = set(fail_urls)
+        self.polls = {}
+        self.urls = {}
+        self.in_flight = set()
+        self.peak_in_flight = 0
+        self.completed = []
+        self.forgotten = []
+
+    def create_scan(self, target_urls, scan_configs, username=None, password=None):
+        url = target_urls[0]
+        if url in self.fail_urls:
+            return None
+        scan_id = str(len(self.urls) + 1)
+        self.urls[scan_id] = url
+        self.in_flight.add(scan_id)
+        self.peak_in_flight = max(self.peak_in_flight, len(self.in_flight))
+        return scan_id
+
+    def check_scan_status(self, scan_id, last_issue_count=0):
+        self.polls[scan_id] = self.polls.get(scan_id, 0) + 1
+        if self.polls[scan_id] >= self.polls_until_done:
+            self.in_flight.discard(scan_id)
+            return "succeeded", 1
+        return "running", last_issue_count
+
+    def check_scan_statuses(self, issue_counts):
+        return {
+            scan_id: self.check_scan_status(scan_id, count)
+            for scan_id, count in issue_counts.items()
+        }
+
+    count_new_issues = staticmethod(Scanner.count_new_issues)
+
+    def handle_scan_completion(self, scan_id):
+        self.completed.append(scan_id)
+
+    def notify_scan_failure(self):
+        pass
+
+    def forget_scan(self, scan_id):
+        self.forgotten.append(scan_id)
+
+URLS = [f"https://t{i}.example.com" for i in range(7)]
+
+def test_keeps_at_most_n_scans_in_flight():
+    scanner = FakeScanner(polls_until_done=3)
+    results = ScanScheduler(scanner, max_concurrent=3, poll_interval=0).run(URLS, ["Checking"])
+
+    assert scanner.peak_in_flight == 3
+    assert sorted(results["successful_scans"]) == sorted(URLS)
+    assert results["total_vulnerabilities"] == len(URLS)
+    assert len(scanner.completed) == len(URLS)
+    assert sorted(scanner.forgotten) == sorted(scanner.urls)
+
+def test_creation_failures_are_reported():
+    scanner = FakeScanner(fail_urls=[URLS[0]])
+    results = ScanScheduler(scanner, max_concurrent=2, poll_interval=0).run(URLS[:3], ["Checking"])
+
+    assert results["failed_scans"] == [{"url": URLS[0], "reason": "Scan creation failed"}]
+    assert len(results["successful_scans"]) == 2
+
+def test_before_submit_can_skip_targets():
+    scanner = FakeScanner()
+    scheduler = ScanScheduler(scanner, poll_interval=0, before_submit=lambda url: url != URLS[1])
+    results = scheduler.run(URLS[:2], ["Checking"])
+
+    assert results["successful_scans"] == [URLS[0]]
+    assert results["failed_scans"][0]["url"] == URLS[1]
+
+def test_attached_scans_are_monitored_not_recreated():
+    scanner = FakeScanner()
+    results = ScanScheduler(scanner, poll_interval=0).run(
+        [URLS[1]], ["Checking"], attach={"99": URLS[0]}
+    )
+
+    assert sorted(results["successful_scans"]) == [URLS[0], URLS[1]]
+    assert list(scanner.urls.values()) == [URLS[1]]
+    assert "99" in scanner.completed
+
+def test_error_handling_one_scan_does_not_stop_the_others():
+    class BrokenReportScanner(FakeScanner):
+        def handle_scan_completion(self, scan_id):
+            if self.urls[scan_id] == URLS[0]:
+                raise ValueError("report failed")
+            super().handle_scan_completion(scan_id)
+
+    scanner = BrokenReportScanner()
+    results = ScanScheduler(scanner, max_concurrent=2, poll_interval=0).run(URLS[:3], ["Checking"])
+
+    assert results["failed_scans"] == [{"url": URLS[0], "reason": "report failed"}]
+    assert sorted(results["successful_scans"]) == URLS[1:3]
+
+def test_slow_reports_do_not_hold_up_other_polls():
+    class SlowReportScanner(FakeScanner):
+        def __init__(self):
+            super().__init__()
+            self.others_done = threading.Event()
+            self.waited = None
+
+        def check_scan_status(self, scan_id, last_issue_count=0):
+            # The second scan needs more polls than the first
+            if self.urls[scan_id] == URLS[1] and self.polls.get(scan_id, 0) < 3:
+                self.polls[scan_id] = self.polls.get(scan_id, 0) + 1
+                return "running", last_issue_count
+            return super().check_scan_status(scan_id, last_issue_count)
+
+        def handle_scan_completion(self, scan_id):
+            if self.urls[scan_id] == URLS[0]:
+                # Report of the first scan only ends once the second was polled to completion
+                self.waited = self.others_done.wait(5)
+            else:
+                self.others_done.set()
+            super().handle_scan_completion(scan_id)
+
+    scanner = SlowReportScanner()
+    scanner.report_executor = ThreadPoolExecutor(max_workers=2)
+    results = ScanScheduler(scanner, max_concurrent=2, poll_interval=0).run(URLS[:2], ["Checking"])
+
+    assert scanner.waited is True
+    assert sorted(results["successful_scans"]) == URLS[:2]
+    assert sorted(scanner.forgotten) == ["1", "2"]
+
+def test_attached_scans_count_against_the_limit():
+    class PollCountingScanner(FakeScanner):
+        peak_polled = 0
+
+        def check_scan_statuses(self, issue_counts):
+            self.peak_polled = max(self.peak_polled, len(issue_counts))
+            return super().check_scan_statuses(issue_counts)
+
+    scanner = PollCountingScanner()
+    attach = {"90": URLS[0], "91": URLS[1], "92": URLS[2]}
+    results = ScanScheduler(scanner, max_concurrent=2, poll_interval=0).run([URLS[3]], ["Checking"], attach=attach)
+
+    assert scanner.peak_polled == 2
+    assert sorted(results["successful_scans"]) == URLS[:4]
+    # The new target was only submitted once an attached scan finished
+    assert scanner.completed.index("1") > scanner.completed.index("90")
+
+def test_unreachable_scans_are_given_up():
+    class UnreachableScanner(FakeScanner):
+        def check_scan_status(self, scan_id, last_issue_count=0):
+            if self.urls[scan_id] == URLS[0]:
+                return None, last_issue_count
+            return super().check_scan_status(scan_id, last_issue_count)
+
+    scanner = UnreachableScanner()
+    results = ScanScheduler(scanner, poll_interval=0, max_poll_failures=3).run(URLS[:2], ["Checking"])
+
+    assert results["failed_scans"] == [{"url": URLS[0], "reason": "Scan status unavailable after 3 polls"}]
+    assert results["successful_scans"] == [URLS[1]]
+    assert sorted(scanner.forgotten) == ["1", "2"]
+
+def test_submissions_wait_for_can_submit_while_scans_run():
+    scanner = FakeScanner(polls_until_done=2)
+    gate = {"open": True, "finished": []}
+
+    def before_submit(url):
+        assert gate["open"], "before_submit called while it would block"
+        # Like a due VPN rotation: nothing new until the first scan is done
+        gate["open"] = False
+        return True
+
+    def after_finish(url):
+        gate["finished"].append(url)
+        gate["open"] = True
+
+    scheduler = ScanScheduler(
+        scanner, max_concurrent=3, poll_interval=0,
+        before_submit=before_submit, can_submit=lambda: gate["open"], after_finish=after_finish
+    )
+    results = scheduler.run(URLS[:3], ["Checking"])
+
+    assert scanner.peak_in_flight == 1
+    assert results["successful_scans"] == gate["finished"] == URLS[:3]
+
+def test_non_json_polls_only_fail_their_scan():
+    class Response:
+        def __init__(self, status_code, body=None, location=None):
+            self.status_code = status_code
+            self.body = body
+            self.headers = {"Location": location} if location else {}
+            self.text = "<html>Bad gateway</html>"
+
+        def json(self):
+            if self.body is None:
+                raise ValueError("Expecting value: line 1 column 1 (char 0)")
+            return self.body
+
+    class StubBurpClient:
+        headers = {}
+
+        def __init__(self):
+            self.created = 0
+
+        def create_scan(self, data):
+            self.created += 1
+            return Response(201, location=f"/scan/{self.created}")
+
+        def scan_id_from(self, response):
+            return response.headers["Location"].split("/")[-1]
+
+        def get_scans(self, scan_ids, params=None):
+            # Scan 1 sits behind a proxy answering HTML
+            return {
+                scan_id: Response(200) if scan_id == "1" else Response(200, {"scan_status": "succeeded"})
+                for scan_id in scan_ids
+            }
+
+        def release(self, scan_id):
+            pass
+
+    scanner = Scanner("http://burp.test")
+    scanner.client = StubBurpClient()
+    scanner.handle_scan_completion = lambda scan_id: None
+    results = ScanScheduler(scanner, poll_interval=0, max_poll_failures=2).run(URLS[:2], ["Checking"])
+
+    assert results["failed_scans"] == [{"url": URLS[0], "reason": "Scan status unavailable after 2 polls"}]
+    assert results["successful_scans"] == [URLS[1]]
+
+def test_monitor_scan_gives_up_on_unknown_scans():
+    class NotFound:
+        status_code = 404
+
+    class StubBurpClient:
+        headers = {}
+
+        def __init__(self):
+            self.polls = 0
+
+        def get_scan(self, scan_id, params=None):
+            self.polls += 1
+            return NotFound()
+
+        def release(self, scan_id):
+            pass
+
+    class NoDelay:
+        def next_delay(self, *args, **kwargs):
+            return 0
+
+    scanner = Scanner("http://burp.test")
+    scanner.client = StubBurpClient()
+    scanner.poll_policy = NoDelay()
+    scanner.MAX_POLL_FAILURES = 3
+
+    assert scanner.monitor_scan("404") is False
+    assert scanner.client.polls == 3
+    assert "404" not in scanner.issue_cursors
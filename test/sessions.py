@@ -0,0 +1,109 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.core.chaos.downloader import ProgramDownloader
+from src.core.identity import SessionManager
+from src.core.vpn import Identity, RotationService
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append((self.client_address[1], self.headers.get("User-Agent")))
+        cookie = b"" if self.headers.get("Cookie") else b"track=1"
+        body = b"{}"
+        self.send_response(200)
+        if cookie:
+            self.send_header("Set-Cookie", cookie.decode())
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_port}/"
+    yield server
+    server.shutdown()
+
+class FakeRotator:
+    def __init__(self):
+        self.calls = 0
+
+    def rotate_identity(self):
+        self.calls += 1
+        return f"10.9.0.{self.calls}", f"agent-{self.calls}"
+
+def ports(server):
+    return {port for port, _ in server.requests}
+
+def test_named_sessions_are_shared_and_reuse_connections(server):
+    with SessionManager() as manager:
+        session = manager.session("discovery")
+        assert manager.session("discovery") is session
+        assert manager.session("other") is not session
+        for _ in range(20):
+            session.get(server.url, timeout=5)
+        # One keep-alive connection carried every request
+        assert len(ports(server)) == 1
+
+def test_identity_change_drops_pools_cookies_and_sets_user_agent(server):
+    with SessionManager(headers={"Accept-Language": "en"}) as manager:
+        session = manager.session()
+        session.get(server.url, timeout=5)
+        assert session.cookies.get("track") == "1"
+
+        assert manager.set_identity(Identity("10.9.0.1", "agent-1", 0.0))
+        # Same address and agent, nothing to reset
+        assert not manager.set_identity(Identity("10.9.0.1", "agent-1", 5.0, scans=3))
+        assert manager.generation == 1
+        assert session.headers["Accept-Language"] == "en"
+        assert not session.cookies
+
+        session.get(server.url, timeout=5)
+        session.get(server.url, timeout=5)
+    first, second, third = server.requests
+    assert first[1].startswith("python-requests")
+    assert second[1] == third[1] == "agent-1"
+    assert first[0] != second[0] == third[0]
+
+def test_bound_manager_follows_rotation(server):
+    manager = SessionManager()
+    session = manager.session("discovery")
+    rotation = RotationService(FakeRotator(), every_n_scans=None, wait_timeout=5)
+    manager.bind(rotation)
+    with rotation:
+        for _ in range(3):
+            # Pools are reset before the new identity is handed out
+            assert rotation.wait_ready()
+            session.get(server.url, timeout=5)
+            rotation.request_rotation()
+    assert [agent for _, agent in server.requests] == ["agent-1", "agent-2", "agent-3"]
+    assert len(ports(server)) == 3
+    manager.close()
+
+def test_downloader_keeps_shared_session_pool():
+    manager = SessionManager()
+    session = manager.session("discovery", pool_maxsize=8)
+    adapter = session.get_adapter("https://chaos-data.projectdiscovery.io")
+    downloader = ProgramDownloader(workers=4, session=session)
+    assert downloader.session is session
+    assert session.get_adapter("https://chaos-data.projectdiscovery.io") is adapter
+    assert adapter._pool_maxsize == 8
+    manager.close()
+
+def test_crawler_downloads_share_one_session(tmp_path):
+    from src.core.scanner.crawler import Crawler
+
+    crawler = Crawler(tmp_path, workers=4)
+    assert crawler.downloader.session is crawler.session
+    assert crawler.session.get_adapter("https://chaos-data.projectdiscovery.io")._pool_maxsize == 4
+    crawler.store.close()
@@ -0,0 +1,39 @@
+import pytest
+from src.core.chaos.sync_state import ChaosSyncState
+
+
+PROGRAM = {
+    "name": "Alpha",
+    "URL": "https://chaos.test/alpha.zip",
+    "last_updated": "2025-04-01T00:00:00Z",
+    "count": 10,
+}
+
+@pytest.fixture
+def state(tmp_path):
+    return ChaosSyncState(tmp_path / "chaos_sync_state.json")
+
+def test_unknown_program_is_changed(state):
+    assert state.is_changed(PROGRAM)
+    assert state.conditional_headers(PROGRAM) == {}
+
+def test_state_round_trip(state):
+    state.update(PROGRAM, etag='"abc"', last_modified="Tue, 01 Apr 2025 00:00:00 GMT")
+    state.save()
+
+    reloaded = ChaosSyncState(state.path)
+    assert not reloaded.is_changed(PROGRAM)
+    assert reloaded.conditional_headers(PROGRAM) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Tue, 01 Apr 2025 00:00:00 GMT",
+    }
+
+def test_metadata_change_is_detected(state):
+    state.update(PROGRAM)
+    assert state.is_changed(dict(PROGRAM, count=11))
+    assert state.is_changed(dict(PROGRAM, last_updated="2025-05-01T00:00:00Z"))
+
+def test_corrupt_state_starts_empty(tmp_path):
+    path = tmp_path / "chaos_sync_state.json"
+    path.write_text("{not json")
+    assert ChaosSyncState(path).programs == {}
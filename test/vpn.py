@@ -1,25 +1,220 @@
-from src.core.vpn.nordvpn import NordVPNRotator
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
 
+import pytest
+from src.core.vpn import NordVPNCLI, NordVPNRotator, RotationService, VPNBackend
+
+# Stand-in for the nordvpn client, the tunnel's exit IP lives in a state file
+FAKE_NORDVPN = '''
+import sys
+from pathlib import Path
+
+state = Path(sys.argv[1])
+command = sys.argv[2:]
+log = state.with_suffix(".log")
+log.write_text(log.read_text() + " ".join(command) + "\\n" if log.exists() else " ".join(command) + "\\n")
+count = state.with_suffix(".count")
+
+if command[0] == "connect":
+    if command[1] == "nowhere":
+        sys.stderr.write("The specified server does not exist.\\n")
+        sys.exit(1)
+    n = int(count.read_text()) + 1 if count.exists() else 1
+    count.write_text(str(n))
+    state.write_text(f"10.8.0.{n}")
+    print(f"Connecting to {command[1]} #{n}\\nYou are connected to {command[1]} #{n}!")
+elif command[0] == "disconnect":
+    state.write_text("")
+    print("You are disconnected from NordVPN.")
+elif command[0] == "status":
+    ip = state.read_text() if state.exists() else ""
+    print(f"Status: Connected\\nIP: {ip}" if ip else "Status: Disconnected")
+'''
+
+
+def make_echo_handler(state: Path):
+    class EchoHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            ip = state.read_text() if state.exists() else ""
+            body = ip.encode() if ip else b"tunnel down"
+            self.send_response(200 if ip else 503)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+    return EchoHandler
 
 @pytest.fixture
-def vpn():
-    return NordVPNRotator()
+def nordvpn(tmp_path):
+    script = tmp_path / "nordvpn.py"
+    script.write_text(FAKE_NORDVPN)
+    state = tmp_path / "tunnel"
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_echo_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cli = NordVPNCLI([sys.executable, str(script), str(state)], timeout=10)
+    yield cli, f"http://127.0.0.1:{server.server_port}/ip", state
+    server.shutdown()
+
+@pytest.fixture
+def vpn(nordvpn):
+    cli, echo_url, _ = nordvpn
+    return NordVPNRotator(cli, ip_check_url=echo_url, settle_timeout=2, poll_interval=0.05)
+
+class FakeRotator:
+    def __init__(self, fail: bool = False, delay: float = 0.0):
+        self.fail = fail
+        self.delay = delay
+        self.calls = 0
+
+    def rotate_identity(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            return None, None
+        return f"10.9.0.{self.calls}", f"agent-{self.calls}"
 
 def test_vpn_init(vpn):
     assert vpn is not None
     assert isinstance(vpn.vietnam_servers, list)
     assert isinstance(vpn.countries, list)
     assert vpn.vietnam_only == False
+    assert isinstance(vpn.backend, VPNBackend)
 
 def test_set_vietnam_only(vpn):
     vpn.set_vietnam_only(True)
     assert vpn.vietnam_only == True
 
-def test_connect_vpn(vpn):
-    result = vpn.connect_vpn('us')
-    assert isinstance(result, bool)
+def test_cli_drives_the_client_binary(nordvpn):
+    cli, _, state = nordvpn
+    assert cli.connect("us") is True
+    assert "Connected" in cli.status()
+    assert cli.disconnect() is True
+    assert cli.status() == "Status: Disconnected"
+    # Failing commands are reported, not raised
+    assert cli.connect("nowhere") is False
+    assert state.with_suffix(".log").read_text().splitlines() == [
+        "connect us", "status", "disconnect", "status", "connect nowhere"
+    ]
+
+def test_connect_vpn(vpn, nordvpn):
+    _, _, state = nordvpn
+    assert vpn.connect_vpn('us') is True
+    assert state.with_suffix(".log").read_text().splitlines() == ["disconnect", "connect us"]
 
 def test_get_current_ip(vpn):
+    # Tunnel down, the echo service is unreachable through it
+    assert vpn.get_current_ip() is None
+    assert vpn.connect_vpn('us')
     ip = vpn.get_current_ip()
-    assert ip is not None
-    assert isinstance(ip, str)
\ No newline at end of file
+    assert ip == "10.8.0.1"
+    assert isinstance(ip, str)
+
+def test_get_current_ip_rejects_non_addresses(nordvpn):
+    _, echo_url, state = nordvpn
+    state.write_text("<html>captive portal</html>")
+    rotator = NordVPNRotator(nordvpn[0], ip_check_url=echo_url)
+    assert rotator.get_current_ip() is None
+
+def test_rotate_identity_without_fixed_sleep(vpn):
+    started = time.monotonic()
+    first_ip, first_ua = vpn.rotate_identity()
+    second_ip, second_ua = vpn.rotate_identity("de")
+    assert (first_ip, second_ip) == ("10.8.0.1", "10.8.0.2")
+    assert first_ua and second_ua
+    # Two rotations used to cost at least six seconds of sleep alone
+    assert time.monotonic() - started < 3
+
+def test_rotate_identity_fails_on_connect_error(vpn):
+    assert vpn.rotate_identity("nowhere") == (None, None)
+
+def test_service_rotates_every_n_scans():
+    rotator = FakeRotator(delay=0.05)
+    with RotationService(rotator, every_n_scans=3, wait_timeout=5) as service:
+        ips = []
+        for i in range(7):
+            url = f"https://t{i}.example.com"
+            assert service.before_submit(url)
+            ips.append(service.current().ip if service.ready() else None)
+            service.scan_finished(url)
+            service.wait_ready()
+    # First identity at start, then one after the third and sixth scan
+    assert ips == ["10.9.0.1"] * 2 + [None] + ["10.9.0.2"] * 2 + [None] + ["10.9.0.3"]
+    assert rotator.calls == service.rotations == 3
+
+def test_service_prewarms_identity_before_first_scan():
+    rotator = FakeRotator(delay=0.2)
+    service = RotationService(rotator, every_n_scans=None, wait_timeout=5).start()
+    identity = service.wait_ready()
+    started = time.monotonic()
+    assert service.before_submit("https://a.example.com")
+    assert time.monotonic() - started < 0.1
+    assert identity.ip == service.current().ip == "10.9.0.1"
+    assert service.current().scans == 1
+    service.stop()
+
+def test_service_rotates_on_interval():
+    rotator = FakeRotator()
+    with RotationService(rotator, every_n_scans=None, interval=0.2, wait_timeout=5) as service:
+        first = service.wait_ready()
+        time.sleep(0.5)
+        later = service.wait_ready()
+    assert later.ip != first.ip
+    assert rotator.calls >= 2
+
+def test_service_refuses_submissions_without_identity():
+    rotator = FakeRotator(fail=True)
+    with RotationService(rotator, wait_timeout=0.3, retry_delay=0.05) as service:
+        assert service.before_submit("https://a.example.com") is False
+        assert service.current() is None
+    assert service.failures >= 2
+
+def test_service_fails_fast_while_rotation_keeps_failing():
+    rotator = FakeRotator(fail=True)
+    with RotationService(rotator, wait_timeout=5, retry_delay=0.05, max_failures=2) as service:
+        while service.failed_in_a_row < 2:
+            time.sleep(0.01)
+        assert service.ready()
+        started = time.monotonic()
+        assert service.before_submit("https://a.example.com") is False
+        assert time.monotonic() - started < 1
+
+        # A working rotation ends the fail-fast mode
+        rotator.fail = False
+        assert service.wait_ready().ip
+        assert service.failed_in_a_row == 0
+
+def test_restart_waits_for_a_stopping_worker():
+    rotator = FakeRotator(delay=0.5)
+    service = RotationService(rotator, every_n_scans=None, wait_timeout=5).start()
+    time.sleep(0.1)
+    # The worker is still inside rotate_identity when the join times out
+    service.stop(timeout=0.05)
+    service.start()
+    workers = [thread for thread in threading.enumerate() if thread.name == "vpn-rotation"]
+    assert len(workers) == 1
+    assert service.wait_ready().ip
+    service.stop()
+
+def test_service_with_fake_client(vpn):
+    with RotationService(vpn, every_n_scans=2, wait_timeout=5) as service:
+        for i in range(3):
+            assert service.before_submit(f"https://t{i}.example.com")
+            service.scan_finished(f"https://t{i}.example.com")
+        assert service.current().ip == "10.8.0.2"
+
+def test_rotation_waits_for_running_scans():
+    rotator = FakeRotator()
+    with RotationService(rotator, every_n_scans=2, wait_timeout=5) as service:
+        assert service.before_submit("https://a.example.com")
+        assert service.before_submit("https://b.example.com")
+        # Due, but a scan still sends traffic through the current tunnel
+        time.sleep(0.2)
+        assert rotator.calls == 1 and not service.ready()
+        service.scan_finished("https://a.example.com")
+        service.scan_finished("https://b.example.com")
+        assert service.wait_ready().ip == "10.9.0.2"